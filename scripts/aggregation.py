@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Bulgu Toplama (Aggregation) Modülü
+Yazılım Kalite ve Güvence - Konfigürasyon/Güvenlik Başlıkları Testi
+
+Hedef sonuçlarındaki bulguları tek geçişte sayarak önem, durum, başlık ve
+hedef istatistiklerini üretir. parse_reports.py'nin analizi ve
+generate_comparison_xlsx.py'nin özet sayfası aynı toplayıcıyı kullanır;
+böylece veriler iki kez taranmaz ve iki rapor aynı sayıları gösterir.
+"""
+
+import importlib.util
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# numpy ilk vektörel sayımda yüklenir (_load_numpy); küçük girdiler onu hiç import etmez
+np = None
+
+# make_aggregator'ın kabul ettiği motorlar (CLI seçenekleri)
+AGGREGATION_ENGINES = ('auto', 'numpy', 'python')
+
+
+class FindingsAggregator:
+    """Hedef sonuçlarını tek tek işleyen, sabit bellekli bulgu sayacı
+    
+    Bellek kullanımı kayıt sayısıyla değil, yalnızca farklı hedef ve başlık
+    adlarının sayısıyla büyür. Aynı hedefin birden fazla raporu (ör. farklı
+    çalıştırmalar) hedef özetinde toplanır.
+    """
+    
+    def __init__(self, progress_interval: int = 0, analysis: Optional[Dict[str, Any]] = None):
+        self.progress_interval = progress_interval
+        # Checkpoint'ten devam ederken önceki sayaçlar kullanılır
+        self.analysis = analysis or {
+            'total_targets': 0,
+            'total_findings': 0,
+            'severity_counts': {'High': 0, 'Medium': 0, 'Low': 0},
+            'status_counts': {'pass': 0, 'warn': 0, 'fail': 0},
+            'header_stats': {},
+            'target_summary': {}
+        }
+    
+    def add(self, target_data: Dict) -> None:
+        """Tek bir hedef sonucunu sayaçlara ekler"""
+        analysis = self.analysis
+        analysis['total_targets'] += 1
+        
+        target_name = target_data.get('target', 'unknown')
+        target_summary = analysis['target_summary'].get(target_name)
+        if target_summary is None:
+            target_summary = {
+                'total_findings': 0,
+                'high_severity': 0,
+                'medium_severity': 0,
+                'low_severity': 0,
+                'failed_checks': 0,
+                'passed_checks': 0,
+                'warnings': 0
+            }
+            analysis['target_summary'][target_name] = target_summary
+        
+        severity_counts = analysis['severity_counts']
+        status_counts = analysis['status_counts']
+        header_stats = analysis['header_stats']
+        
+        for finding in target_data.get('findings', []):
+            analysis['total_findings'] += 1
+            target_summary['total_findings'] += 1
+            
+            # Severity sayımı
+            severity = finding.get('severity', 'Low')
+            severity_counts[severity] = severity_counts.get(severity, 0) + 1
+            severity_key = f'{severity.lower()}_severity'
+            target_summary[severity_key] = target_summary.get(severity_key, 0) + 1
+            
+            # Status sayımı
+            status = finding.get('status', 'fail')
+            status_counts[status] = status_counts.get(status, 0) + 1
+            if status == 'warn':
+                target_summary['warnings'] += 1
+            elif status == 'pass':
+                target_summary['passed_checks'] += 1
+            else:  # fail
+                target_summary['failed_checks'] += 1
+            
+            # Header istatistikleri
+            header_name = finding.get('name', 'Unknown')
+            stats = header_stats.get(header_name)
+            if stats is None:
+                stats = {'total': 0, 'pass': 0, 'warn': 0, 'fail': 0}
+                header_stats[header_name] = stats
+            stats['total'] += 1
+            stats[status] = stats.get(status, 0) + 1
+        
+        if self.progress_interval and analysis['total_targets'] % self.progress_interval == 0:
+            print(f"Processed {analysis['total_targets']} reports, "
+                  f"{analysis['total_findings']} findings", flush=True)
+    
+    def merge(self, other: Dict[str, Any]) -> None:
+        """Başka bir toplayıcının analiz sonucunu bu toplayıcıya ekler (reduce adımı)
+        
+        Parçalar dosya sırasıyla birleştirildiğinde anahtar sıraları dahil seri
+        analizle birebir aynı sonuç elde edilir.
+        """
+        analysis = self.analysis
+        analysis['total_targets'] += other['total_targets']
+        analysis['total_findings'] += other['total_findings']
+        for key in ('severity_counts', 'status_counts'):
+            for name, count in other[key].items():
+                analysis[key][name] = analysis[key].get(name, 0) + count
+        for key in ('header_stats', 'target_summary'):
+            for name, counters in other[key].items():
+                merged = analysis[key].setdefault(name, {})
+                for counter, count in counters.items():
+                    merged[counter] = merged.get(counter, 0) + count
+    
+    def result(self) -> Dict[str, Any]:
+        """Biriken analiz sözlüğünü döndürür"""
+        return self.analysis
+
+
+# 'auto' motorunda vektörel yola geçilmeden önce sözlük yoluyla sayılan bulgu sayısı
+AUTO_VECTOR_FINDINGS = 50000
+
+# Vektörel yolda tek seferde sayılan en fazla bulgu sayısı (bellek sınırı)
+FRAME_CHUNK_FINDINGS = 250000
+
+BASE_SEVERITIES = ('High', 'Medium', 'Low')
+BASE_STATUSES = ('pass', 'warn', 'fail')
+
+
+def _numpy_available() -> bool:
+    return np is not None or importlib.util.find_spec('numpy') is not None
+
+
+def _load_numpy():
+    """numpy'yi ilk kullanımda import eder"""
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+
+def _categories(base: Tuple[str, ...], values: Iterable[str]) -> Dict[str, int]:
+    """Temel kategorilere verilerde görülen diğer değerleri görülme sırasıyla ekler"""
+    index = {value: code for code, value in enumerate(base)}
+    for value in values:
+        if value not in index:
+            index[value] = len(index)
+    return index
+
+
+def _cross_counts(rows, row_count: int, columns, column_count: int):
+    """İki kategori kodu dizisinin çapraz sayım matrisini (satır x sütun) döndürür"""
+    return np.bincount(rows * column_count + columns,
+                       minlength=row_count * column_count).reshape(row_count, column_count)
+
+
+def analyze_codes(target_names: List[str], combos: List[Tuple[str, str, str]],
+                  target_codes, combo_codes, total_targets: int) -> Dict[str, Any]:
+    """Kategori kodlarına çevrilmiş bulgulardan analiz sözlüğünü NumPy ile hesaplar
+    
+    target_codes/combo_codes bulgu başına bir tamsayı içerir; combos ise her
+    kodun (başlık, durum, önem) üçlüsüdür. Çıktı FindingsAggregator ile aynı
+    yapıdadır: anahtarlar ilk görülme sırasındadır ve sayılar Python int'idir.
+    """
+    _load_numpy()
+    names = _categories((), (name for name, _, _ in combos))
+    statuses = _categories(BASE_STATUSES, (status for _, status, _ in combos))
+    severities = _categories(BASE_SEVERITIES, (severity for _, _, severity in combos))
+    
+    # Üçlü kodundan her boyutun koduna eşleme; bulgu başına kodlar tek indekslemeyle bulunur
+    combo_names = np.array([names[name] for name, _, _ in combos], dtype=np.int64)
+    combo_statuses = np.array([statuses[status] for _, status, _ in combos], dtype=np.int64)
+    combo_severities = np.array([severities[severity] for _, _, severity in combos], dtype=np.int64)
+    name_codes = combo_names[combo_codes]
+    status_codes = combo_statuses[combo_codes]
+    severity_codes = combo_severities[combo_codes]
+    
+    severity_totals = np.bincount(severity_codes, minlength=len(severities)).tolist()
+    status_totals = np.bincount(status_codes, minlength=len(statuses)).tolist()
+    analysis = {
+        'total_targets': total_targets,
+        'total_findings': len(combo_codes),
+        'severity_counts': {severity: count for severity, count in zip(severities, severity_totals)
+                            if count or severity in BASE_SEVERITIES},
+        'status_counts': {status: count for status, count in zip(statuses, status_totals)
+                          if count or status in BASE_STATUSES},
+        'header_stats': {},
+        'target_summary': {}
+    }
+    
+    header_matrix = _cross_counts(name_codes, len(names), status_codes, len(statuses))
+    for header, row in zip(names, header_matrix.tolist()):
+        stats = {'total': sum(row)}
+        for status, count in zip(statuses, row):
+            if count or status in BASE_STATUSES:
+                stats[status] = count
+        analysis['header_stats'][header] = stats
+    
+    severity_matrix = _cross_counts(target_codes, len(target_names), severity_codes, len(severities))
+    status_matrix = _cross_counts(target_codes, len(target_names), status_codes, len(statuses))
+    for target, severity_row, status_row in zip(target_names, severity_matrix.tolist(),
+                                                status_matrix.tolist()):
+        total = sum(severity_row)
+        summary = {
+            'total_findings': total,
+            'high_severity': severity_row[0],
+            'medium_severity': severity_row[1],
+            'low_severity': severity_row[2],
+            'failed_checks': total - status_row[0] - status_row[1],
+            'passed_checks': status_row[0],
+            'warnings': status_row[1]
+        }
+        for severity, count in zip(list(severities)[3:], severity_row[3:]):
+            if count:
+                summary[f'{severity.lower()}_severity'] = count
+        analysis['target_summary'][target] = summary
+    
+    return analysis
+
+
+class VectorAggregator:
+    """FindingsAggregator ile aynı arayüze sahip, NumPy tabanlı vektörel toplayıcı
+    
+    add() her bulguyu yalnızca bir tamsayı koduna çevirip kompakt bir diziye
+    ekler; sayım, tampon FRAME_CHUNK_FINDINGS bulguya ulaştığında np.bincount
+    ile toplu yapılır ve kısmi sonuç FindingsAggregator.merge ile birleştirilir.
+    
+    warmup verilirse ilk warmup bulgu doğrudan sözlük yoluyla sayılır; numpy
+    ancak girdi bu eşiği aşarsa import edilir (küçük girdilerde açılış maliyeti
+    vektörel kazançtan büyüktür).
+    """
+    
+    def __init__(self, progress_interval: int = 0, analysis: Optional[Dict[str, Any]] = None,
+                 warmup: int = 0):
+        self.progress_interval = progress_interval
+        self.totals = FindingsAggregator(analysis=analysis)
+        self.records = 0
+        self.warmup = warmup
+        self._reset_buffer()
+    
+    def _reset_buffer(self) -> None:
+        self.target_index = {}
+        self.combo_index = {}
+        self.target_codes = array('l')
+        self.combo_codes = array('l')
+        self.buffered_targets = 0
+    
+    def add(self, target_data: Dict) -> None:
+        """Tek bir hedef sonucunu kodlayıp tampona ekler"""
+        if self.warmup:
+            self.totals.add(target_data)
+            if self.totals.analysis['total_findings'] >= self.warmup:
+                self.warmup = 0
+            self._record_progress()
+            return
+        
+        target_name = target_data.get('target', 'unknown')
+        target_code = self.target_index.get(target_name)
+        if target_code is None:
+            target_code = self.target_index[target_name] = len(self.target_index)
+        
+        combo_index = self.combo_index
+        combo_codes = self.combo_codes
+        count = 0
+        for finding in target_data.get('findings', []):
+            key = (finding.get('name', 'Unknown'), finding.get('status', 'fail'),
+                   finding.get('severity', 'Low'))
+            code = combo_index.get(key)
+            if code is None:
+                code = combo_index[key] = len(combo_index)
+            combo_codes.append(code)
+            count += 1
+        self.target_codes.extend([target_code] * count)
+        self.buffered_targets += 1
+        
+        if len(combo_codes) >= FRAME_CHUNK_FINDINGS:
+            self.flush()
+        self._record_progress()
+    
+    def _record_progress(self) -> None:
+        self.records += 1
+        if self.progress_interval and self.records % self.progress_interval == 0:
+            print(f"Processed {self.records} reports, "
+                  f"{self.totals.analysis['total_findings'] + len(self.combo_codes)} findings",
+                  flush=True)
+    
+    def flush(self) -> None:
+        """Tampondaki bulguları vektörel olarak sayıp toplama ekler"""
+        if self.buffered_targets:
+            np = _load_numpy()
+            self.totals.merge(analyze_codes(
+                list(self.target_index), list(self.combo_index),
+                np.frombuffer(self.target_codes, dtype=self.target_codes.typecode),
+                np.frombuffer(self.combo_codes, dtype=self.combo_codes.typecode),
+                self.buffered_targets))
+            self._reset_buffer()
+    
+    def merge(self, other: Dict[str, Any]) -> None:
+        self.flush()
+        self.totals.merge(other)
+    
+    def result(self) -> Dict[str, Any]:
+        self.flush()
+        return self.totals.result()
+
+
+def make_aggregator(engine: str = 'auto', progress_interval: int = 0,
+                    analysis: Optional[Dict[str, Any]] = None):
+    """Motor seçimine göre toplayıcı döndürür: 'numpy', 'python' veya 'auto' (varsayılan)
+    
+    'auto' numpy kuruluysa vektörel toplayıcıyı AUTO_VECTOR_FINDINGS bulguluk
+    sözlük yolu ısınmasıyla kullanır.
+    """
+    if engine == 'numpy' and not _numpy_available():
+        raise RuntimeError("The numpy engine requires numpy (pip install numpy)")
+    if engine == 'numpy':
+        return VectorAggregator(progress_interval, analysis)
+    if engine == 'auto' and _numpy_available():
+        return VectorAggregator(progress_interval, analysis, warmup=AUTO_VECTOR_FINDINGS)
+    return FindingsAggregator(progress_interval, analysis)
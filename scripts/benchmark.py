@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Performans Ölçüm (Benchmark) Aracı
+Yazılım Kalite ve Güvence - Konfigürasyon/Güvenlik Başlıkları Testi
+
+Tarama ve raporlama hattının performansını docker-compose'daki uygulamalara
+ihtiyaç duymadan ölçer:
+
+    scan   - süreç içi sahte HTTP sunucu çiftliğine (ayarlanabilir başlık profili,
+             gecikme ve gövde boyutu) karşı SecurityHeaderChecker; hedef/saniye,
+             p50/p99 hedef süresi ve tepe RSS
+    parse  - sentetik rapor korpusu (10^3-10^6 bulgu) üzerinde ReportParser analizi
+    report - aynı korpuslar üzerinde ComparisonGenerator Excel raporu
+    startup - cli.py komutlarının soğuk açılış süresi ve yüklenen ağır modüller;
+             cli.STARTUP_BUDGETS aşılırsa çıkış kodu 1 olur
+
+Her ölçüm ayrı bir (spawn) process'te çalışır; tepe RSS böylece ölçüm başına
+doğru raporlanır. Sonuçlar makine tarafından okunabilir bir JSON dosyasına
+yazılır ve --compare ile önceki bir sürümün sonucuyla karşılaştırılabilir.
+
+Kullanım:
+    python scripts/benchmark.py
+    python scripts/benchmark.py --stages scan --targets 1000 --concurrency 64 --latency 0.05
+    python scripts/benchmark.py --stages parse,report --sizes 1000,10000,100000,1000000
+    python scripts/benchmark.py --stages startup --repeat 5
+    python scripts/benchmark.py --compare data/benchmarks/benchmark_20231201_120000.json
+"""
+
+import argparse
+import json
+import logging
+import math
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from aggregation import AGGREGATION_ENGINES
+from cli import STARTUP_BUDGETS
+
+try:
+    import resource
+except ImportError:  # Windows'ta tepe RSS ölçülmez
+    resource = None
+
+BENCHMARK_VERSION = 1
+DEFAULT_OUTPUT_DIR = 'data/benchmarks'
+DEFAULT_SIZES = (1000, 10000, 100000)
+STAGES = ('scan', 'parse', 'report', 'startup')
+
+# Açılış ölçümünde analiz edilen küçük korpusun bulgu sayısı
+STARTUP_CORPUS_FINDINGS = 1000
+
+# Sahte sunucuların döndürdüğü başlık profilleri
+HEADER_PROFILES = {
+    'secure': [
+        ('Strict-Transport-Security', 'max-age=31536000; includeSubDomains'),
+        ('Content-Security-Policy', "default-src 'self'; frame-ancestors 'none'"),
+        ('X-Content-Type-Options', 'nosniff'),
+        ('X-Frame-Options', 'DENY'),
+        ('Referrer-Policy', 'strict-origin-when-cross-origin'),
+        ('Set-Cookie', '__Host-session=abc; Secure; HttpOnly; Path=/; SameSite=Strict'),
+    ],
+    'mixed': [
+        ('Content-Security-Policy', "default-src 'self' 'unsafe-inline' https://*.example.com"),
+        ('X-Frame-Options', 'SAMEORIGIN'),
+        ('Server', 'nginx'),
+        ('Set-Cookie', 'session=abc; HttpOnly'),
+        ('Set-Cookie', 'tracking=1; Path=/'),
+    ],
+    'insecure': [
+        ('Server', 'Apache/2.4.25 (Debian)'),
+        ('X-Powered-By', 'PHP/7.0.33'),
+        ('Set-Cookie', 'PHPSESSID=abc; path=/'),
+    ],
+}
+
+# Sentetik raporlarda hedef başına üretilen bulgular (kural motorunun bulgu adları)
+SYNTHETIC_FINDINGS = ['HSTS', 'CSP', 'X-Content-Type-Options', 'X-Frame-Options',
+                      'Cookie_Secure', 'Cookie_SameSite', 'Server_Info_Leak', 'Referrer-Policy']
+SYNTHETIC_STATUSES = [('pass', 'Low'), ('warn', 'Medium'), ('fail', 'High'), ('fail', 'Medium')]
+
+
+class _FarmHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _respond(self, send_body: bool) -> None:
+        farm = self.server.farm
+        if farm.latency:
+            time.sleep(farm.latency)
+        self.send_response(200)
+        for name, value in farm.headers:
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(farm.body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(farm.body)
+
+    def do_GET(self) -> None:
+        self._respond(True)
+
+    def do_HEAD(self) -> None:
+        self._respond(False)
+
+
+class _FarmServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address) -> None:
+        # İstemcinin kapattığı bağlantılar (ör. streamed GET, zaman aşımı) ölçümün parçasıdır
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            return
+        super().handle_error(request, client_address)
+
+
+class FakeTargetFarm:
+    """Aynı process içinde çalışan, thread'li sahte HTTP sunucu çiftliği"""
+
+    def __init__(self, servers: int = 4, profile: str = 'mixed', latency: float = 0.0,
+                 body_size: int = 0):
+        self.headers = HEADER_PROFILES[profile]
+        self.latency = latency
+        self.body = b'<html>' + b'x' * max(body_size - 13, 0) + b'</html>'
+        self.servers = []
+        for _ in range(servers):
+            server = _FarmServer(('127.0.0.1', 0), _FarmHandler)
+            server.farm = self
+            self.servers.append(server)
+
+    def start(self) -> 'FakeTargetFarm':
+        for server in self.servers:
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+    def jobs(self, count: int) -> List[tuple]:
+        """Çiftlikteki sunuculara dağıtılmış count adet (ad, url) hedefi"""
+        jobs = []
+        for index in range(count):
+            port = self.servers[index % len(self.servers)].server_address[1]
+            jobs.append((f"bench-{index}", f"http://127.0.0.1:{port}/target/{index}"))
+        return jobs
+
+    def __enter__(self) -> 'FakeTargetFarm':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Bu process'in tepe RSS değeri (MB)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS byte döndürür
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """En yakın sıra (nearest-rank) yöntemiyle yüzdelik"""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def write_corpus(path: str, findings: int, seed: int = 0) -> int:
+    """findings adet bulgu içeren sentetik bir JSONL rapor logu yazar; hedef sayısını döndürür"""
+    rng = random.Random(seed)
+    per_target = len(SYNTHETIC_FINDINGS)
+    targets = max(findings // per_target, 1)
+    with open(path, 'w', encoding='utf-8') as f:
+        for index in range(targets):
+            record = {
+                'url': f"http://10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}",
+                'target': f"target-{index}",
+                'timestamp': '2024-01-01T00:00:00',
+                'status_code': 200,
+                'headers': {},
+                'findings': []
+            }
+            for name in SYNTHETIC_FINDINGS:
+                status, severity = rng.choice(SYNTHETIC_STATUSES)
+                record['findings'].append({'name': name, 'value': 'synthetic', 'status': status,
+                                           'severity': severity, 'remark': f"{name} {status}"})
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+    return targets
+
+
+def _quiet_logging() -> None:
+    # Ölçüm sırasında hedef başına INFO logları terminale yazılmasın
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def _scan_case(jobs: List[tuple], workdir: str, concurrency: int, backend: str,
+               probe: str) -> Dict[str, Any]:
+    """Spawn edilen process'te çalışır: hedefleri tarar ve metrikleri döndürür"""
+    from header_check import SecurityHeaderChecker
+    _quiet_logging()
+    checker = SecurityHeaderChecker(pool_size=max(concurrency, 10), probe_mode=probe)
+    started = time.perf_counter()
+    try:
+        results = checker.run_checks([], workdir, concurrency=concurrency, backend=backend,
+                                     output_format='jsonl', inventory=iter(jobs))
+    finally:
+        checker.close()
+    seconds = time.perf_counter() - started
+    latencies = [result['timing']['elapsed'] for result in results]
+    return {
+        'seconds': round(seconds, 3),
+        'targets': len(results),
+        'errors': sum(1 for result in results if not result['status_code']),
+        'targets_per_sec': round(len(results) / seconds, 1),
+        'latency_p50': round(percentile(latencies, 0.50), 4),
+        'latency_p99': round(percentile(latencies, 0.99), 4),
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def _parse_case(corpus: str, engine: str) -> Dict[str, Any]:
+    from parse_reports import ReportParser
+    from result_store import iter_report_records
+    started = time.perf_counter()
+    analysis = ReportParser().analyze_findings(iter_report_records(corpus), engine=engine)
+    return {
+        'seconds': round(time.perf_counter() - started, 3),
+        'targets': analysis['total_targets'],
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def _report_case(corpus: str, workdir: str, engine: str) -> Dict[str, Any]:
+    import contextlib
+    import io
+    from generate_comparison_xlsx import ComparisonGenerator
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ComparisonGenerator().run_generation(corpus, workdir, engine=engine)
+    return {
+        'seconds': round(time.perf_counter() - started, 3),
+        'xlsx_mb': round(sum(os.path.getsize(os.path.join(workdir, name))
+                             for name in os.listdir(workdir)) / (1024 * 1024), 2),
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def _startup_case(command: str, args: List[str]) -> Dict[str, Any]:
+    """cli.py komutunu yeni bir Python process'inde çalıştırır; süreyi ve ağır importları döndürür"""
+    budget, heavy = STARTUP_BUDGETS[command]
+    cli = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cli.py')
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', cli, command, *args],
+                               capture_output=True, text=True, cwd=tempfile.gettempdir())
+    seconds = time.perf_counter() - started
+    # importtime satırları: "import time: self | cumulative | <girinti>modül"
+    imported = {line.rsplit('|', 1)[1].strip() for line in completed.stderr.splitlines()
+                if line.startswith('import time:') and line.count('|') == 2}
+    loaded = sorted(module for module in heavy if module in imported)
+    return {
+        'seconds': round(seconds, 3),
+        'budget_seconds': budget,
+        'heavy_modules': loaded,
+        'over_budget': seconds > budget or bool(loaded) or completed.returncode != 0
+    }
+
+
+def _isolated(func, *args) -> Dict[str, Any]:
+    """func'ı yeni bir spawn process'inde çalıştırır (RSS ölçümü birbirini etkilemez)"""
+    with ProcessPoolExecutor(max_workers=1,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        return executor.submit(func, *args).result()
+
+
+def _repeat(repeat: int, func, *args) -> Dict[str, Any]:
+    """Ölçümü repeat kez tekrarlar; süre metriklerinin medyanını raporlar"""
+    runs = [_isolated(func, *args) for _ in range(repeat)]
+    metrics = dict(runs[len(runs) // 2])
+    metrics['seconds'] = round(statistics.median(run['seconds'] for run in runs), 3)
+    if repeat > 1:
+        metrics['runs'] = [run['seconds'] for run in runs]
+    return metrics
+
+
+def environment() -> Dict[str, Any]:
+    """Sonuçların hangi sürüm ve makinede ölçüldüğü"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def run_benchmarks(stages: List[str], sizes: List[int], targets: int = 200,
+                   concurrency: int = 16, backends: List[str] = ('thread',),
+                   profile: str = 'mixed', latency: float = 0.02, body_size: int = 16384,
+                   servers: int = 4, probe: str = 'get', engine: str = 'auto',
+                   repeat: int = 1) -> List[Dict[str, Any]]:
+    """Seçilen aşamaları ölçer ve sonuç listesini döndürür"""
+    results = []
+    workdir = tempfile.mkdtemp(prefix='header_bench_')
+    try:
+        if 'scan' in stages:
+            with FakeTargetFarm(servers, profile, latency, body_size) as farm:
+                jobs = farm.jobs(targets)
+                for backend in backends:
+                    params = {'targets': targets, 'concurrency': concurrency, 'backend': backend,
+                              'profile': profile, 'latency': latency, 'body_size': body_size,
+                              'probe': probe}
+                    print(f"scan: {backend} x{concurrency}, {targets} targets ...", flush=True)
+                    scan_dir = os.path.join(workdir, f"scan_{backend}")
+                    metrics = _repeat(repeat, _scan_case, jobs, scan_dir, concurrency,
+                                      backend, probe)
+                    results.append({'name': f"scan/{backend}", 'stage': 'scan',
+                                    'params': params, 'metrics': metrics})
+
+        for size in sizes if {'parse', 'report'} & set(stages) else []:
+            corpus = os.path.join(workdir, f"corpus_{size}.jsonl")
+            corpus_targets = write_corpus(corpus, size)
+            params = {'findings': corpus_targets * len(SYNTHETIC_FINDINGS),
+                      'targets': corpus_targets, 'engine': engine}
+            if 'parse' in stages:
+                print(f"parse: {size} findings ...", flush=True)
+                metrics = _repeat(repeat, _parse_case, corpus, engine)
+                results.append({'name': f"parse/{size}", 'stage': 'parse',
+                                'params': params, 'metrics': metrics})
+            if 'report' in stages:
+                print(f"report: {size} findings ...", flush=True)
+                report_dir = os.path.join(workdir, f"report_{size}")
+                os.makedirs(report_dir, exist_ok=True)
+                metrics = _repeat(repeat, _report_case, corpus, report_dir, engine)
+                results.append({'name': f"report/{size}", 'stage': 'report',
+                                'params': params, 'metrics': metrics})
+            os.remove(corpus)
+
+        if 'startup' in stages:
+            corpus = os.path.join(workdir, 'corpus_startup.jsonl')
+            write_corpus(corpus, STARTUP_CORPUS_FINDINGS)
+            # scan ve report ağ/Excel yazımı olmadan yalnızca açılışı ölçer (--help);
+            # analyze küçük bir girdiyi gerçekten işler
+            cases = {
+                'scan': ['--help'],
+                'analyze': ['--input', corpus, '--output', os.path.join(workdir, 'startup')],
+                'report': ['--help'],
+            }
+            for command, args in cases.items():
+                print(f"startup: {command} ...", flush=True)
+                metrics = _repeat(repeat, _startup_case, command, args)
+                results.append({'name': f"startup/{command}", 'stage': 'startup',
+                                'params': {'args': args[:1]}, 'metrics': metrics})
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+# Karşılaştırmada yönü bilinen metrikler: True = büyük olan daha iyi
+COMPARED_METRICS = {
+    'seconds': False,
+    'targets_per_sec': True,
+    'latency_p50': False,
+    'latency_p99': False,
+    'peak_rss_mb': False,
+}
+
+# Bu süreden kısa ölçümler gürültüdür; yüzde değişimleri gerileme sayılmaz
+MIN_COMPARED_SECONDS = 0.05
+
+
+def compare(base: Dict, head: Dict, threshold: float) -> List[Dict[str, Any]]:
+    """Aynı adlı ölçümlerin metriklerini karşılaştırır; threshold (%) aşan kötüleşmeleri işaretler"""
+    base_results = {result['name']: result for result in base.get('results', [])}
+    rows = []
+    for result in head.get('results', []):
+        previous = base_results.get(result['name'])
+        if previous is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = previous['metrics'].get(metric), result['metrics'].get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            worse = -change if higher_is_better else change
+            if metric == 'seconds' and max(old, new) < MIN_COMPARED_SECONDS:
+                worse = 0
+            rows.append({'name': result['name'], 'metric': metric, 'base': old, 'head': new,
+                         'change_pct': round(change, 1), 'regression': worse > threshold})
+    return rows
+
+
+def format_results(results: List[Dict[str, Any]]) -> str:
+    lines = []
+    for result in results:
+        metrics = ', '.join(f"{key}={value}" for key, value in result['metrics'].items()
+                            if key != 'runs')
+        lines.append(f"{result['name']:<16} {metrics}")
+    return '\n'.join(lines)
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    lines = []
+    for row in rows:
+        flag = '  REGRESSION' if row['regression'] else ''
+        lines.append(f"{row['name']:<16} {row['metric']:<16} {row['base']:>10} -> "
+                     f"{row['head']:>10} ({row['change_pct']:+.1f}%){flag}")
+    return '\n'.join(lines)
+
+
+def main():
+    """Ana fonksiyon"""
+    parser = argparse.ArgumentParser(description='Benchmark the scan and report pipeline')
+    parser.add_argument('--stages', default=','.join(STAGES),
+                       help='Comma-separated stages to run (scan, parse, report, startup)')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                       help='Synthetic corpus sizes in findings for parse/report')
+    parser.add_argument('--targets', type=int, default=200,
+                       help='Fake targets scanned in the scan stage')
+    parser.add_argument('--concurrency', type=int, default=16,
+                       help='Scan concurrency')
+    parser.add_argument('--backends', default='thread',
+                       help='Comma-separated scan backends (thread, async)')
+    parser.add_argument('--profile', choices=sorted(HEADER_PROFILES), default='mixed',
+                       help='Header profile served by the fake targets')
+    parser.add_argument('--latency', type=float, default=0.02,
+                       help='Server-side latency per request in seconds')
+    parser.add_argument('--body-size', type=int, default=16384,
+                       help='Response body size in bytes')
+    parser.add_argument('--servers', type=int, default=4,
+                       help='Number of fake HTTP servers in the farm')
+    parser.add_argument('--probe', choices=['get', 'head'], default='get',
+                       help='Request mode of the scanner')
+    parser.add_argument('--engine', choices=AGGREGATION_ENGINES, default='auto',
+                       help='Aggregation engine for parse/report')
+    parser.add_argument('--repeat', type=int, default=1,
+                       help='Repeat each measurement N times and report the median time')
+    parser.add_argument('--output', default=None,
+                       help=f'Result file (default: {DEFAULT_OUTPUT_DIR}/benchmark_<timestamp>.json)')
+    parser.add_argument('--compare', metavar='BASE_JSON',
+                       help='Compare with an earlier result file; exits 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                       help='Regression threshold in percent for --compare (default: 10)')
+
+    args = parser.parse_args()
+    stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    results = run_benchmarks(stages, [int(size) for size in args.sizes.split(',')],
+                             args.targets, args.concurrency,
+                             [backend.strip() for backend in args.backends.split(',')],
+                             args.profile, args.latency, args.body_size, args.servers,
+                             args.probe, args.engine, max(args.repeat, 1))
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    output_file = args.output or os.path.join(DEFAULT_OUTPUT_DIR, f"benchmark_{timestamp}.json")
+    if os.path.dirname(output_file):
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    report = {
+        'version': BENCHMARK_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'environment': environment(),
+        'results': results
+    }
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print("\n" + format_results(results))
+    print(f"\nBenchmark results saved: {output_file}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            rows = compare(json.load(f), report, args.threshold)
+        print(f"\nComparison with {args.compare}:")
+        print(format_comparison(rows))
+        if any(row['regression'] for row in rows):
+            sys.exit(1)
+    if any(result['metrics'].get('over_budget') for result in results):
+        print("\nStartup budget exceeded (see startup/* results)")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
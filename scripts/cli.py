@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Komut Satırı Giriş Noktası (yk-headers)
+Yazılım Kalite ve Güvence - Konfigürasyon/Güvenlik Başlıkları Testi
+
+Tek bir komutla tarama, analiz ve raporlama scriptlerini çalıştırır. Alt
+komutun modülü yalnızca o komut seçildiğinde import edilir; böylece örneğin
+'analyze' openpyxl'i, 'scan' numpy'yi ve (thread backend'inde) aiohttp'yi
+yüklemez. Cron/CI'da binlerce kez çağrılan komutların açılış süresi
+benchmark.py'nin 'startup' aşamasıyla STARTUP_BUDGETS'a göre ölçülür.
+
+Kullanım:
+    yk-headers scan --targets all
+    yk-headers analyze --input data/raw_reports
+    yk-headers report --input data/raw_reports
+    yk-headers daemon --config targets.json
+    python scripts/cli.py scan --inventory hosts.txt   # kurulum olmadan
+"""
+
+import importlib
+import sys
+from typing import List, Optional
+
+# Alt komut -> (modül, açıklama); her modülün kendi argparse'lı main()'i vardır
+COMMANDS = {
+    'scan': ('header_check', 'Scan targets for security headers'),
+    'analyze': ('parse_reports', 'Analyze scan reports and write summaries'),
+    'report': ('generate_comparison_xlsx', 'Generate the comparison Excel report'),
+    'trend': ('trend_store', 'Query the SQLite trend store'),
+    'distributed': ('distributed', 'Run coordinator/worker distributed scans'),
+    'daemon': ('daemon', 'Run scheduled scans with a warm checker and HTTP endpoint'),
+}
+
+# Açılış bütçeleri: komut -> (en fazla süre (s), import edilmemesi gereken modüller)
+STARTUP_BUDGETS = {
+    'scan': (0.6, ('aiohttp', 'numpy', 'openpyxl', 'pandas')),
+    'analyze': (0.4, ('aiohttp', 'numpy', 'openpyxl', 'pandas')),
+    'report': (0.8, ('aiohttp', 'pandas')),
+}
+
+
+def usage() -> str:
+    lines = ['usage: yk-headers <command> [options]', '', 'commands:']
+    lines.extend(f"  {name:<12} {description}" for name, (_, description) in COMMANDS.items())
+    lines.append('')
+    lines.append("Run 'yk-headers <command> --help' for command options.")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Alt komutu seçip ilgili modülün main()'ine devreder"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        return
+    command = argv[0]
+    if command not in COMMANDS:
+        print(usage(), file=sys.stderr)
+        sys.exit(f"yk-headers: unknown command '{command}'")
+
+    module = importlib.import_module(COMMANDS[command][0])
+    # Devredilen argparse program adını ve argümanları sys.argv'den okur
+    sys.argv = [f"yk-headers {command}", *argv[1:]]
+    module.main()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Paylaşımlı DNS ve TLS Oturum Önbelleği
+Yazılım Kalite ve Güvence - Konfigürasyon/Güvenlik Başlıkları Testi
+
+Aynı checker'ın tüm istekleri (HTTP isteği, HTTPS probe'u, crawler) için
+DNS çözümlemelerini TTL ile saklar ve TLS oturumlarını (session resumption)
+host:port başına yeniden kullanır. Önbellek checker ile yaşar: tek bir
+header_check çalıştırmasında çalıştırma boyunca, daemon'da süreç boyunca
+geçerlidir.
+
+TLS el sıkışmasının sonucu (protokol, şifre takımı, sertifika bitişi)
+isteği taşıyan bağlantının kendisinden okunur ve etkin hedefin ContextVar'ına
+yazılır; ayrı bir ssl/socket bağlantısı açılmaz.
+
+Oturum devralma yalnızca requests (thread) backend'inde yapılır: asyncio'nun
+SSL katmanı wrap_bio'ya oturum geçirmez. aiohttp'de DNS önbelleği için
+connector'ın kendi TTL'li önbelleği kullanılır, TLS bilgisi yanıt sınıfında
+(aiohttp_tls_response_class) okunur.
+"""
+
+import ipaddress
+import socket
+import ssl
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar, Token
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.ssl_ import resolve_cert_reqs
+
+from instrumentation import TimedHTTPConnection, TimedHTTPSConnection, add_phase, current_phases
+
+DEFAULT_DNS_TTL = 300
+# DNS ve TLS oturum önbelleklerinde tutulan en fazla host sayısı (LRU)
+DEFAULT_MAX_HOSTS = 10000
+
+# Sunucunun yalnızca TLS 1.2 altını sunduğunu gösteren OpenSSL hata nedenleri
+TLS_VERSION_REFUSALS = {'UNSUPPORTED_PROTOCOL', 'TLSV1_ALERT_PROTOCOL_VERSION',
+                        'NO_PROTOCOLS_AVAILABLE', 'VERSION_TOO_LOW'}
+
+_current_tls: ContextVar[Optional[Dict]] = ContextVar('scan_tls', default=None)
+
+
+def start_tls_capture(facts: Optional[Dict]) -> Token:
+    """Bu thread/görevin isteklerinin TLS bilgilerinin yazılacağı sözlüğü etkinleştirir"""
+    return _current_tls.set(facts)
+
+
+def stop_tls_capture(token: Token) -> None:
+    _current_tls.reset(token)
+
+
+def tls_version_refused(error: BaseException) -> bool:
+    """Hata zincirinde protokol sürümü yüzünden başarısız bir TLS el sıkışması var mı
+
+    requests/urllib3 ve aiohttp asıl ssl.SSLError'ı args, reason veya
+    __cause__ içinde sarmalar; zincir döngülere karşı ziyaret kümesiyle gezilir.
+    """
+    pending, seen = [error], set()
+    while pending:
+        current = pending.pop()
+        if current is None or id(current) in seen:
+            continue
+        seen.add(id(current))
+        if isinstance(current, ssl.SSLError) and current.reason in TLS_VERSION_REFUSALS:
+            return True
+        pending.extend(arg for arg in getattr(current, 'args', ()) if isinstance(arg, BaseException))
+        reason = getattr(current, 'reason', None)
+        if isinstance(reason, BaseException):
+            pending.append(reason)
+        pending.extend((current.__cause__, current.__context__))
+    return False
+
+
+def read_tls_facts(ssl_object) -> Dict:
+    """SSLSocket/SSLObject'ten protokol, şifre takımı ve sertifika bitiş bilgisini okur"""
+    cipher, _, bits = ssl_object.cipher() or (None, None, None)
+    facts = {
+        'protocol': ssl_object.version(),
+        'cipher': cipher,
+        'bits': bits,
+        'resumed': ssl_object.session_reused
+    }
+    # Doğrulama kapalıyken (CERT_NONE) getpeercert() boş döner; bitiş tarihi bilinmez
+    certificate = ssl_object.getpeercert()
+    if certificate and certificate.get('notAfter'):
+        expires = ssl.cert_time_to_seconds(certificate['notAfter'])
+        facts['cert_expires'] = datetime.fromtimestamp(expires, timezone.utc).isoformat()
+    return facts
+
+
+def aiohttp_tls_response_class():
+    """Bağlantının TLS bilgisini yanıt başlarken okuyan aiohttp ClientResponse sınıfı
+
+    aiohttp gövdesi tamamen okunan yanıtın bağlantısını hemen havuza bıraktığı
+    için bilgi, başlıklar okunmadan önce start() içinde alınır.
+    """
+    import aiohttp
+
+    class TLSClientResponse(aiohttp.ClientResponse):
+        tls_facts: Dict = {}
+
+        async def start(self, connection):
+            transport = connection.transport
+            ssl_object = transport.get_extra_info('ssl_object') if transport is not None else None
+            if ssl_object is not None:
+                self.tls_facts = read_tls_facts(ssl_object)
+            return await super().start(connection)
+
+    return TLSClientResponse
+
+
+class _ResumingSSLContext(ssl.SSLContext):
+    """Önbellekteki TLS oturumunu wrap_socket'e veren SSLContext
+
+    Python bir oturumu yalnızca onu oluşturan context ile devralabildiği için
+    doğrulama modu başına tek bir context tüm bağlantılarca paylaşılır.
+    """
+
+    cache = None
+
+    def wrap_socket(self, sock, *args, server_hostname=None, session=None, **kwargs):
+        if session is None and server_hostname:
+            session = self.cache.tls_session(self, server_hostname, sock.getpeername()[1])
+        return super().wrap_socket(sock, *args, server_hostname=server_hostname,
+                                   session=session, **kwargs)
+
+
+class ConnectionCache:
+    """TTL'li DNS önbelleği ve host:port başına TLS oturum önbelleği (thread-safe)"""
+
+    def __init__(self, dns_ttl: float = DEFAULT_DNS_TTL, max_hosts: int = DEFAULT_MAX_HOSTS):
+        self.dns_ttl = dns_ttl
+        self.max_hosts = max_hosts
+        self.lock = threading.Lock()
+        self.addresses = OrderedDict()  # (host, port) -> (expires, getaddrinfo sonucu)
+        self.sessions = OrderedDict()  # (verify_mode, host, port) -> SSLSession
+        self.contexts = {}
+        self.stats = dict.fromkeys(('dns_hits', 'dns_misses', 'handshakes', 'resumed'), 0)
+
+    def _remember(self, entries: OrderedDict, key, value) -> None:
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.max_hosts:
+            entries.popitem(last=False)
+
+    def resolve(self, host: str, port: int) -> List[Tuple]:
+        """getaddrinfo sonucunu TTL süresince önbellekten döndürür; hatalar saklanmaz"""
+        key = (host, port)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.addresses.get(key)
+            if entry is not None and entry[0] > now:
+                self.stats['dns_hits'] += 1
+                return entry[1]
+            self.stats['dns_misses'] += 1
+        addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        with self.lock:
+            self._remember(self.addresses, key, (now + self.dns_ttl, addresses))
+        return addresses
+
+    def forget(self, host: str, port: int) -> None:
+        """Bağlanılamayan adresleri önbellekten atar (sonraki istek yeniden çözer)"""
+        with self.lock:
+            self.addresses.pop((host, port), None)
+
+    def tls_context(self, cert_reqs) -> ssl.SSLContext:
+        """Doğrulama modu için paylaşılan, oturum devralan SSLContext
+
+        Ayarlar urllib3'ün varsayılan context'iyle aynıdır; yalnızca oturum
+        biletleri (OP_NO_TICKET) kapatılmaz. CA dosyası urllib3 tarafından
+        bağlantı başına yüklenir (requests certifi paketini verir).
+        """
+        verify_mode = resolve_cert_reqs(cert_reqs)
+        with self.lock:
+            context = self.contexts.get(verify_mode)
+            if context is None:
+                context = _ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+                context.minimum_version = ssl.TLSVersion.TLSv1_2
+                context.options |= ssl.OP_NO_COMPRESSION
+                if getattr(context, 'post_handshake_auth', None) is not None:
+                    context.post_handshake_auth = True
+                if verify_mode == ssl.CERT_NONE:
+                    context.check_hostname = False
+                context.verify_mode = verify_mode
+                context.hostname_checks_common_name = False
+                context.cache = self
+                self.contexts[verify_mode] = context
+            return context
+
+    def tls_session(self, context: ssl.SSLContext, host: str, port: int) -> Optional[ssl.SSLSession]:
+        with self.lock:
+            return self.sessions.get((context.verify_mode, host, port))
+
+    def store_session(self, ssl_socket: ssl.SSLSocket) -> None:
+        """Bağlantının TLS oturumunu sonraki bağlantılar için saklar"""
+        try:
+            session = ssl_socket.session
+            if session is None or not ssl_socket.server_hostname:
+                return
+            # TLS 1.3 oturumu ancak bilet geldikten sonra devralınabilir
+            if ssl_socket.version() == 'TLSv1.3' and not session.has_ticket:
+                return
+            key = (ssl_socket.context.verify_mode, ssl_socket.server_hostname,
+                   ssl_socket.getpeername()[1])
+        except (OSError, ValueError):
+            # Soket bu arada kapandıysa saklanacak oturum yoktur
+            return
+        with self.lock:
+            self._remember(self.sessions, key, session)
+
+    def record_handshake(self, resumed: bool) -> None:
+        with self.lock:
+            self.stats['handshakes'] += 1
+            self.stats['resumed'] += int(resumed)
+
+    def reset_stats(self) -> None:
+        with self.lock:
+            self.stats = dict.fromkeys(self.stats, 0)
+
+    def summary(self) -> Dict:
+        with self.lock:
+            return dict(self.stats)
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip('[]'))
+        return True
+    except ValueError:
+        return False
+
+
+class _CachedConnectionMixin:
+    """urllib3 bağlantısına DNS önbelleği, TLS oturum devralma ve TLS bilgisi yakalama ekler
+
+    Çözülen adresler sırayla urllib3'ün kendi _new_conn'una verilir; hata
+    eşlemesi, adresler arası geri düşme ve TLS sunucu adı (SNI) korunur.
+    """
+
+    connection_cache: ConnectionCache = None
+    tls_facts = None
+
+    def _new_conn(self):
+        cache = self.connection_cache
+        host = self._dns_host
+        if cache.dns_ttl <= 0 or _is_ip_address(host):
+            return super()._new_conn()
+        started = time.perf_counter()
+        try:
+            addresses = cache.resolve(host, self.port)
+        except socket.gaierror:
+            # urllib3'ün NameResolutionError'ını üretmesi için olağan yola bırak
+            return super()._new_conn()
+        phases = current_phases()
+        if phases is not None:
+            add_phase(phases, 'dns', time.perf_counter() - started)
+
+        error = None
+        try:
+            for address in dict.fromkeys(info[4][0] for info in addresses):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except (NewConnectionError, ConnectTimeoutError) as e:
+                    error = e
+            cache.forget(host, self.port)
+            raise error
+        finally:
+            self._dns_host = host
+
+    def connect(self):
+        if isinstance(self, HTTPSConnection):
+            self.ssl_context = self.connection_cache.tls_context(self.cert_reqs)
+        super().connect()
+        if isinstance(self.sock, ssl.SSLSocket):
+            self.tls_facts = read_tls_facts(self.sock)
+            self.connection_cache.record_handshake(self.tls_facts['resumed'])
+            # TLS 1.2 oturumu el sıkışmasından hemen sonra hazırdır
+            self.connection_cache.store_session(self.sock)
+        else:
+            self.tls_facts = None
+
+    def getresponse(self, *args, **kwargs):
+        # Connection: close / HTTP/1.0 yanıtlarında http.client getresponse() içinde
+        # self.sock'u None yapar; soket yanıt okunurken açık kaldığı için önceden alınır
+        sock = self.sock
+        response = super().getresponse(*args, **kwargs)
+        # TLS 1.3'te oturum bileti el sıkışmasından sonra gelir; yanıtla birlikte okunmuş olur
+        if isinstance(sock, ssl.SSLSocket):
+            self.connection_cache.store_session(sock)
+        facts = _current_tls.get()
+        if facts is not None:
+            # Yönlendirme zincirinde son yanıtı taşıyan bağlantı geçerlidir
+            facts.clear()
+            if self.tls_facts:
+                facts.update(self.tls_facts)
+        return response
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """Bağlantı havuzlarında önbellekli (ve istenirse zamanlayan) bağlantı sınıflarını kullanır"""
+
+    def __init__(self, connection_cache: ConnectionCache, timed: bool = False, **kwargs):
+        http_base = TimedHTTPConnection if timed else HTTPConnection
+        https_base = TimedHTTPSConnection if timed else HTTPSConnection
+        attributes = {'connection_cache': connection_cache}
+        http_connection = type('CachedHTTPConnection', (_CachedConnectionMixin, http_base),
+                               attributes)
+        https_connection = type('CachedHTTPSConnection', (_CachedConnectionMixin, https_base),
+                                attributes)
+        self.pool_classes = {
+            'http': type('CachedHTTPConnectionPool', (HTTPConnectionPool,),
+                         {'ConnectionCls': http_connection}),
+            'https': type('CachedHTTPSConnectionPool', (HTTPSConnectionPool,),
+                          {'ConnectionCls': https_connection})
+        }
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = dict(self.pool_classes)
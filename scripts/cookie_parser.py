@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Set-Cookie Ayrıştırıcısı
+Yazılım Kalite ve Güvence - Konfigürasyon/Güvenlik Başlıkları Testi
+
+Her Set-Cookie satırını ayrı ayrı ayrıştırır; böylece Secure/HttpOnly/
+SameSite/önek kontrolleri tüm çerezler için birlikte değil, çerez bazında
+yapılır. Çerez değerleri hiçbir zaman saklanmaz.
+"""
+
+import re
+from collections import namedtuple
+from typing import List, Optional
+
+CookieInfo = namedtuple('CookieInfo', 'name secure httponly samesite path domain')
+
+# Birleştirilmiş başlıkta yeni bir çerezin başladığı virgüller ("Expires=Wed, 21 Oct"
+# içindeki virgül bir "ad=" ile devam etmediği için bölünmez)
+_COOKIE_SPLIT = re.compile(r',\s*(?=[^;,=\s]+=)')
+
+
+def split_set_cookie(header_value: str) -> List[str]:
+    """Virgülle birleştirilmiş Set-Cookie değerini tek tek çerez satırlarına böler"""
+    if not header_value:
+        return []
+    return [part.strip() for part in _COOKIE_SPLIT.split(header_value) if part.strip()]
+
+
+def parse_set_cookie(line: str) -> CookieInfo:
+    """Tek bir Set-Cookie satırını ayrıştırır"""
+    parts = line.split(';')
+    name = parts[0].split('=', 1)[0].strip()
+    secure = httponly = False
+    samesite = path = domain = None
+    for attribute in parts[1:]:
+        key, _, value = attribute.strip().partition('=')
+        key = key.lower()
+        if key == 'secure':
+            secure = True
+        elif key == 'httponly':
+            httponly = True
+        elif key == 'samesite':
+            samesite = value.strip().capitalize() or None
+        elif key == 'path':
+            path = value.strip()
+        elif key == 'domain':
+            domain = value.strip()
+    return CookieInfo(name, secure, httponly, samesite, path, domain)
+
+
+def parse_cookies(lines: Optional[List[str]] = None, header_value: str = '') -> List[CookieInfo]:
+    """Ham Set-Cookie satırlarını (yoksa birleştirilmiş başlığı) ayrıştırır"""
+    if lines is None:
+        lines = split_set_cookie(header_value)
+    return [parse_set_cookie(line) for line in lines if line]
+
+
+def prefix_violation(cookie: CookieInfo) -> Optional[str]:
+    """__Secure-/__Host- önek kurallarını ihlal eden çerez için açıklama döndürür"""
+    if cookie.name.startswith('__Host-'):
+        if not cookie.secure or cookie.path != '/' or cookie.domain:
+            return '__Host- prefix requires Secure, Path=/ and no Domain'
+    elif cookie.name.startswith('__Secure-'):
+        if not cookie.secure:
+            return '__Secure- prefix requires Secure'
+    return None
+
+
+def compact_cookie(cookie: CookieInfo) -> List[str]:
+    """Rapora yazılacak kompakt gösterim: [ad, 'Secure; HttpOnly; SameSite=Lax']"""
+    flags = []
+    if cookie.secure:
+        flags.append('Secure')
+    if cookie.httponly:
+        flags.append('HttpOnly')
+    if cookie.samesite:
+        flags.append(f'SameSite={cookie.samesite}')
+    if cookie.path:
+        flags.append(f'Path={cookie.path}')
+    if cookie.domain:
+        flags.append(f'Domain={cookie.domain}')
+    return [cookie.name, '; '.join(flags)]
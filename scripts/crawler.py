@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Çok Yollu Tarama (Crawl) Modülü
+Yazılım Kalite ve Güvence - Konfigürasyon/Güvenlik Başlıkları Testi
+
+Bir hedefin yalnızca kök URL'ini değil, verilen başlangıç yollarını ve
+(isteğe bağlı olarak) aynı origin'deki bağlantıları sınırlı derinlik ve sayfa
+bütçesiyle tarar. Başlık kümesi aynı olan uç noktalar parmak iziyle
+gruplanır; analiz her benzersiz parmak izi için yalnızca bir kez yapılır.
+"""
+
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urljoin, urldefrag, urlparse
+
+import requests
+
+from connection_cache import start_tls_capture, stop_tls_capture
+from cookie_parser import compact_cookie, parse_cookies
+from instrumentation import add_phase, current_phases, start_phases, stop_phases
+
+logger = logging.getLogger(__name__)
+
+# Bağlantı çıkarmak için okunacak en fazla gövde boyutu
+MAX_CRAWL_BODY = 512 * 1024
+
+
+class LinkExtractor(HTMLParser):
+    """HTML içinden href/src/action bağlantılarını toplar"""
+
+    LINK_ATTRIBUTES = {'a': 'href', 'link': 'href', 'script': 'src', 'form': 'action'}
+
+    def __init__(self):
+        super().__init__()
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        attribute = self.LINK_ATTRIBUTES.get(tag)
+        if attribute is None:
+            return
+        for name, value in attrs:
+            if name == attribute and value:
+                self.links.append(value)
+
+
+def extract_same_origin_links(base_url: str, html: str) -> List[str]:
+    """Sayfadaki aynı origin'e ait bağlantıları sırasını koruyarak döndürür"""
+    extractor = LinkExtractor()
+    try:
+        extractor.feed(html)
+    except Exception as e:
+        logger.debug(f"Link extraction failed for {base_url}: {str(e)}")
+
+    origin = urlparse(base_url)
+    links = []
+    for link in extractor.links:
+        absolute, _ = urldefrag(urljoin(base_url, link))
+        parsed = urlparse(absolute)
+        if parsed.scheme == origin.scheme and parsed.netloc == origin.netloc:
+            if absolute not in links:
+                links.append(absolute)
+    return links
+
+
+class SiteCrawler:
+    """SecurityHeaderChecker için sınırlı, çok yollu tarama sınıfı"""
+
+    def __init__(self, checker, seed_paths: Optional[Sequence[str]] = None,
+                 max_depth: int = 1, max_pages: int = 20, follow_links: bool = True,
+                 concurrency: int = 4):
+        self.checker = checker
+        self.seed_paths = list(seed_paths or ['/'])
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.follow_links = follow_links
+        self.concurrency = max(concurrency, 1)
+
+    def crawl(self, url: str, target_name: str) -> Dict:
+        """Hedefi tarar ve uç nokta bazlı bulgularla tek bir hedef sonucu döndürür"""
+        logger.info(f"Crawling {target_name} at {url} "
+                    f"(depth={self.max_depth}, pages={self.max_pages})")
+        timing = self.checker._new_timing()
+
+        https_probe = None
+        if url.startswith('http://'):
+            https_probe = self.checker._start_https_probe(url)
+
+        queue = []
+        for path in self.seed_paths:
+            endpoint_url = urljoin(url, path)
+            if endpoint_url not in queue:
+                queue.append(endpoint_url)
+        seen = set(queue)
+
+        endpoints = []
+        groups = {}
+        first_page = None
+        first_error = None
+        depth = 0
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while queue and depth <= self.max_depth and len(endpoints) < self.max_pages:
+                batch = queue[:self.max_pages - len(endpoints)]
+                want_links = self.follow_links and depth < self.max_depth
+                next_level = []
+
+                # executor.map sırayı korur; sonuç deterministiktir. Worker thread'leri
+                # ContextVar'ları miras almaz; her uç nokta hedefin bağlamının bir kopyasında
+                # (burada, hedefin thread'inde alınan) çalışır
+                contexts = [contextvars.copy_context() for _ in batch]
+                for endpoint_url, page in zip(batch, executor.map(
+                        lambda context, u: context.run(self._fetch_endpoint, u, want_links),
+                        contexts, batch)):
+                    # Uç nokta sürelerini thread'ler arasında paylaşmadan burada topla
+                    timing['wait'] += page['timing']['wait']
+                    timing['attempts'] += page['timing']['attempts']
+                    for name, seconds in page['timing'].get('phases', {}).items():
+                        add_phase(timing['phases'], name, seconds)
+                    if 'error' in page:
+                        first_error = first_error or page
+                        endpoints.append({'url': endpoint_url, 'status_code': 0,
+                                          'fingerprint': None, 'error': str(page['error']),
+                                          'error_type': page['name']})
+                        continue
+
+                    fingerprint = self.checker._fingerprint(page['headers'])
+                    if fingerprint not in groups:
+                        groups[fingerprint] = {
+                            'findings': self.checker._analyze_headers(page['headers'],
+                                                                      page['status_code'],
+                                                                      page['cookies']),
+                            'paths': []
+                        }
+                    groups[fingerprint]['paths'].append(urlparse(endpoint_url).path or '/')
+                    endpoints.append({'url': endpoint_url, 'status_code': page['status_code'],
+                                      'fingerprint': fingerprint})
+                    if first_page is None:
+                        first_page = page
+
+                    for link in page['links']:
+                        if link not in seen:
+                            seen.add(link)
+                            next_level.append(link)
+
+                queue = next_level
+                depth += 1
+
+        if first_page is None:
+            # Probe aynı host'taki diğer hedeflerle paylaşılır; iptal edilmez
+            first_error = first_error or {'error': None, 'name': 'Connection_Error',
+                                          'remark': 'Unable to connect to target'}
+            return self.checker._finish_timing(
+                self.checker._error_result(url, target_name, first_error['name'],
+                                           first_error['error'], first_error['remark']), timing)
+
+        result = {
+            'url': url,
+            'target': target_name,
+            'timestamp': datetime.now().isoformat(),
+            'status_code': first_page['status_code'],
+            'headers': dict(first_page['headers']),
+            'findings': self._merge_findings(groups),
+            'endpoints': endpoints,
+            'unique_fingerprints': len(groups)
+        }
+        cookies = parse_cookies(first_page['cookies'], first_page['headers'].get('Set-Cookie', ''))
+        if cookies:
+            result['cookies'] = [compact_cookie(cookie) for cookie in cookies]
+        self.checker._add_tls_findings(result, first_page['tls'])
+
+        if https_probe is not None:
+            if first_page['final_url'].startswith('https://'):
+                self.checker._mark_https_redirect(url)
+            else:
+                self.checker._add_https_probe_findings(result,
+                                                       self.checker._https_probe_result(https_probe))
+
+        return self.checker._finish_timing(result, timing)
+
+    def _fetch_endpoint(self, url: str, want_links: bool) -> Dict:
+        """Tek bir uç noktayı getirir; gerekiyorsa HTML gövdesinden bağlantıları çıkarır"""
+        timing = {'wait': 0.0, 'attempts': 0}
+        # Uç nokta thread'inde yakalanan TLS bilgisi; hedef sonucuna ilk sayfanınki eklenir
+        tls = {}
+        token = start_tls_capture(tls)
+        # Aşama süreleri uç noktanın kendi sözlüğüne yazılır, crawl() hedefinkine ekler
+        phases_token = None
+        if current_phases() is not None:
+            timing['phases'] = {}
+            phases_token = start_phases(timing['phases'])
+        try:
+            if not want_links and self.checker.probe_mode == 'head':
+                response, _ = self.checker._fetch_headers_only(url, timing)
+                links = []
+            else:
+                with self.checker._request('GET', url, timing, timeout=30, allow_redirects=True,
+                                           stream=True) as response:
+                    links = []
+                    content_type = response.headers.get('Content-Type', '')
+                    if want_links and 'html' in content_type:
+                        body = response.raw.read(MAX_CRAWL_BODY, decode_content=True)
+                        html = body.decode(response.encoding or 'utf-8', errors='replace')
+                        links = extract_same_origin_links(response.url, html)
+            return {
+                'status_code': response.status_code,
+                'headers': response.headers,
+                'final_url': response.url,
+                'cookies': self.checker._set_cookie_lines(response),
+                'links': links,
+                'timing': timing,
+                'tls': tls
+            }
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request failed for {url}: {str(e)}")
+            name, remark = self.checker._connection_failure(e)
+            return {'error': e, 'name': name, 'remark': remark, 'timing': timing}
+        except Exception as e:
+            # Tek uç noktanın hatası (ör. geçersiz charset) tüm taramayı durdurmamalı
+            logger.error(f"Unexpected error for {url}: {str(e)}")
+            return {'error': e, 'name': 'Unexpected_Error',
+                    'remark': 'Unexpected error occurred', 'timing': timing}
+        finally:
+            if phases_token is not None:
+                stop_phases(phases_token)
+            stop_tls_capture(token)
+
+    def _merge_findings(self, groups: Dict[str, Dict]) -> List[Dict]:
+        """Parmak izi gruplarının bulgularını birleştirir, her bulguya uç noktalarını ekler"""
+        merged = {}
+        for group in groups.values():
+            for finding in group['findings']:
+                key = (finding['name'], finding['value'], finding['status'])
+                if key not in merged:
+                    merged[key] = dict(finding, endpoints=[])
+                merged[key]['endpoints'].extend(group['paths'])
+        return list(merged.values())
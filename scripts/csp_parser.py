@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Content-Security-Policy Ayrıştırıcısı
+Yazılım Kalite ve Güvence - Konfigürasyon/Güvenlik Başlıkları Testi
+
+CSP başlığını direktif -> kaynak listesi yapısına ayrıştırır ve direktif
+bazında güvensiz kaynakları tespit eder. Aynı politika binlerce uç noktada
+birebir tekrarlandığı için analiz sonuçları politikanın hash'i ile anahtarlanan
+sınırlı bir LRU önbellekte tutulur.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# Güvensiz anahtar kelimelerin geçerli olduğu direktifler
+SCRIPT_STYLE_DIRECTIVES = {
+    'default-src', 'script-src', 'script-src-elem', 'script-src-attr',
+    'style-src', 'style-src-elem', 'style-src-attr'
+}
+# Şema-yalnız kaynakların (https:, data: ...) her şeye izin verdiği direktifler
+SCHEME_SENSITIVE_DIRECTIVES = {
+    'default-src', 'script-src', 'script-src-elem', 'object-src', 'base-uri'
+}
+SCHEME_ONLY_SOURCES = {'http:', 'https:', 'data:', 'blob:', 'filesystem:'}
+
+CSP_CACHE_SIZE = 4096
+
+
+# Kendi direktifi olmayan kaynak türlerinin sırayla baktığı direktifler
+FALLBACK_DIRECTIVES = {
+    'script-src-elem': ('script-src', 'default-src'),
+    'script-src-attr': ('script-src', 'default-src'),
+    'style-src-elem': ('style-src', 'default-src'),
+    'style-src-attr': ('style-src', 'default-src'),
+    'worker-src': ('child-src', 'script-src', 'default-src'),
+    'frame-src': ('child-src', 'default-src'),
+}
+
+
+def parse_csp(policy: str) -> List[Dict[str, List[str]]]:
+    """CSP değerini politika başına {direktif: [kaynaklar]} listesine ayrıştırır
+
+    Virgülle birleştirilmiş her politika ayrı tutulur: tarayıcı hepsini
+    birden uygular. Aynı politika içinde tekrarlanan direktiflerde tarayıcılar
+    gibi ilk tanım geçerlidir.
+    """
+    policies = []
+    for single_policy in policy.split(','):
+        directives = {}
+        for part in single_policy.split(';'):
+            tokens = part.split()
+            if tokens:
+                directives.setdefault(tokens[0].lower(), tokens[1:])
+        if directives:
+            policies.append(directives)
+    return policies
+
+
+def _governing_sources(directives: Dict[str, List[str]], name: str) -> Optional[List[str]]:
+    """Politikada name direktifinin yerine geçen kaynak listesi; kısıtlama yoksa None"""
+    if name in directives:
+        return directives[name]
+    fallbacks = FALLBACK_DIRECTIVES.get(name, ('default-src',) if name.endswith('-src') else ())
+    for fallback in fallbacks:
+        if fallback in directives:
+            return directives[fallback]
+    return None
+
+
+def _directive_issues(name: str, sources: List[str]) -> List[Tuple[str, str]]:
+    """Tek bir direktifin güvensiz (kaynak, sorun) çiftlerini döndürür"""
+    issues = []
+    lowered = [source.lower() for source in sources]
+
+    if name in SCRIPT_STYLE_DIRECTIVES:
+        # nonce veya hash varsa tarayıcılar 'unsafe-inline'ı yok sayar
+        has_nonce_or_hash = any(source.startswith(("'nonce-", "'sha256-", "'sha384-", "'sha512-"))
+                                for source in lowered)
+        if "'unsafe-inline'" in lowered and not has_nonce_or_hash:
+            issues.append(("'unsafe-inline'", 'unsafe-inline'))
+        if "'unsafe-eval'" in lowered:
+            issues.append(("'unsafe-eval'", 'unsafe-eval'))
+
+    if '*' in lowered:
+        issues.append(('*', 'wildcard'))
+    elif name in SCHEME_SENSITIVE_DIRECTIVES:
+        issues.extend((source, 'scheme-only source') for source in lowered
+                      if source in SCHEME_ONLY_SOURCES)
+
+    return issues
+
+
+def _analyze(policy: str) -> Dict:
+    policies = parse_csp(policy)
+    # Bir kaynak ancak onu kısıtlayan her politika izin veriyorsa gerçekten açıktır;
+    # birden çok politikada etkin olan, en sıkı politikanın sonucudur
+    risky = []
+    for directives in policies:
+        others = [other for other in policies if other is not directives]
+        for name, sources in directives.items():
+            for source, issue in _directive_issues(name, sources):
+                item = {'directive': name, 'source': source, 'issue': issue}
+                if item in risky:
+                    continue
+                if all(governing is None or (source, issue) in _directive_issues(name, governing)
+                       for governing in (_governing_sources(other, name) for other in others)):
+                    risky.append(item)
+
+    issues = {}
+    for item in risky:
+        found = issues.setdefault(item['directive'], [])
+        label = f"{item['issue']} {item['source']}" if item['issue'] == 'scheme-only source' \
+            else item['issue']
+        if label not in found:
+            found.append(label)
+    return {
+        'policies': policies,
+        'risky': risky,
+        'issues': issues,
+        'summary': '; '.join(f"{name} ({', '.join(found)})" for name, found in issues.items())
+    }
+
+
+class _PolicyCache:
+    """Politika hash'i ile anahtarlanan, thread-safe, sınırlı LRU önbellek"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, policy: str) -> Dict:
+        key = hashlib.sha1(policy.encode('utf-8')).digest()
+        with self.lock:
+            analysis = self.entries.get(key)
+            if analysis is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return analysis
+            self.misses += 1
+
+        analysis = _analyze(policy)
+        with self.lock:
+            self.entries[key] = analysis
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return analysis
+
+
+_cache = _PolicyCache(CSP_CACHE_SIZE)
+
+
+def analyze_csp(policy: str) -> Dict:
+    """CSP politikasını analiz eder (önbellekli)
+
+    Dönen sözlük önbellekte paylaşıldığı için salt okunur kabul edilmelidir:
+    'policies' ayrıştırılmış politikalar, 'risky' tüm politikalar birlikte
+    uygulandığında açık kalan her güvensiz kaynak ({'directive', 'source',
+    'issue'}), 'issues' bunların direktif bazında özeti, 'summary' ise bulgu
+    açıklaması için tek satırlık metindir.
+    """
+    return _cache.get_or_compute(policy)
+
+
+def cache_info() -> Dict[str, int]:
+    """Önbellek isabet istatistiklerini döndürür"""
+    return {'hits': _cache.hits, 'misses': _cache.misses,
+            'size': len(_cache.entries), 'maxsize': _cache.maxsize}
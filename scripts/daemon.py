@@ -0,0 +1,570 @@
+#!/usr/bin/env python3
+"""
+Sürekli Tarama Servisi (Daemon)
+Yazılım Kalite ve Güvence - Konfigürasyon/Güvenlik Başlıkları Testi
+
+Tek bir SecurityHeaderChecker'ı (ve keep-alive bağlantı havuzunu) süreç
+boyunca sıcak tutar; hedefleri kendi aralıklarıyla (jitter'lı saniye aralığı
+veya cron ifadesi) tarar. Hedef ve kural dosyaları değiştiğinde yeniden
+başlatmadan yüklenir (dosya değişikliği yoklaması veya SIGHUP). Her taramanın
+sonucu aynı hedefin önceki sonucuyla karşılaştırılır; gerilemeler hemen
+loglanır. Sonuçlar JSONL loguna (ve opsiyonel olarak trend deposuna) eklenir,
+son sonuçlar yerel bir HTTP ucundan sorgulanabilir.
+
+Hedef dosyası JSON/JSON5 zamanlama dosyası veya envanter dosyası olabilir:
+
+    {
+      "interval": 300, "jitter": 0.1,
+      "targets": [
+        "dvwa",
+        {"url": "https://shop.example.com", "interval": 60},
+        {"host": "10.0.0.0/30", "ports": "80,443", "cron": "*/15 * * * *"}
+      ]
+    }
+
+Envanter dosyalarındaki (txt/csv/jsonl) tüm hedefler varsayılan aralıkla taranır.
+
+HTTP ucu:
+    GET  /health              durum, hedef sayısı, yükleme zamanları
+    GET  /targets             hedefler, zamanlamaları ve sonraki tarama zamanı
+    GET  /results[/<hedef>]   son sonuç(lar) ve son gerilemeler
+    POST /scan/<hedef>        hedefi hemen tarar, sonucu döndürür
+    POST /reload              hedef ve kural dosyalarını yeniden yükler
+
+Kullanım:
+    python scripts/daemon.py --config targets.json --listen 127.0.0.1:8765
+    curl -X POST http://127.0.0.1:8765/scan/dvwa
+"""
+
+import argparse
+import calendar
+import json
+import logging
+import os
+import random
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import unquote
+
+from connection_cache import DEFAULT_DNS_TTL
+from header_check import SecurityHeaderChecker, setup_logging
+from inventory import DEFAULT_PORTS, expand_entry, iter_inventory, normalize_url, parse_ports
+from rate_limit import DEFAULT_RETRIES, RateLimiter
+from result_store import ResultLogWriter, result_log_path
+from rule_engine import DEFAULT_RULES_FILE, RuleEngine, load_rules_file
+from trend_store import TrendStore, header_changes, worst_statuses
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 300.0
+DEFAULT_JITTER = 0.1
+DEFAULT_LISTEN = '127.0.0.1:8765'
+# Hedef/kural dosyalarının değişiklik için yoklanma aralığı (saniye)
+DEFAULT_RELOAD_POLL = 5.0
+# Zamanlayıcının en uzun uyku süresi; durdurma ve yeniden yükleme bu sürede fark edilir
+MAX_SLEEP = 1.0
+# Hedef başına saklanan son gerileme sayısı
+RECENT_REGRESSIONS = 20
+
+
+class CronSchedule:
+    """Beş alanlı cron ifadesi (dakika saat gün ay haftanın-günü)
+
+    Her alanda '*', sayı, liste (1,15), aralık (1-5) ve adım (*/15, 0-30/10)
+    desteklenir. Haftanın gününde 0 ve 7 pazardır. Gün ve haftanın günü
+    birlikte kısıtlanmışsa cron'daki gibi ikisinden biri eşleşmesi yeterlidir.
+    """
+
+    RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        parsed = [self._parse_field(field, low, high)
+                  for field, (low, high) in zip(fields, self.RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {day % 7 for day in weekdays}
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> Set[int]:
+        values = set()
+        for part in field.split(','):
+            spec, _, step = part.partition('/')
+            if spec == '*':
+                start, end = low, high
+            elif '-' in spec:
+                start, end = (int(value) for value in spec.split('-', 1))
+            else:
+                start = end = int(spec)
+                if step:
+                    end = high
+            if not low <= start <= end <= high:
+                raise ValueError(f"Cron field out of range: {field!r}")
+            values.update(range(start, end + 1, int(step) if step else 1))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, timestamp: float) -> float:
+        """timestamp'ten sonraki ilk eşleşen dakikanın (yerel saat) zaman damgası"""
+        moment = datetime.fromtimestamp(timestamp).replace(second=0, microsecond=0)
+        moment += timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+        while moment < limit:
+            if moment.month not in self.months:
+                days = calendar.monthrange(moment.year, moment.month)[1] - moment.day + 1
+                moment = (moment + timedelta(days=days)).replace(hour=0, minute=0)
+            elif not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            elif moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment.timestamp()
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+
+class ScheduledTarget:
+    """Zamanlanmış tek bir hedef: ya sabit aralık (+ jitter) ya da cron ifadesi"""
+
+    def __init__(self, name: str, url: str, interval: float = DEFAULT_INTERVAL,
+                 jitter: float = DEFAULT_JITTER, cron: Optional[str] = None):
+        self.name = name
+        self.url = url
+        self.interval = interval
+        self.jitter = jitter
+        self.cron = CronSchedule(cron) if cron else None
+        self.next_run = 0.0
+        self.last_run = None
+
+    @property
+    def schedule(self) -> Tuple:
+        """Zamanlamanın karşılaştırılabilir özeti (yeniden yüklemede değişiklik tespiti)"""
+        return (self.cron.expression if self.cron else None, self.interval, self.jitter)
+
+    def first_run(self, now: float) -> float:
+        # Aynı anda yüklenen hedefler ilk aralığa yayılır (thundering herd önlenir)
+        if self.cron is not None:
+            return self.cron.next_after(now)
+        return now + random.uniform(0, self.interval * self.jitter)
+
+    def following_run(self, now: float) -> float:
+        if self.cron is not None:
+            return self.cron.next_after(now)
+        return now + self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def describe(self) -> Dict:
+        return {
+            'name': self.name,
+            'url': self.url,
+            'schedule': f"cron {self.cron.expression}" if self.cron else
+                        f"every {self.interval:g}s ±{self.jitter:.0%}",
+            'next_run': datetime.fromtimestamp(self.next_run).isoformat(timespec='seconds'),
+            'last_run': (datetime.fromtimestamp(self.last_run).isoformat(timespec='seconds')
+                         if self.last_run else None)
+        }
+
+
+# Aynı saniyede üretilen çalıştırma kimliklerini ayırmak için son saniye ve sayaç
+_run_id_lock = threading.Lock()
+_last_run_id = ['', 0]
+
+
+def new_run_id() -> str:
+    """header_check çalıştırmalarıyla aynı biçimde (YYYYMMDD_HHMMSS) çalıştırma kimliği
+
+    Aynı saniyedeki sonraki kimliklere _01, _02, ... eklenir; böylece bir
+    dağıtım turuyla aynı saniyede gelen POST /scan ayrı bir çalıştırma olur ve
+    trend deposundaki (run_id, target) kaydı ezilmez/atlanmaz.
+    """
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    with _run_id_lock:
+        if _last_run_id[0] != stamp:
+            _last_run_id[:] = [stamp, 0]
+            return stamp
+        _last_run_id[1] += 1
+        return f"{stamp}_{_last_run_id[1]:02d}"
+
+
+def load_schedule(path: str, known_targets: Dict[str, str], interval: float = DEFAULT_INTERVAL,
+                  jitter: float = DEFAULT_JITTER) -> List[ScheduledTarget]:
+    """Hedef dosyasını ScheduledTarget listesine çevirir (URL'ye göre tekrarsız)
+
+    .json/.json5 dosyaları zamanlama dosyası olarak, diğerleri envanter olarak
+    okunur. Zamanlama dosyasında bilinen hedef adları (dvwa, ...) da kullanılabilir.
+    """
+    if not path.endswith(('.json', '.json5')):
+        return [ScheduledTarget(name, url, interval, jitter)
+                for name, url in iter_inventory([path])]
+
+    config = load_rules_file(path)
+    if isinstance(config, list):
+        config = {'targets': config}
+    interval = float(config.get('interval', interval))
+    jitter = float(config.get('jitter', jitter))
+    default_ports = parse_ports(str(config.get('ports', ','.join(map(str, DEFAULT_PORTS)))))
+
+    scheduled = {}
+    for entry in config.get('targets', []):
+        options = entry if isinstance(entry, dict) else {'url': entry}
+        spec = str(options.get('url') or options.get('host') or '')
+        name = options.get('name')
+        if spec in known_targets:
+            name, spec = name or spec, known_targets[spec]
+        ports = options.get('ports') or options.get('port')
+        if ports and 'url' not in options:
+            spec = f"{spec}:{ports}"
+        try:
+            for target, url in expand_entry(spec, default_ports, options.get('scheme', 'http'), name):
+                url = normalize_url(url)
+                if url not in scheduled:
+                    scheduled[url] = ScheduledTarget(
+                        target, url, float(options.get('interval', interval)),
+                        float(options.get('jitter', jitter)), options.get('cron'))
+        except ValueError as e:
+            logger.warning(f"Skipping invalid schedule entry {spec!r}: {str(e)}")
+    return list(scheduled.values())
+
+
+class ScanDaemon:
+    """Sıcak bir checker ile zamanlanmış taramaları çalıştıran servis"""
+
+    def __init__(self, checker: SecurityHeaderChecker, config_path: str,
+                 rules_file: str = DEFAULT_RULES_FILE, output_dir: str = 'data/raw_reports',
+                 concurrency: int = 4, interval: float = DEFAULT_INTERVAL,
+                 jitter: float = DEFAULT_JITTER, trend_db: Optional[str] = None,
+                 reload_poll: float = DEFAULT_RELOAD_POLL):
+        self.checker = checker
+        self.config_path = config_path
+        self.rules_file = rules_file
+        self.interval = interval
+        self.jitter = jitter
+        self.reload_poll = reload_poll
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.reload_requested = threading.Event()
+        self.executor = ThreadPoolExecutor(max_workers=max(concurrency, 1))
+        self.started_at = time.time()
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.log_writer = ResultLogWriter(result_log_path(output_dir))
+        self.trend_store = TrendStore(trend_db) if trend_db else None
+
+        self.targets = {}  # url -> ScheduledTarget
+        self.running = set()
+        self.latest = {}  # url -> {'result', 'regressions'}
+        self.mtimes = {}
+        self.loaded_at = {}
+        self.last_poll = time.time()
+        # Başlangıçta hatalı hedef dosyası servisi başlatmaz; kurallar checker'da zaten yüklü
+        self._changed(self.rules_file)
+        self._changed(self.config_path)
+        self.loaded_at['rules'] = self.started_at
+        self._load_targets()
+
+    def _changed(self, path: str) -> bool:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return False
+        changed = self.mtimes.get(path) != mtime
+        self.mtimes[path] = mtime
+        return changed
+
+    def reload(self, force: bool = False) -> None:
+        """Değişen hedef ve kural dosyalarını yükler; hata durumunda eski yapılandırma korunur"""
+        if self._changed(self.rules_file) or force:
+            try:
+                self.checker.rule_engine = RuleEngine.from_file(self.rules_file)
+                self.loaded_at['rules'] = time.time()
+                logger.info(f"Rules loaded: {self.rules_file} "
+                            f"({len(self.checker.rule_engine.rules)} rules)")
+            except Exception as e:
+                logger.error(f"Keeping previous rules, failed to load {self.rules_file}: {str(e)}")
+
+        if self._changed(self.config_path) or force:
+            try:
+                self._load_targets()
+            except Exception as e:
+                logger.error(f"Keeping previous targets, failed to load {self.config_path}: {str(e)}")
+
+    def _load_targets(self) -> None:
+        """Hedef dosyasını yükler; zamanlaması değişmeyen hedeflerin sıradaki taraması korunur"""
+        schedule = load_schedule(self.config_path, self.checker.targets, self.interval, self.jitter)
+        now = time.time()
+        with self.lock:
+            targets = {}
+            for target in schedule:
+                previous = self.targets.get(target.url)
+                if previous is not None and previous.schedule == target.schedule:
+                    target.next_run, target.last_run = previous.next_run, previous.last_run
+                else:
+                    target.next_run = target.first_run(now)
+                targets[target.url] = target
+            removed = set(self.targets) - set(targets)
+            for url in removed:
+                self.latest.pop(url, None)
+            added = len(set(targets) - set(self.targets))
+            self.targets = targets
+        self.loaded_at['targets'] = now
+        logger.info(f"Targets loaded: {len(targets)} ({added} new, {len(removed)} removed)")
+
+    def find_target(self, name: str) -> Optional[ScheduledTarget]:
+        """Hedefi adına veya URL'sine göre bulur"""
+        with self.lock:
+            for target in self.targets.values():
+                if name in (target.name, target.url):
+                    return target
+        return None
+
+    def scan(self, target: ScheduledTarget, run_id: Optional[str] = None) -> Dict:
+        """Hedefi tarar, sonucu kaydeder ve önceki sonuçla karşılaştırır
+
+        Aynı dağıtım turunda gönderilen hedefler ortak bir run_id ile kaydedilir;
+        isteğe bağlı (POST /scan) taramalar kendi run_id'lerini alır.
+        """
+        try:
+            result = self.checker.check_headers(target.url, target.name)
+        finally:
+            with self.lock:
+                self.running.discard(target.url)
+                target.last_run = time.time()
+        record = dict(result, run_id=run_id or new_run_id())
+        self.log_writer.write(record)
+        if self.trend_store is not None:
+            self.trend_store.write(record)
+            self.trend_store.commit()
+
+        with self.lock:
+            previous = self.latest.get(target.url)
+            regressions = list(previous['regressions']) if previous else []
+            # Bağlantı hataları başlık gerilemesi sayılmaz; hedef yeniden ulaşılınca karşılaştırılır
+            if previous and result.get('status_code') and previous['result'].get('status_code'):
+                changes, _ = header_changes(target.name,
+                                            worst_statuses(previous['result']['findings']),
+                                            worst_statuses(result['findings']))
+                for change in changes:
+                    logger.warning(f"Regression on {target.name}: {change['header']} "
+                                   f"{change['before'] or 'absent'} -> {change['after']}")
+                    regressions.append(dict(change, detected_at=record.get('timestamp')))
+            self.latest[target.url] = {'result': record,
+                                       'regressions': regressions[-RECENT_REGRESSIONS:]}
+        return record
+
+    def submit(self, target: ScheduledTarget, run_id: Optional[str] = None):
+        """Hedefi taramaya gönderir; aynı hedef zaten taranıyorsa None döner"""
+        with self.lock:
+            if target.url in self.running:
+                return None
+            self.running.add(target.url)
+        return self.executor.submit(self.scan, target, run_id)
+
+    def _dispatch_due(self, now: float) -> float:
+        """Zamanı gelen hedefleri gönderir; en yakın sonraki tarama zamanını döndürür"""
+        with self.lock:
+            due = [target for target in self.targets.values() if target.next_run <= now]
+            for target in due:
+                target.next_run = target.following_run(now)
+            next_run = min((target.next_run for target in self.targets.values()),
+                           default=now + MAX_SLEEP)
+        if due:
+            # HTTPS probe sonuçları yalnızca aynı dağıtım turunda paylaşılır
+            self.checker.reset_probe_cache()
+        run_id = new_run_id()
+        for target in due:
+            self.submit(target, run_id)
+        return next_run
+
+    def run_forever(self) -> None:
+        """Durdurulana kadar zamanlanmış taramaları çalıştırır"""
+        logger.info(f"Daemon started with {len(self.targets)} targets")
+        while not self.stopping.is_set():
+            now = time.time()
+            if self.reload_requested.is_set():
+                self.reload_requested.clear()
+                self.reload(force=True)
+            elif now - self.last_poll >= self.reload_poll:
+                self.reload()
+                self.last_poll = now
+            next_run = self._dispatch_due(now)
+            self.stopping.wait(min(max(next_run - time.time(), 0.0), MAX_SLEEP))
+
+    def stop(self) -> None:
+        self.stopping.set()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.log_writer.close()
+        if self.trend_store is not None:
+            self.trend_store.close()
+        self.checker.close()
+
+    def status(self) -> Dict:
+        with self.lock:
+            return {
+                'status': 'stopping' if self.stopping.is_set() else 'running',
+                'uptime': round(time.time() - self.started_at, 1),
+                'targets': len(self.targets),
+                'scanning': len(self.running),
+                'scanned': len(self.latest),
+                'config': self.config_path,
+                'rules': self.rules_file,
+                'loaded_at': {name: datetime.fromtimestamp(loaded).isoformat(timespec='seconds')
+                              for name, loaded in self.loaded_at.items()}
+            }
+
+    def results(self, name: Optional[str] = None) -> Optional[Dict]:
+        with self.lock:
+            if name is None:
+                return {self.targets[url].name if url in self.targets else url: entry
+                        for url, entry in self.latest.items()}
+        target = self.find_target(name)
+        with self.lock:
+            return self.latest.get(target.url) if target is not None else None
+
+
+class _DaemonRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'yk-headers-daemon'
+
+    def log_message(self, format, *args) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send(self, status: int, payload) -> None:
+        body = json.dumps(payload, indent=2, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self) -> Tuple[str, Optional[str]]:
+        path = self.path.split('?', 1)[0].strip('/')
+        route, _, name = path.partition('/')
+        return route, unquote(name) or None
+
+    def do_GET(self) -> None:
+        daemon = self.server.daemon_ref
+        route, name = self._route()
+        if route == 'health':
+            self._send(200, daemon.status())
+        elif route == 'targets':
+            with daemon.lock:
+                targets = [target.describe() for target in daemon.targets.values()]
+            self._send(200, targets)
+        elif route == 'results':
+            results = daemon.results(name)
+            if results is None:
+                self._send(404, {'error': f"No results for {name}"})
+            else:
+                self._send(200, results)
+        else:
+            self._send(404, {'error': 'Not found'})
+
+    def do_POST(self) -> None:
+        daemon = self.server.daemon_ref
+        route, name = self._route()
+        if route == 'reload':
+            daemon.reload(force=True)
+            self._send(200, daemon.status())
+        elif route == 'scan' and name:
+            target = daemon.find_target(name)
+            if target is None:
+                self._send(404, {'error': f"Unknown target: {name}"})
+                return
+            future = daemon.submit(target)
+            if future is None:
+                self._send(409, {'error': f"{name} is already being scanned"})
+                return
+            self._send(200, future.result())
+        else:
+            self._send(404, {'error': 'Not found'})
+
+
+def serve(daemon: ScanDaemon, listen: str = DEFAULT_LISTEN) -> ThreadingHTTPServer:
+    """Yerel HTTP ucunu arka plan thread'inde başlatır"""
+    host, _, port = listen.rpartition(':')
+    server = ThreadingHTTPServer((host or '127.0.0.1', int(port)), _DaemonRequestHandler)
+    server.daemon_threads = True
+    server.daemon_ref = daemon
+    threading.Thread(target=server.serve_forever, name='daemon-http', daemon=True).start()
+    logger.info(f"HTTP endpoint listening on http://{server.server_address[0]}:"
+                f"{server.server_address[1]}")
+    return server
+
+
+def main():
+    """Ana fonksiyon"""
+    parser = argparse.ArgumentParser(description='Run scheduled security header scans as a daemon')
+    parser.add_argument('--config', required=True,
+                       help='Target schedule (.json/.json5) or inventory file; reloaded on change')
+    parser.add_argument('--rules', default=DEFAULT_RULES_FILE,
+                       help='Rule file; reloaded on change')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                       help=f'Default scan interval in seconds (default: {DEFAULT_INTERVAL:g})')
+    parser.add_argument('--jitter', type=float, default=DEFAULT_JITTER,
+                       help=f'Random interval jitter as a fraction (default: {DEFAULT_JITTER})')
+    parser.add_argument('--listen', default=DEFAULT_LISTEN,
+                       help=f'HTTP endpoint address (default: {DEFAULT_LISTEN}; "off" to disable)')
+    parser.add_argument('--outdir', default='data/raw_reports',
+                       help='Directory of the JSONL result log')
+    parser.add_argument('--trend-db', default=None,
+                       help='Also record results in this SQLite trend database')
+    parser.add_argument('--concurrency', type=int, default=4,
+                       help='Targets scanned in parallel (default: 4)')
+    parser.add_argument('--pool-size', type=int, default=10,
+                       help='Keep-alive connections kept per host (default: 10)')
+    parser.add_argument('--dns-ttl', type=float, default=DEFAULT_DNS_TTL,
+                       help=f'Seconds resolved addresses are reused across requests '
+                            f'(default: {DEFAULT_DNS_TTL}; 0 disables the DNS cache)')
+    parser.add_argument('--strict', action='store_true',
+                       help='Enable strict mode checking')
+    parser.add_argument('--probe', choices=['get', 'head'], default='get',
+                       help='Request mode')
+    parser.add_argument('--rate-per-host', type=float, metavar='RPS',
+                       help='Maximum requests per second to a single host')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                       help=f'Retries for transient errors (default: {DEFAULT_RETRIES})')
+    parser.add_argument('--reload-poll', type=float, default=DEFAULT_RELOAD_POLL,
+                       help=f'Seconds between config change checks (default: {DEFAULT_RELOAD_POLL:g})')
+
+    args = parser.parse_args()
+    setup_logging(os.path.join(args.outdir, 'errors.log'))
+
+    checker = SecurityHeaderChecker(strict_mode=args.strict, pool_size=args.pool_size,
+                                    probe_mode=args.probe, rules_file=args.rules,
+                                    rate_limiter=RateLimiter(host_rate=args.rate_per_host,
+                                                             retries=args.retries),
+                                    dns_ttl=args.dns_ttl)
+    daemon = ScanDaemon(checker, args.config, args.rules, args.outdir, args.concurrency,
+                        args.interval, args.jitter, args.trend_db, args.reload_poll)
+    server = serve(daemon, args.listen) if args.listen != 'off' else None
+
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    signal.signal(signal.SIGINT, lambda *_: daemon.stop())
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, lambda *_: daemon.reload_requested.set())
+    try:
+        daemon.run_forever()
+    finally:
+        if server is not None:
+            server.shutdown()
+        daemon.close()
+        logger.info("Daemon stopped")
+
+if __name__ == '__main__':
+    main()
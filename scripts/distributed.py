@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+Dağıtık Tarama: Koordinatör / Worker Modu
+Yazılım Kalite ve Güvence - Konfigürasyon/Güvenlik Başlıkları Testi
+
+Koordinatör hedef envanterini sabit boyutlu shard'lara böler ve bunları
+paylaşımlı bir dizindeki dosya kuyruğuna (ör. NFS) yazar. Worker'lar (aynı
+makinede veya farklı node'larda) shard'ları atomik rename ile sahiplenir,
+SecurityHeaderChecker ile tarar ve sonuçları shard başına append-only JSONL
+loglarına akıtır. Koordinatör tüm shard'lar bitince sonuçları envanter
+sırasıyla birleştirip olağan all_headers_*.json ve analiz çıktılarını üretir.
+
+Kuyruk dizini:
+    job.json              - çalıştırma kimliği, lease süresi, shard boyutu, checker ayarları
+    enqueued.json         - kuyruğa yazılan shard ve hedef sayısı; envanter bitince complete
+    pending/shard_N.json  - bekleyen shard'lar
+    running/shard_N.json@worker - sahiplenilmiş shard; mtime worker'ın heartbeat'idir
+    done/shard_N.json     - tamamlanan shard'lar
+    results/shard_N.json@worker/headers_results.jsonl - shard sonuçları
+    processed/            - worker'ların yan çıktıları (CSV özetleri vb.)
+    complete              - koordinatör bitti; worker'lar çıkar
+
+Bir worker çökerse heartbeat'i durur; lease süresi dolan shard koordinatör
+tarafından yeniden kuyruğa alınır ve bir sonraki worker yalnızca sonucu
+henüz yazılmamış URL'leri tarar. Koordinatör envanteri yazarken çökerse aynı
+envanterle yeniden başlatıldığında kuyruğa alınmış hedefleri atlayıp kalanları
+yazmaya devam eder.
+
+Kullanım:
+    python scripts/distributed.py coordinator --queue data/queue --targets all --local-workers 4
+    python scripts/distributed.py coordinator --queue /mnt/shared/queue --inventory hosts.txt
+    python scripts/distributed.py worker --queue /mnt/shared/queue --concurrency 32
+"""
+
+import argparse
+import glob
+import itertools
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from header_check import DEFAULT_LOG_FILE, SecurityHeaderChecker, setup_logging
+from inventory import DEFAULT_PORTS, iter_inventory, parse_ports
+from parse_reports import ReportParser
+from rate_limit import DEFAULT_RETRIES, RateLimiter
+from result_store import RESULT_LOG_NAME, iter_result_log
+from rule_engine import DEFAULT_RULES_FILE
+from trend_store import TrendStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_DIR = 'data/queue'
+DEFAULT_SHARD_SIZE = 50
+DEFAULT_LEASE = 60
+POLL_INTERVAL = 1.0
+
+# Sahiplenilmiş shard dosya adında shard adı ile worker kimliğini ayırır
+WORKER_SEPARATOR = '@'
+
+
+class ShardQueue:
+    """Paylaşımlı bir dizin üzerinde rename tabanlı, çökmeye dayanıklı shard kuyruğu
+
+    Tüm durum geçişleri aynı dosya sistemi içinde os.rename ile yapılır; rename
+    atomik olduğu için bir shard'ı aynı anda yalnızca bir worker sahiplenebilir.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pending = os.path.join(path, 'pending')
+        self.running = os.path.join(path, 'running')
+        self.done = os.path.join(path, 'done')
+        self.results = os.path.join(path, 'results')
+        self.processed = os.path.join(path, 'processed')
+
+    def _job_file(self) -> str:
+        return os.path.join(self.path, 'job.json')
+
+    def _progress_file(self) -> str:
+        return os.path.join(self.path, 'enqueued.json')
+
+    def create(self, job: Dict) -> None:
+        for directory in (self.pending, self.running, self.done, self.results, self.processed):
+            os.makedirs(directory, exist_ok=True)
+        self._write_atomic(self._job_file(), job)
+
+    def job(self) -> Optional[Dict]:
+        try:
+            with open(self._job_file(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write_atomic(self, path: str, data) -> None:
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    def enqueue_progress(self) -> Dict:
+        """Kuyruğa yazılmış shard ve hedef sayısını, envanterin bitip bitmediğini döndürür"""
+        try:
+            with open(self._progress_file(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'shards': 0, 'jobs': 0, 'complete': False}
+
+    def save_progress(self, shards: int, jobs: int, complete: bool = False) -> None:
+        self._write_atomic(self._progress_file(),
+                           {'shards': shards, 'jobs': jobs, 'complete': complete})
+
+    def add_shard(self, index: int, jobs: List[Tuple[str, str]]) -> str:
+        """Shard'ı önce geçici adla yazıp bekleyenlere taşır (yarım shard okunmaz)"""
+        name = f"shard_{index:06d}.json"
+        temp_path = os.path.join(self.path, name)
+        self._write_atomic(temp_path, {'index': index, 'jobs': jobs})
+        os.replace(temp_path, os.path.join(self.pending, name))
+        return name
+
+    def claim(self, worker_id: str) -> Optional[Tuple[str, str]]:
+        """Bekleyen ilk shard'ı sahiplenir; (shard adı, running yolu) veya None döndürür"""
+        for name in sorted(os.listdir(self.pending)):
+            if not name.endswith('.json'):
+                continue
+            claimed = os.path.join(self.running, f"{name}{WORKER_SEPARATOR}{worker_id}")
+            try:
+                os.rename(os.path.join(self.pending, name), claimed)
+            except FileNotFoundError:
+                continue  # başka bir worker önce davrandı
+            # Heartbeat saati sahiplenme anından başlar (rename mtime'ı korur)
+            try:
+                os.utime(claimed)
+            except FileNotFoundError:
+                continue  # eski mtime yüzünden hemen yeniden kuyruğa alındı
+            return name, claimed
+        return None
+
+    def load_shard(self, path: str) -> List[Tuple[str, str]]:
+        with open(path, 'r', encoding='utf-8') as f:
+            return [tuple(job) for job in json.load(f)['jobs']]
+
+    def finish(self, name: str, claimed: str) -> bool:
+        """Shard'ı tamamlandı olarak işaretler; lease'i kaybedilmişse False döner"""
+        try:
+            os.rename(claimed, os.path.join(self.done, name))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def requeue_expired(self, lease: float) -> List[str]:
+        """Heartbeat'i lease süresinden eski olan shard'ları bekleyenlere geri taşır"""
+        requeued = []
+        now = time.time()
+        for claimed_name in os.listdir(self.running):
+            claimed = os.path.join(self.running, claimed_name)
+            try:
+                if now - os.stat(claimed).st_mtime <= lease:
+                    continue
+                name = claimed_name.split(WORKER_SEPARATOR, 1)[0]
+                os.rename(claimed, os.path.join(self.pending, name))
+            except FileNotFoundError:
+                continue  # bu arada tamamlandı
+            requeued.append(claimed_name)
+        return requeued
+
+    def counts(self) -> Dict[str, int]:
+        return {state: len([name for name in os.listdir(path) if '.json' in name])
+                for state, path in (('pending', self.pending), ('running', self.running),
+                                    ('done', self.done))}
+
+    def results_dir(self, name: str, worker_id: str) -> str:
+        return os.path.join(self.results, f"{name}{WORKER_SEPARATOR}{worker_id}")
+
+    def shard_results(self, name: str) -> Iterator[Dict]:
+        """Shard'ın tüm worker'lardan gelen (kısmi dahil) sonuç kayıtlarını döndürür"""
+        pattern = os.path.join(glob.escape(self.results), f"{glob.escape(name)}{WORKER_SEPARATOR}*",
+                               RESULT_LOG_NAME)
+        for log_file in sorted(glob.glob(pattern)):
+            yield from iter_result_log(log_file)
+
+    def done_shards(self) -> List[str]:
+        return sorted(name for name in os.listdir(self.done) if name.endswith('.json'))
+
+    def mark_complete(self) -> None:
+        with open(os.path.join(self.path, 'complete'), 'w', encoding='utf-8') as f:
+            f.write(datetime.now().isoformat())
+
+    def is_complete(self) -> bool:
+        return os.path.exists(os.path.join(self.path, 'complete'))
+
+
+class _Heartbeat:
+    """Sahiplenilen shard dosyasının mtime'ını düzenli olarak günceller"""
+
+    def __init__(self, path: str, interval: float):
+        self.path = path
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self.stop_event.wait(self.interval):
+            try:
+                os.utime(self.path)
+            except FileNotFoundError:
+                return  # lease kaybedildi; shard yeniden kuyruğa alındı
+
+    def __enter__(self) -> '_Heartbeat':
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop_event.set()
+        self.thread.join()
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def run_worker(queue_dir: str, worker_id: Optional[str] = None, concurrency: int = 1,
+               backend: str = 'thread', pool_size: int = 10,
+               rate_limiter: Optional[RateLimiter] = None, poll: float = POLL_INTERVAL) -> int:
+    """Kuyruk bitene kadar shard sahiplenip tarar; taranan hedef sayısını döndürür"""
+    queue = ShardQueue(queue_dir)
+    worker_id = worker_id or default_worker_id()
+    job = queue.job()
+    while job is None:
+        time.sleep(poll)
+        job = queue.job()
+
+    checker = SecurityHeaderChecker(pool_size=pool_size, rate_limiter=rate_limiter,
+                                    **job['checker'])
+    scanned = 0
+    try:
+        while True:
+            claimed = queue.claim(worker_id)
+            if claimed is None:
+                if queue.is_complete():
+                    break
+                time.sleep(poll)
+                continue
+            name, path = claimed
+            with _Heartbeat(path, job['lease'] / 3):
+                # Çöken bir worker'ın yazdığı sonuçlar tekrar taranmaz
+                completed = {record.get('url') for record in queue.shard_results(name)}
+                jobs = [(target, url) for target, url in queue.load_shard(path)
+                        if url not in completed]
+                logger.info(f"Worker {worker_id} scanning {name}: {len(jobs)} targets "
+                            f"({len(completed)} already done)")
+                checker.run_checks([], queue.results_dir(name, worker_id),
+                                   concurrency=concurrency, backend=backend,
+                                   output_format='jsonl', inventory=iter(jobs),
+                                   processed_dir=queue.processed)
+                scanned += len(jobs)
+            if not queue.finish(name, path):
+                logger.warning(f"Lease for {name} expired before it finished; "
+                               f"its results are kept and merged")
+    finally:
+        checker.close()
+    logger.info(f"Worker {worker_id} finished: {scanned} targets scanned")
+    return scanned
+
+
+def _iter_shards(jobs: Iterable[Tuple[str, str]], shard_size: int) -> Iterator[List[Tuple[str, str]]]:
+    shard = []
+    for job in jobs:
+        shard.append(job)
+        if len(shard) >= shard_size:
+            yield shard
+            shard = []
+    if shard:
+        yield shard
+
+
+class Coordinator:
+    """Envanteri shard'lara bölen, worker'ları izleyen ve sonuçları birleştiren koordinatör"""
+
+    def __init__(self, queue_dir: str, output_dir: str = 'data/raw_reports',
+                 shard_size: int = DEFAULT_SHARD_SIZE, lease: float = DEFAULT_LEASE,
+                 checker_options: Optional[Dict] = None, poll: float = POLL_INTERVAL):
+        self.queue = ShardQueue(queue_dir)
+        self.output_dir = output_dir
+        self.shard_size = shard_size
+        self.lease = lease
+        self.checker_options = checker_options or {}
+        self.poll = poll
+        self.workers = []
+
+    def start_local_workers(self, count: int, worker_args: List[str]) -> None:
+        """Aynı makinede count adet worker process'i başlatır"""
+        for _ in range(count):
+            self._spawn_worker(worker_args)
+
+    def _spawn_worker(self, worker_args: List[str]) -> None:
+        command = [sys.executable, os.path.abspath(__file__), 'worker',
+                   '--queue', self.queue.path] + worker_args
+        self.workers.append((subprocess.Popen(command), worker_args))
+
+    def _check_workers(self) -> None:
+        """Beklenmedik şekilde çıkan yerel worker'ların yerine yenisini başlatır"""
+        for index, (process, worker_args) in enumerate(self.workers):
+            code = process.poll()
+            if code is not None and code != 0:
+                logger.warning(f"Local worker {process.pid} exited with code {code}; restarting")
+                self.workers[index] = None
+                self._spawn_worker(worker_args)
+        self.workers = [worker for worker in self.workers if worker is not None]
+
+    def run(self, jobs: Iterable[Tuple[str, str]], local_workers: int = 0,
+            worker_args: Optional[List[str]] = None) -> str:
+        """Taramayı dağıtır, bitmesini bekler ve çalıştırma kimliğini döndürür
+
+        Kuyruk dizininde tamamlanmamış bir çalıştırma varsa yazılmış shard'lar
+        yeniden yazılmaz; envanter yazımı yarıda kaldıysa jobs'un kuyruğa alınmış
+        kısmı atlanır ve kalan hedefler yazılır, ardından izlemeye devam edilir.
+        """
+        job = self.queue.job()
+        if job is not None and self.queue.is_complete():
+            raise RuntimeError(f"Queue {self.queue.path} already holds a finished run; "
+                               f"use a new --queue directory")
+        resume = job is not None
+        if resume:
+            logger.info(f"Resuming run {job['run_id']} in {self.queue.path}")
+        else:
+            job = {
+                'run_id': datetime.now().strftime('%Y%m%d_%H%M%S'),
+                'lease': self.lease,
+                'shard_size': self.shard_size,
+                'checker': self.checker_options
+            }
+            self.queue.create(job)
+        self.lease = job['lease']
+        self.shard_size = job.get('shard_size', self.shard_size)
+
+        self.start_local_workers(local_workers, worker_args or [])
+        progress = self.queue.enqueue_progress()
+        if not progress['complete']:
+            if progress['jobs']:
+                logger.info(f"Resuming enqueue after {progress['shards']} shards "
+                            f"({progress['jobs']} targets)")
+            self._enqueue(jobs, progress['shards'], progress['jobs'])
+
+        last_counts = None
+        while True:
+            for claimed_name in self.queue.requeue_expired(self.lease):
+                logger.warning(f"Requeued {claimed_name}: worker heartbeat expired")
+            counts = self.queue.counts()
+            if counts != last_counts:
+                logger.info(f"Shards: {counts['done']} done, {counts['running']} running, "
+                            f"{counts['pending']} pending")
+                last_counts = counts
+            if not counts['pending'] and not counts['running']:
+                break
+            self._check_workers()
+            time.sleep(self.poll)
+
+        self.queue.mark_complete()
+        for process, _ in self.workers:
+            process.wait()
+        return job['run_id']
+
+    def _enqueue(self, jobs: Iterable[Tuple[str, str]], shards: int, queued: int) -> None:
+        """Envanteri shard'lara yazar; ilerleme her shard'dan sonra kaydedilir
+
+        Shard'lar envanter okunurken yazılır; worker'lar ilk shard'la başlar.
+        İlerleme shard'dan sonra kaydedildiği için arada çökülürse son shard
+        yeniden yazılır (sonuçlar URL'ye göre tekilleşir), hiçbir hedef kaybolmaz.
+        """
+        for shard in _iter_shards(itertools.islice(jobs, queued, None), self.shard_size):
+            shards += 1
+            queued += len(shard)
+            self.queue.add_shard(shards, shard)
+            self.queue.save_progress(shards, queued)
+        self.queue.save_progress(shards, queued, complete=True)
+        logger.info(f"Queued {shards} shards of up to {self.shard_size} targets")
+
+    def merge(self, run_id: str, trend_db: Optional[str] = None) -> str:
+        """Shard sonuçlarını envanter sırasıyla birleştirir, all_headers dosyasını döndürür
+
+        Aynı URL için birden fazla sonuç varsa (lease'i dolan ama bitiren
+        worker) ilki kullanılır.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        os.makedirs('data/processed', exist_ok=True)
+        checker = SecurityHeaderChecker(**self.checker_options)
+        store = TrendStore(trend_db) if trend_db else None
+        all_results = []
+        try:
+            for name in self.queue.done_shards():
+                results = {}
+                for record in self.queue.shard_results(name):
+                    record.pop('run_id', None)
+                    results.setdefault(record.get('url'), record)
+                for target, url in self.queue.load_shard(os.path.join(self.queue.done, name)):
+                    result = results.get(url)
+                    if result is None:
+                        logger.warning(f"No result for {target} ({url}) in {name}")
+                        continue
+                    checker._save_target_result(result, self.output_dir, run_id)
+                    if store is not None:
+                        store.write(result, run_id)
+                    all_results.append(result)
+        finally:
+            checker.close()
+            if store is not None:
+                store.close()
+
+        combined_file = f"{self.output_dir}/all_headers_{run_id}.json"
+        with open(combined_file, 'w', encoding='utf-8') as f:
+            json.dump(all_results, f, indent=2, ensure_ascii=False)
+        logger.info(f"Combined results saved: {combined_file} ({len(all_results)} targets)")
+        return combined_file
+
+
+def _add_worker_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--concurrency', type=int, default=1,
+                       help='Targets scanned in parallel within a worker')
+    parser.add_argument('--backend', choices=['thread', 'async'], default='thread',
+                       help='Concurrency backend of a worker')
+
+
+def main():
+    """Ana fonksiyon"""
+    parser = argparse.ArgumentParser(description='Distributed security header scanning')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    coordinator = commands.add_parser('coordinator', help='Shard targets and merge results')
+    coordinator.add_argument('--queue', default=DEFAULT_QUEUE_DIR,
+                            help='Shared queue directory (must be visible to all workers)')
+    coordinator.add_argument('--targets',
+                            help='Comma-separated list of targets (all, dvwa, bwapp, ...)')
+    coordinator.add_argument('--inventory', action='append', metavar='FILE',
+                            help='Inventory file (txt/csv/json/jsonl, "-" for stdin); may be repeated')
+    coordinator.add_argument('--ports', default=','.join(str(port) for port in DEFAULT_PORTS),
+                            help='Ports for inventory entries without a port')
+    coordinator.add_argument('--outdir', default='data/raw_reports',
+                            help='Output directory for merged reports')
+    coordinator.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE,
+                            help=f'Targets per shard (default: {DEFAULT_SHARD_SIZE})')
+    coordinator.add_argument('--lease', type=float, default=DEFAULT_LEASE,
+                            help=f'Seconds without a worker heartbeat before a shard is '
+                                 f'requeued (default: {DEFAULT_LEASE})')
+    coordinator.add_argument('--local-workers', type=int, default=0,
+                            help='Start N worker processes on this machine')
+    coordinator.add_argument('--strict', action='store_true',
+                            help='Enable strict mode checking')
+    coordinator.add_argument('--probe', choices=['get', 'head'], default='get',
+                            help='Request mode used by all workers')
+    coordinator.add_argument('--rules', default=DEFAULT_RULES_FILE,
+                            help='Rule file used by all workers (must exist on every node)')
+    coordinator.add_argument('--trend-db', default=None,
+                            help='Also record merged results in this SQLite trend database')
+    coordinator.add_argument('--no-analysis', action='store_true',
+                            help='Skip running parse_reports analysis on the merged results')
+    _add_worker_arguments(coordinator)
+
+    worker = commands.add_parser('worker', help='Scan shards from a queue directory')
+    worker.add_argument('--queue', default=DEFAULT_QUEUE_DIR,
+                       help='Shared queue directory')
+    worker.add_argument('--worker-id', default=None,
+                       help='Worker identifier (default: hostname-pid)')
+    worker.add_argument('--pool-size', type=int, default=10,
+                       help='Keep-alive connections kept per host (default: 10)')
+    worker.add_argument('--rate-per-host', type=float, metavar='RPS',
+                       help='Maximum requests per second to a single host from this worker')
+    worker.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                       help=f'Retries for transient errors (default: {DEFAULT_RETRIES})')
+    _add_worker_arguments(worker)
+
+    args = parser.parse_args()
+    setup_logging(os.path.join(args.outdir, 'errors.log') if args.command == 'coordinator'
+                  else DEFAULT_LOG_FILE)
+
+    if args.command == 'worker':
+        run_worker(args.queue, args.worker_id, args.concurrency, args.backend, args.pool_size,
+                   RateLimiter(host_rate=args.rate_per_host, retries=args.retries))
+        return
+
+    coordinator_obj = Coordinator(args.queue, args.outdir, args.shard_size, args.lease,
+                                  {'strict_mode': args.strict, 'probe_mode': args.probe,
+                                   'rules_file': args.rules})
+    if args.inventory:
+        jobs = iter_inventory(args.inventory, parse_ports(args.ports))
+    elif args.targets:
+        checker = SecurityHeaderChecker()
+        jobs = checker._named_jobs([t.strip() for t in args.targets.split(',')])
+        checker.close()
+    elif coordinator_obj.queue.job() is None:
+        parser.error('one of --targets or --inventory is required')
+    elif not coordinator_obj.queue.enqueue_progress()['complete']:
+        parser.error('the previous coordinator stopped while queueing shards; '
+                     'pass the same --targets or --inventory to resume')
+    else:
+        jobs = []  # devam eden çalıştırma; shard'lar zaten kuyrukta
+
+    worker_args = ['--concurrency', str(args.concurrency), '--backend', args.backend]
+    run_id = coordinator_obj.run(jobs, args.local_workers, worker_args)
+    combined_file = coordinator_obj.merge(run_id, args.trend_db)
+    if not args.no_analysis:
+        ReportParser().run_analysis(combined_file)
+
+if __name__ == '__main__':
+    main()
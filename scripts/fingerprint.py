@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Başlık Parmak İzi Yardımcıları
+Yazılım Kalite ve Güvence - Konfigürasyon/Güvenlik Başlıkları Testi
+
+Güvenlik analizinde kullanılan başlıkların normalize edilmiş halinden
+kısa bir parmak izi üretir. Aynı parmak izine sahip yanıtlar aynı bulguları
+üreteceği için analiz bir kez yapılıp paylaşılabilir.
+"""
+
+import hashlib
+from typing import Collection, List, Tuple
+
+from cookie_parser import compact_cookie, parse_cookies
+
+# _analyze_headers tarafından okunan başlıklar (küçük harf)
+SECURITY_HEADERS = (
+    'strict-transport-security',
+    'content-security-policy',
+    'x-content-type-options',
+    'x-frame-options',
+    'set-cookie',
+    'server',
+    'referrer-policy',
+)
+
+
+def normalize_security_headers(headers, names: Collection[str] = SECURITY_HEADERS
+                               ) -> List[Tuple[str, str]]:
+    """Güvenlikle ilgili başlıkları (ad, değer) çiftleri olarak sıralı döndürür
+
+    Set-Cookie değerleri her istekte değişen oturum kimlikleri içerdiği için
+    yalnızca çerez adları ve öznitelikleri parmak izine girer. names, dikkate
+    alınan küçük harfli başlık adlarıdır (ör. kural motorunun izlediği başlıklar).
+    """
+    normalized = []
+    for name, value in headers.items():
+        lowered = name.lower()
+        if lowered == 'set-cookie':
+            for cookie in parse_cookies(header_value=str(value)):
+                normalized.append((lowered, '|'.join(compact_cookie(cookie))))
+        elif lowered in names:
+            normalized.append((lowered, ' '.join(str(value).split())))
+    normalized.sort()
+    return normalized
+
+
+def header_fingerprint(headers, names: Collection[str] = SECURITY_HEADERS, salt: str = '') -> str:
+    """Güvenlik başlıklarının kısa SHA-1 parmak izini döndürür
+
+    salt (ör. kural kümesinin imzası) verilirse parmak izine katılır; kurallar
+    değiştiğinde eski parmak izleri böylece kendiliğinden geçersiz olur.
+    """
+    digest = hashlib.sha1(salt.encode('utf-8'))
+    for name, value in normalize_security_headers(headers, names):
+        digest.update(name.encode('utf-8'))
+        digest.update(b'\x00')
+        digest.update(value.encode('utf-8'))
+        digest.update(b'\x01')
+    return digest.hexdigest()[:16]
@@ -12,14 +12,46 @@ Kullanım:
 
 import json
 import argparse
+import functools
 import os
 import sys
 from datetime import datetime
-from typing import Dict, List, Any
-import pandas as pd
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import CellIsRule
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+
+from aggregation import AGGREGATION_ENGINES, make_aggregator
+from result_store import (iter_file_records, iter_file_shards, iter_report_records,
+                          map_file_shards, report_files)
+
+# Bu satır sayısının üzerindeki raporlar write-only (akışlı) modda yazılır
+STREAMING_ROW_THRESHOLD = 50000
+
+# workers > 1 iken bir process'in tek seferde satıra çevirdiği en fazla dosya sayısı;
+# ana process'te bekleyen satırlar workers * 2 parçayla sınırlı kalır
+SHARD_FILES = 16
+
+SEVERITY_COLORS = {'High': "FF6B6B", 'Medium': "FFE66D", 'Low': "4ECDC4"}
+STATUS_COLORS = {'pass': "4ECDC4", 'warn': "FFE66D", 'fail': "FF6B6B"}
+
+COLUMN_WIDTHS = {
+    'A': 15,  # Target
+    'B': 25,  # Header_Name
+    'C': 40,  # Value
+    'D': 10,  # Status
+    'E': 12,  # Severity
+    'F': 50   # Remark
+}
+
+SUMMARY_COLUMN_WIDTHS = {'A': 25, 'B': 20, 'C': 10, 'D': 10, 'E': 10}
+
+
+def _solid_fill(color: str) -> PatternFill:
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
 
 class ComparisonGenerator:
     """Karşılaştırma Excel raporu oluşturucu sınıfı"""
@@ -28,49 +60,37 @@ class ComparisonGenerator:
         self.data = []
         self.headers = ['Target', 'Header_Name', 'Value', 'Status', 'Severity', 'Remark']
     
-    def load_json_files(self, input_path: str) -> List[Dict]:
-        """JSON dosyalarını yükler"""
-        data = []
-        
-        if os.path.isfile(input_path):
-            # Tek dosya
-            with open(input_path, 'r', encoding='utf-8') as f:
-                file_data = json.load(f)
-                if isinstance(file_data, list):
-                    data.extend(file_data)
-                else:
-                    data.append(file_data)
-        else:
-            # Dizin
-            if not os.path.exists(input_path):
-                print(f"Directory not found: {input_path}")
-                return data
-            
-            for filename in os.listdir(input_path):
-                if filename.endswith('.json') and not filename.startswith('all_'):
-                    file_path = os.path.join(input_path, filename)
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            file_data = json.load(f)
-                            if isinstance(file_data, list):
-                                data.extend(file_data)
-                            else:
-                                data.append(file_data)
-                    except Exception as e:
-                        print(f"Error loading {filename}: {str(e)}")
-        
-        return data
+    def load_json_files(self, input_path: str, workers: int = 1) -> List[Dict]:
+        """JSON/JSONL rapor dosyalarını yükler (workers > 1 ise paralel)"""
+        if not os.path.exists(input_path):
+            print(f"Directory not found: {input_path}")
+            return []
+        
+        if workers > 1:
+            data = []
+            for records in map_file_shards(_load_shard, report_files(input_path), workers):
+                data.extend(records)
+            return data
+        return list(iter_report_records(input_path))
     
-    def create_comparison_data(self, data: List[Dict]) -> List[Dict]:
+    def create_comparison_data(self, data: Iterable[Dict]) -> List[Dict]:
         """Karşılaştırma verisi oluşturur"""
-        comparison_data = []
+        return list(self.iter_comparison_rows(data))
+    
+    def iter_comparison_rows(self, data: Iterable[Dict], aggregator=None) -> Iterator[Dict]:
+        """Hedef sonuçlarını bulgu başına bir karşılaştırma satırı olarak akıtır
         
+        aggregator verilirse her hedef sonucu aynı geçişte ona da eklenir; özet
+        istatistikleri için veriler ikinci kez taranmaz.
+        """
         for target_data in data:
+            if aggregator is not None:
+                aggregator.add(target_data)
             target_name = target_data.get('target', 'unknown')
             findings = target_data.get('findings', [])
             
             for finding in findings:
-                row = {
+                yield {
                     'Target': target_name,
                     'Header_Name': finding.get('name', ''),
                     'Value': finding.get('value', ''),
@@ -78,12 +98,10 @@ class ComparisonGenerator:
                     'Severity': finding.get('severity', ''),
                     'Remark': finding.get('remark', '')
                 }
-                comparison_data.append(row)
-        
-        return comparison_data
     
-    def create_excel_report(self, comparison_data: List[Dict], output_file: str) -> None:
-        """Excel raporu oluşturur"""
+    def create_excel_report(self, comparison_data: List[Dict], output_file: str,
+                            analysis: Dict[str, Any]) -> None:
+        """Excel raporu oluşturur; özet sayfası önceden hesaplanmış analizden yazılır"""
         # Workbook oluştur
         wb = Workbook()
         ws = wb.active
@@ -99,19 +117,9 @@ class ComparisonGenerator:
             bottom=Side(style='thin')
         )
         
-        # Severity renkleri
-        severity_colors = {
-            'High': PatternFill(start_color="FF6B6B", end_color="FF6B6B", fill_type="solid"),
-            'Medium': PatternFill(start_color="FFE66D", end_color="FFE66D", fill_type="solid"),
-            'Low': PatternFill(start_color="4ECDC4", end_color="4ECDC4", fill_type="solid")
-        }
-        
-        # Status renkleri
-        status_colors = {
-            'pass': PatternFill(start_color="4ECDC4", end_color="4ECDC4", fill_type="solid"),
-            'warn': PatternFill(start_color="FFE66D", end_color="FFE66D", fill_type="solid"),
-            'fail': PatternFill(start_color="FF6B6B", end_color="FF6B6B", fill_type="solid")
-        }
+        # Severity ve status renkleri
+        severity_colors = {name: _solid_fill(color) for name, color in SEVERITY_COLORS.items()}
+        status_colors = {name: _solid_fill(color) for name, color in STATUS_COLORS.items()}
         
         # Başlık satırı
         for col, header in enumerate(self.headers, 1):
@@ -141,90 +149,147 @@ class ComparisonGenerator:
                         cell.fill = status_colors[status]
         
         # Sütun genişliklerini ayarla
-        column_widths = {
-            'A': 15,  # Target
-            'B': 25,  # Header_Name
-            'C': 40,  # Value
-            'D': 10,  # Status
-            'E': 12,  # Severity
-            'F': 50   # Remark
-        }
-        
-        for col, width in column_widths.items():
+        for col, width in COLUMN_WIDTHS.items():
             ws.column_dimensions[col].width = width
         
         # Filtre ekle
         ws.auto_filter.ref = f"A1:{chr(65 + len(self.headers) - 1)}{len(comparison_data) + 1}"
         
         # Özet sayfası oluştur
-        self.create_summary_sheet(wb, comparison_data)
+        self.create_summary_sheet(wb, analysis)
         
         # Dosyayı kaydet
         wb.save(output_file)
         print(f"Excel report saved: {output_file}")
     
-    def create_summary_sheet(self, wb: Workbook, comparison_data: List[Dict]) -> None:
-        """Özet sayfası oluşturur"""
+    def create_streaming_report(self, rows: Iterable[Dict], output_file: str, aggregator) -> int:
+        """Excel raporunu write-only modda, satırları akıtarak oluşturur
+        
+        Satırlar diske yazıldıkça bellekten atılır; hücreler her seferinde yeni
+        stil nesneleri yerine paylaşılan adlandırılmış stilleri kullanır,
+        severity/status renkleri ise koşullu biçimlendirmeyle verilir. Özet
+        sayfası, satırlar tükendikten sonra aggregator.result() ile yazılır
+        (satırları üreten geçiş toplayıcıyı da besler). Yazılan bulgu sayısını
+        döndürür.
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Security Headers Comparison")
+        
+        # Paylaşılan adlandırılmış stiller
+        thin = Side(style='thin')
+        border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        wb.add_named_style(NamedStyle(
+            name='comparison_header',
+            font=Font(bold=True, color="FFFFFF"),
+            fill=_solid_fill("366092"),
+            alignment=Alignment(horizontal='center', vertical='center'),
+            border=border
+        ))
+        wb.add_named_style(NamedStyle(
+            name='comparison_cell',
+            alignment=Alignment(vertical='top', wrap_text=True),
+            border=border
+        ))
+        
+        def styled_row(values, style):
+            cells = []
+            for value in values:
+                cell = WriteOnlyCell(ws, value=value)
+                cell.style = style
+                cells.append(cell)
+            return cells
+        
+        for col, width in COLUMN_WIDTHS.items():
+            ws.column_dimensions[col].width = width
+        
+        ws.append(styled_row(self.headers, 'comparison_header'))
+        
+        total_findings = 0
+        for row_data in rows:
+            ws.append(styled_row([row_data[header] for header in self.headers], 'comparison_cell'))
+            total_findings += 1
+        
+        last_row = total_findings + 1
+        for column, colors in (('D', STATUS_COLORS), ('E', SEVERITY_COLORS)):
+            for value, color in colors.items():
+                ws.conditional_formatting.add(
+                    f"{column}2:{column}{last_row}",
+                    CellIsRule(operator='equal', formula=[f'"{value}"'], fill=_solid_fill(color)))
+        ws.auto_filter.ref = f"A1:{chr(65 + len(self.headers) - 1)}{last_row}"
+        
+        # Özet sayfası
+        summary_data, heading_rows = self._summary_data(aggregator.result())
+        summary = wb.create_sheet("Summary")
+        for col, width in SUMMARY_COLUMN_WIDTHS.items():
+            summary.column_dimensions[col].width = width
+        for row_idx, row_data in enumerate(summary_data, 1):
+            if row_idx == 1:  # Başlık
+                font = Font(bold=True, size=14)
+            elif row_idx in heading_rows:  # Alt başlıklar
+                font = Font(bold=True)
+            else:
+                summary.append(row_data)
+                continue
+            cells = []
+            for value in row_data:
+                cell = WriteOnlyCell(summary, value=value)
+                cell.font = font
+                cells.append(cell)
+            summary.append(cells)
+        
+        wb.save(output_file)
+        print(f"Excel report saved (streaming): {output_file}")
+        return total_findings
+    
+    def create_summary_sheet(self, wb: Workbook, analysis: Dict[str, Any]) -> None:
+        """Özet sayfası oluşturur (analysis: aggregation toplayıcısının sonucu)"""
         ws = wb.create_sheet("Summary")
+        summary_data, heading_rows = self._summary_data(analysis)
         
-        # Veri analizi
-        targets = set(row['Target'] for row in comparison_data)
-        severities = {}
-        statuses = {}
-        header_stats = {}
-        
-        for row in comparison_data:
-            target = row['Target']
-            severity = row['Severity']
-            status = row['Status']
-            header = row['Header_Name']
-            
-            # Severity sayımı
-            if severity not in severities:
-                severities[severity] = 0
-            severities[severity] += 1
-            
-            # Status sayımı
-            if status not in statuses:
-                statuses[status] = 0
-            statuses[status] += 1
-            
-            # Header istatistikleri
-            if header not in header_stats:
-                header_stats[header] = {'total': 0, 'pass': 0, 'warn': 0, 'fail': 0}
-            header_stats[header]['total'] += 1
-            header_stats[header][status] += 1
+        # Veriyi sayfaya yaz
+        for row_idx, row_data in enumerate(summary_data, 1):
+            for col_idx, value in enumerate(row_data, 1):
+                cell = ws.cell(row=row_idx, column=col_idx, value=value)
+                if row_idx == 1:  # Başlık
+                    cell.font = Font(bold=True, size=14)
+                elif row_idx in heading_rows:  # Alt başlıklar
+                    cell.font = Font(bold=True)
+        
+        # Sütun genişliklerini ayarla
+        for col, width in SUMMARY_COLUMN_WIDTHS.items():
+            ws.column_dimensions[col].width = width
+    
+    def _summary_data(self, analysis: Dict[str, Any]) -> Tuple[List[List], List[int]]:
+        """Özet sayfasının satırlarını ve alt başlık satır numaralarını döndürür"""
+        total_findings = analysis['total_findings']
+        heading_rows = []
+        
+        def heading(title: str) -> None:
+            summary_data.append(["", ""])
+            summary_data.append([title, ""])
+            heading_rows.append(len(summary_data))
         
         # Özet bilgileri
         summary_data = [
             ["SUMMARY REPORT", ""],
             ["Generated", datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
-            ["Total Targets", len(targets)],
-            ["Total Findings", len(comparison_data)],
-            ["", ""],
-            ["SEVERITY DISTRIBUTION", ""],
+            ["Total Targets", len(analysis['target_summary'])],
+            ["Total Findings", total_findings],
         ]
         
-        for severity, count in sorted(severities.items()):
-            percentage = (count / len(comparison_data) * 100) if comparison_data else 0
+        heading("SEVERITY DISTRIBUTION")
+        for severity, count in sorted(analysis['severity_counts'].items()):
+            percentage = (count / total_findings * 100) if total_findings else 0
             summary_data.append([severity, f"{count} ({percentage:.1f}%)"])
         
-        summary_data.extend([
-            ["", ""],
-            ["STATUS DISTRIBUTION", ""],
-        ])
-        
-        for status, count in sorted(statuses.items()):
-            percentage = (count / len(comparison_data) * 100) if comparison_data else 0
+        heading("STATUS DISTRIBUTION")
+        for status, count in sorted(analysis['status_counts'].items()):
+            percentage = (count / total_findings * 100) if total_findings else 0
             summary_data.append([status.upper(), f"{count} ({percentage:.1f}%)"])
         
-        summary_data.extend([
-            ["", ""],
-            ["HEADER STATISTICS", ""],
-            ["Header Name", "Total", "Pass", "Warn", "Fail"],
-        ])
-        
-        for header, stats in sorted(header_stats.items()):
+        heading("HEADER STATISTICS")
+        summary_data.append(["Header Name", "Total", "Pass", "Warn", "Fail"])
+        for header, stats in sorted(analysis['header_stats'].items()):
             summary_data.append([
                 header,
                 stats['total'],
@@ -233,52 +298,95 @@ class ComparisonGenerator:
                 stats['fail']
             ])
         
-        # Veriyi sayfaya yaz
-        for row_idx, row_data in enumerate(summary_data, 1):
-            for col_idx, value in enumerate(row_data, 1):
-                cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                if row_idx == 1:  # Başlık
-                    cell.font = Font(bold=True, size=14)
-                elif row_idx in [6, 12, 18]:  # Alt başlıklar
-                    cell.font = Font(bold=True)
-        
-        # Sütun genişliklerini ayarla
-        ws.column_dimensions['A'].width = 25
-        ws.column_dimensions['B'].width = 20
-        ws.column_dimensions['C'].width = 10
-        ws.column_dimensions['D'].width = 10
-        ws.column_dimensions['E'].width = 10
+        return summary_data, heading_rows
     
-    def run_generation(self, input_path: str = 'data/raw_reports', output_dir: str = 'data/processed') -> None:
-        """Karşılaştırma raporu oluşturur"""
+    def _iter_shard_rows(self, input_path: str, workers: int, engine: str,
+                         aggregator) -> Iterator[Dict]:
+        """Parçaları process havuzunda satıra çevirir; her parça geldikçe akıtılır
+
+        Parçanın kısmi analizi satırları akıtılmadan önce toplayıcıya eklenir;
+        satırlar tükendiğinde özet tüm girdiyi kapsar.
+        """
+        shards = iter_file_shards(functools.partial(_comparison_shard, engine=engine),
+                                  report_files(input_path), workers, shard_size=SHARD_FILES)
+        for shard_rows, partial in shards:
+            aggregator.merge(partial)
+            yield from shard_rows
+    
+    def run_generation(self, input_path: str = 'data/raw_reports', output_dir: str = 'data/processed',
+                       workers: int = 1, stream_threshold: int = STREAMING_ROW_THRESHOLD,
+                       engine: str = 'auto') -> None:
+        """Karşılaştırma raporu oluşturur
+        
+        Bulgu sayısı stream_threshold'u aşarsa rapor write-only modda akıtılarak
+        yazılır; eşiğe kadar olan satırlar normal (bellek içi) modda işlenir.
+        workers > 1 iken parça satırları geldikçe yazılır, tamamı toplanmaz.
+        """
         # Output dizinini oluştur
         os.makedirs(output_dir, exist_ok=True)
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
-        # JSON dosyalarını yükle
-        data = self.load_json_files(input_path)
+        if not os.path.exists(input_path):
+            print(f"Directory not found: {input_path}")
+            return
+        
+        # Rapor kayıtlarını tek geçişte hem karşılaştırma satırlarına çevir hem de say
+        aggregator = make_aggregator(engine)
+        if workers > 1:
+            rows = self._iter_shard_rows(input_path, workers, engine, aggregator)
+        else:
+            rows = self.iter_comparison_rows(iter_report_records(input_path), aggregator)
+        
+        # Eşiği aşıp aşmadığını anlamak için en fazla eşik + 1 satır okunur
+        comparison_data = list(islice(rows, stream_threshold + 1))
         
-        if not data:
+        if not comparison_data:
             print("No data found to generate comparison")
             return
         
-        # Karşılaştırma verisi oluştur
-        comparison_data = self.create_comparison_data(data)
-        
         # Excel raporu oluştur
         output_file = f"{output_dir}/comparison_table_{timestamp}.xlsx"
-        self.create_excel_report(comparison_data, output_file)
+        if len(comparison_data) > stream_threshold:
+            total_findings = self.create_streaming_report(chain(comparison_data, rows), output_file,
+                                                          aggregator)
+        else:
+            self.create_excel_report(comparison_data, output_file, aggregator.result())
+            total_findings = len(comparison_data)
         
-        print(f"Comparison report generated with {len(comparison_data)} findings")
+        print(f"Comparison report generated with {total_findings} findings")
+
+def _load_shard(files: List[str]) -> List[Dict]:
+    """Process havuzunda çalışan map adımı: bir dosya parçasının kayıtları"""
+    records = []
+    for file_path in files:
+        try:
+            records.extend(iter_file_records(file_path))
+        except (OSError, ValueError) as e:
+            print(f"Error loading {os.path.basename(file_path)}: {str(e)}")
+    return records
+
+
+def _comparison_shard(files: List[str], engine: str = 'auto') -> Tuple[List[Dict], Dict[str, Any]]:
+    """Process havuzunda çalışan map adımı: bir dosya parçasının satırları ve kısmi analizi"""
+    aggregator = make_aggregator(engine)
+    rows = list(ComparisonGenerator().iter_comparison_rows(_load_shard(files), aggregator))
+    return rows, aggregator.result()
 
 def main():
     """Ana fonksiyon"""
     parser = argparse.ArgumentParser(description='Generate comparison Excel report')
     parser.add_argument('--input', default='data/raw_reports',
-                       help='Input directory or JSON file')
+                       help='Input directory or JSON/JSONL file')
     parser.add_argument('--output', default='data/processed',
                        help='Output directory for Excel report')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Parse report files in N processes')
+    parser.add_argument('--stream-threshold', type=int, default=STREAMING_ROW_THRESHOLD,
+                       help='Write the workbook in streaming mode above this many findings '
+                            '(0 always streams)')
+    parser.add_argument('--engine', choices=AGGREGATION_ENGINES, default='auto',
+                       help='Aggregation engine for the summary sheet')
     
     args = parser.parse_args()
     
@@ -286,7 +394,8 @@ def main():
     generator = ComparisonGenerator()
     
     # Raporu oluştur
-    generator.run_generation(args.input, args.output)
+    generator.run_generation(args.input, args.output, args.workers, args.stream_threshold,
+                             args.engine)
 
 if __name__ == '__main__':
     main()
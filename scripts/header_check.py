@@ -10,37 +10,107 @@ Kullanım:
     python scripts/header_check.py --targets all
     python scripts/header_check.py --targets dvwa,juice-shop
     python scripts/header_check.py --targets dvwa --strict
+    python scripts/header_check.py --targets all --concurrency 8
 """
 
 import requests
+import asyncio
+import copy
 import json
 import csv
 import argparse
 import logging
 import os
 import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterable, List, Tuple, Optional
 from urllib.parse import urlparse
-import ssl
-import socket
 
-# Logging konfigürasyonu
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('data/raw_reports/errors.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+from requests.structures import CaseInsensitiveDict
+
+from connection_cache import (DEFAULT_DNS_TTL, CachingHTTPAdapter, ConnectionCache,
+                              aiohttp_tls_response_class, start_tls_capture, stop_tls_capture,
+                              tls_version_refused)
+from cookie_parser import compact_cookie, parse_cookies
+from crawler import SiteCrawler
+from fingerprint import header_fingerprint
+from instrumentation import (METRICS_FORMATS, RunMetrics, add_phase,
+                             aiohttp_trace_config, current_phases, network_time, start_phases,
+                             stop_phases)
+from inventory import DEFAULT_PORTS, iter_inventory, parse_ports
+from rate_limit import DEFAULT_BACKOFF, DEFAULT_RETRIES, RateLimiter
+from result_store import ParquetExporter, ResultLogWriter, result_log_path
+from rule_engine import DEFAULT_RULES_FILE, RuleEngine
+from scan_cache import DEFAULT_CACHE_ENTRIES, DEFAULT_CACHE_TTL, DEFAULT_SCAN_CACHE, ScanCache
+from trend_store import TrendStore
+
+# Asenkron backend opsiyoneldir; aiohttp yalnızca backend='async' seçildiğinde
+# import edilir (_load_aiohttp), thread backend'inin açılışını yavaşlatmaz
+aiohttp = None
+
+DEFAULT_LOG_FILE = 'data/raw_reports/errors.log'
+
 logger = logging.getLogger(__name__)
 
+
+def setup_logging(log_file: str = DEFAULT_LOG_FILE) -> None:
+    """Logları terminale ve log_file'a yazacak şekilde ayarlar (CLI girişlerinde çağrılır)"""
+    directory = os.path.dirname(log_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+
+
+def _load_aiohttp():
+    """aiohttp'yi ilk asenkron taramada import eder"""
+    global aiohttp
+    if aiohttp is None:
+        try:
+            import aiohttp as module
+        except ImportError:
+            raise RuntimeError("The async backend requires aiohttp (pip install aiohttp)") from None
+        aiohttp = module
+    return aiohttp
+
+# HEAD isteğini desteklemeyen sunucuların döndürdüğü durum kodları
+HEAD_FALLBACK_STATUSES = {400, 405, 501}
+
+# Sonuç vermeyen HTTPS probe'u: (durum kodu, TLS bilgisi)
+NO_HTTPS_PROBE = (None, {})
+
+# Geçici sayılıp yeniden denenen bağlantı hataları; zaman aşımları yalnızca
+# RateLimiter.retry_timeouts açıksa yeniden denenir
+RETRY_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+# TLS bulguları: zayıf sayılan şifre takımları ve sertifika bitiş uyarı eşiği. TLS 1.2
+# altı bağlantılar hiç kurulmaz (connection_cache); bu sunucular TLS_Protocol hatası alır
+WEAK_CIPHER_MARKERS = ('NULL', 'EXPORT', 'RC4', 'DES-CBC3', '3DES', 'MD5')
+MIN_CIPHER_BITS = 128
+CERT_EXPIRY_WARNING_DAYS = 30
+
 class SecurityHeaderChecker:
     """HTTP güvenlik başlıkları kontrol sınıfı"""
     
-    def __init__(self, strict_mode: bool = False):
+    def __init__(self, strict_mode: bool = False, pool_size: int = 10,
+                 probe_mode: str = 'get', rules_file: str = DEFAULT_RULES_FILE,
+                 scan_cache: Optional[ScanCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None, instrument: bool = False,
+                 dns_ttl: float = DEFAULT_DNS_TTL):
         self.strict_mode = strict_mode
+        self.pool_size = pool_size
+        self.probe_mode = probe_mode
+        # Aşama süresi ölçümü; kapalıyken zamanlayan bağlantı sınıfları hiç kurulmaz
+        self.instrument = instrument
         self.targets = {
             'dvwa': 'http://localhost:8081',
             'bwapp': 'http://localhost:8082',
@@ -48,278 +118,765 @@ class SecurityHeaderChecker:
             'juice-shop': 'http://localhost:3000',
             'opencart': 'http://localhost:8084'
         }
+        # Checker ömrü boyunca paylaşılan DNS ve TLS oturum önbelleği (daemon'da süreç boyu)
+        self.connection_cache = ConnectionCache(dns_ttl)
+        self.session = self._create_session(pool_size)
+        self.rule_engine = RuleEngine.from_file(rules_file)
+        # Parmak izi değişmeyen yanıtlar için önceki bulguları saklayan önbellek (opsiyonel)
+        self.scan_cache = scan_cache
+        # Host/global hız sınırı ve yeniden deneme politikası (varsayılan: sınırsız, 2 yeniden
+        # deneme, zaman aşımları hariç)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        
+        # host:port başına HTTPS probe sonuçları (çalıştırma boyunca geçerli)
+        self._https_probe_cache = {}
+        self._https_probe_lock = threading.Lock()
+        self._probe_executor = None
+    
+    def _create_session(self, pool_size: int) -> requests.Session:
+        """Keep-alive bağlantı havuzu kullanan paylaşımlı bir Session oluşturur"""
+        session = requests.Session()
+        adapter = CachingHTTPAdapter(self.connection_cache, timed=self.instrument,
+                                     pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    def close(self) -> None:
+        """Paylaşımlı bağlantı havuzunu ve probe thread'lerini kapatır"""
+        if self._probe_executor is not None:
+            self._probe_executor.shutdown(wait=False, cancel_futures=True)
+            self._probe_executor = None
+        self.session.close()
+    
+    def reset_probe_cache(self) -> None:
+        """HTTPS probe önbelleğini temizler; her çalıştırmanın başında çağrılır"""
+        with self._https_probe_lock:
+            self._https_probe_cache = {}
         
     def check_headers(self, url: str, target_name: str) -> Dict:
         """Hedef URL'de güvenlik başlıklarını kontrol eder"""
+        timing = self._new_timing()
         try:
             logger.info(f"Checking headers for {target_name} at {url}")
             
-            # HTTP isteği gönder
-            response = requests.get(url, timeout=30, allow_redirects=True)
+            # HTTPS probe'u HTTP isteğiyle aynı anda başlat
+            https_probe = self._start_https_probe(url) if url.startswith('http://') else None
             
-            # Temel bilgileri topla
-            result = {
-                'url': url,
-                'target': target_name,
-                'timestamp': datetime.now().isoformat(),
-                'status_code': response.status_code,
-                'headers': dict(response.headers),
-                'findings': []
-            }
-            
-            # Güvenlik başlıklarını kontrol et
-            findings = self._analyze_headers(response.headers, response.status_code)
-            result['findings'] = findings
+            # HTTP isteği gönder
+            cached, conditional = self._cached_entry(url)
+            if self.probe_mode == 'head':
+                response, probe = self._fetch_headers_only(url, timing)
+            else:
+                response = self._request('GET', url, timing, timeout=30, allow_redirects=True,
+                                         headers=conditional)
+                probe = None
+            if response.status_code == 304 and cached is not None:
+                result = self._not_modified_result(url, target_name, cached)
+            else:
+                result = self._build_result(url, target_name, response.status_code,
+                                            response.headers, self._set_cookie_lines(response))
+            if probe is not None:
+                result['probe'] = probe
+            self._add_tls_findings(result, timing['tls'])
             
-            # HTTPS yönlendirme kontrolü
-            if url.startswith('http://'):
-                https_url = url.replace('http://', 'https://')
-                try:
-                    https_response = requests.get(https_url, timeout=10, verify=False)
-                    if https_response.status_code == 200:
-                        result['findings'].append({
-                            'name': 'HTTPS_Redirect',
-                            'value': 'HTTP to HTTPS redirect missing',
-                            'status': 'fail',
-                            'severity': 'High',
-                            'remark': 'HTTPS is available but HTTP does not redirect'
-                        })
-                except:
-                    pass
+            # HTTPS yönlendirme kontrolü: redirect zinciri cevabı veriyorsa probe beklenmez
+            if https_probe is not None:
+                if response.url.startswith('https://'):
+                    self._mark_https_redirect(url)
+                else:
+                    self._add_https_probe_findings(result, self._https_probe_result(https_probe))
             
-            return result
+            return self._finish_timing(result, timing)
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Request failed for {target_name}: {str(e)}")
-            return {
-                'url': url,
-                'target': target_name,
-                'timestamp': datetime.now().isoformat(),
-                'status_code': 0,
-                'headers': {},
-                'findings': [{
-                    'name': 'Connection_Error',
-                    'value': str(e),
-                    'status': 'fail',
-                    'severity': 'High',
-                    'remark': 'Unable to connect to target'
-                }]
-            }
+            return self._finish_timing(self._connection_error_result(url, target_name, e), timing)
         except Exception as e:
             logger.error(f"Unexpected error for {target_name}: {str(e)}")
-            return {
-                'url': url,
-                'target': target_name,
-                'timestamp': datetime.now().isoformat(),
-                'status_code': 0,
-                'headers': {},
-                'findings': [{
-                    'name': 'Unexpected_Error',
-                    'value': str(e),
-                    'status': 'fail',
-                    'severity': 'High',
-                    'remark': 'Unexpected error occurred'
-                }]
-            }
-    
-    def _analyze_headers(self, headers: Dict[str, str], status_code: int) -> List[Dict]:
-        """HTTP başlıklarını analiz eder ve güvenlik bulgularını döndürür"""
-        findings = []
+            return self._finish_timing(self._error_result(url, target_name, 'Unexpected_Error', e,
+                                                          'Unexpected error occurred'), timing)
+    
+    def _new_timing(self) -> Dict:
+        """Hedef başına süre ölçümünü başlatır; instrument açıksa aşama toplamayı etkinleştirir"""
+        timing = {'started': time.perf_counter(), 'wait': 0.0, 'attempts': 0, 'tls': {}}
+        # İsteği taşıyan bağlantının TLS bilgisi bu sözlüğe yazılır (thread backend)
+        timing['tls_context'] = start_tls_capture(timing['tls'])
+        if self.instrument:
+            timing['phases'] = {}
+            timing['context'] = start_phases(timing['phases'])
+        return timing
+    
+    def _finish_timing(self, result: Dict, timing: Dict) -> Dict:
+        """Toplam süreyi, hız sınırı/geri çekilme beklemesini ve deneme sayısını sonuca ekler"""
+        stop_tls_capture(timing['tls_context'])
+        result['timing'] = {
+            'elapsed': round(time.perf_counter() - timing['started'], 3),
+            'wait': round(timing['wait'], 3),
+            'attempts': timing['attempts']
+        }
+        if 'phases' in timing:
+            stop_phases(timing['context'])
+            result['timing']['phases'] = {name: round(seconds, 4)
+                                          for name, seconds in timing['phases'].items()}
+        return result
+    
+    def _request(self, method: str, url: str, timing: Optional[Dict] = None,
+                 retry: bool = True, **kwargs) -> requests.Response:
+        """Hız sınırına uyarak istek gönderir; geçici hataları geri çekilmeyle yeniden dener
         
-        # HSTS kontrolü
-        hsts = headers.get('Strict-Transport-Security', '')
-        if not hsts:
-            findings.append({
-                'name': 'HSTS',
-                'value': 'Missing',
-                'status': 'fail',
-                'severity': 'High',
-                'remark': 'HSTS header is missing - allows protocol downgrade attacks'
-            })
-        else:
-            if 'max-age' in hsts:
-                max_age = self._extract_max_age(hsts)
-                if max_age < 31536000:  # 1 yıl
-                    findings.append({
-                        'name': 'HSTS',
-                        'value': f'max-age={max_age}',
-                        'status': 'warn',
-                        'severity': 'Medium',
-                        'remark': 'HSTS max-age is less than 1 year'
-                    })
+        Denemeler tükenince son yanıt döndürülür veya son bağlantı hatası fırlatılır.
+        """
+        limiter = self.rate_limiter
+        timing = timing if timing is not None else {'wait': 0.0, 'attempts': 0}
+        phases = current_phases()
+        attempt = 0
+        while True:
+            timing['wait'] += limiter.wait(url)
+            timing['attempts'] += 1
+            try:
+                if phases is None:
+                    response = self.session.request(method, url, **kwargs)
                 else:
-                    findings.append({
-                        'name': 'HSTS',
-                        'value': hsts,
-                        'status': 'pass',
-                        'severity': 'Low',
-                        'remark': 'HSTS properly configured'
-                    })
-        
-        # CSP kontrolü
-        csp = headers.get('Content-Security-Policy', '')
-        if not csp:
-            findings.append({
-                'name': 'CSP',
-                'value': 'Missing',
-                'status': 'fail',
-                'severity': 'High',
-                'remark': 'Content Security Policy is missing'
-            })
-        else:
-            if 'unsafe-inline' in csp or '*' in csp:
-                findings.append({
-                    'name': 'CSP',
-                    'value': csp,
-                    'status': 'fail',
-                    'severity': 'High',
-                    'remark': 'CSP contains unsafe directives (unsafe-inline or wildcard)'
-                })
+                    # Ağ aşamaları dışında kalan istek süresi gövde aktarımıdır
+                    network = network_time(phases)
+                    started = time.perf_counter()
+                    response = self.session.request(method, url, **kwargs)
+                    add_phase(phases, 'body', max(time.perf_counter() - started
+                                                  - (network_time(phases) - network), 0.0))
+            except RETRY_EXCEPTIONS as e:
+                timeout = isinstance(e, requests.exceptions.Timeout)
+                if not retry or not limiter.should_retry(attempt, timeout=timeout):
+                    raise
+                delay = limiter.backoff(attempt)
             else:
-                findings.append({
-                    'name': 'CSP',
-                    'value': csp,
-                    'status': 'pass',
-                    'severity': 'Low',
-                    'remark': 'CSP properly configured'
-                })
+                limiter.feedback(url, response.status_code)
+                if not retry or not limiter.should_retry(attempt, response.status_code):
+                    return response
+                delay = limiter.backoff(attempt, response.headers.get('Retry-After'))
+                response.close()
+            logger.warning(f"Retrying {method} {url} in {delay:.2f}s (attempt {attempt + 2})")
+            timing['wait'] += delay
+            time.sleep(delay)
+            attempt += 1
+    
+    def _https_probe_key(self, url: str) -> str:
+        """HTTPS probe önbelleği için host:port anahtarı üretir"""
+        parsed = urlparse(url)
+        return f"{parsed.hostname}:{parsed.port or 443}"
+    
+    def _start_https_probe(self, url: str) -> Future:
+        """Host için HTTPS probe'unu arka planda başlatır veya önbellekteki sonucu döndürür"""
+        https_url = url.replace('http://', 'https://', 1)
+        key = self._https_probe_key(https_url)
+        with self._https_probe_lock:
+            probe = self._https_probe_cache.get(key)
+            if probe is None:
+                if self._probe_executor is None:
+                    self._probe_executor = ThreadPoolExecutor(max_workers=self.pool_size)
+                probe = self._probe_executor.submit(self._probe_https, https_url)
+                self._https_probe_cache[key] = probe
+        return probe
+    
+    def _mark_https_redirect(self, url: str) -> None:
+        """HTTP'nin HTTPS'e yönlendirdiği host'u önbelleğe sonuçlanmış olarak işler
+
+        Çalışan probe iptal edilmez: aynı Future'ı aynı host:port'taki başka
+        hedefler de bekliyor olabilir. Sonraki hedefler yeni probe başlatmaz.
+        """
+        resolved = Future()
+        resolved.set_result(NO_HTTPS_PROBE)
+        with self._https_probe_lock:
+            self._https_probe_cache[self._https_probe_key(url.replace('http://', 'https://', 1))] = resolved
+    
+    def _https_probe_result(self, probe: Future) -> Tuple[Optional[int], Dict]:
+        """Paylaşımlı probe'un sonucunu bekler; iptal edilmiş probe sonuçsuz sayılır"""
+        try:
+            return probe.result()
+        except CancelledError:
+            return NO_HTTPS_PROBE
+    
+    def _add_https_probe_findings(self, result: Dict, outcome: Tuple[Optional[int], Dict]) -> None:
+        """HTTP hedefine HTTPS ucunun yönlendirme ve TLS bulgularını ekler"""
+        status, tls = outcome
+        if status == 200:
+            result['findings'].append(self._https_redirect_finding())
+        # HTTP hedefinin TLS bilgisi aynı host'un HTTPS ucundan (probe bağlantısından) gelir
+        self._add_tls_findings(result, tls)
+    
+    def _probe_https(self, https_url: str) -> Tuple[Optional[int], Dict]:
+        """HTTPS ucunun durum kodunu ve TLS bilgisini döndürür; ulaşılamıyorsa (None, {})
         
-        # X-Content-Type-Options kontrolü
-        x_content_type = headers.get('X-Content-Type-Options', '')
-        if not x_content_type or x_content_type.lower() != 'nosniff':
-            findings.append({
-                'name': 'X-Content-Type-Options',
-                'value': x_content_type or 'Missing',
-                'status': 'fail' if not x_content_type else 'warn',
-                'severity': 'Medium',
-                'remark': 'X-Content-Type-Options should be set to nosniff'
-            })
-        else:
-            findings.append({
-                'name': 'X-Content-Type-Options',
-                'value': x_content_type,
-                'status': 'pass',
-                'severity': 'Low',
-                'remark': 'X-Content-Type-Options properly configured'
-            })
+        Gövde indirilmez. Doğrulama kapalı olduğu için sertifika bitişi bilinmez.
+        """
+        tls = {}
+        token = start_tls_capture(tls)
+        try:
+            with self._request('GET', https_url, retry=False, timeout=10, verify=False,
+                               stream=True) as https_response:
+                return https_response.status_code, tls
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"HTTPS probe failed for {https_url}: {str(e)}")
+            return NO_HTTPS_PROBE
+        finally:
+            stop_tls_capture(token)
+    
+    def _fetch_headers_only(self, url: str,
+                            timing: Optional[Dict] = None) -> Tuple[requests.Response, Dict]:
+        """Yalnızca yanıt başlıklarını alır, gövdeyi hiç indirmez
+
+        Önce HEAD gönderilir; sunucu HEAD'i desteklemiyorsa streamed GET'e
+        düşülür ve başlıklar gelir gelmez bağlantı kapatılır.
+        """
+        response = self._request('HEAD', url, timing, timeout=30, allow_redirects=True)
+        method = 'HEAD'
+        if response.status_code in HEAD_FALLBACK_STATUSES:
+            response.close()
+            response = self._request('GET', url, timing, timeout=30, allow_redirects=True,
+                                     stream=True)
+            method = 'GET (streamed)'
+            response.close()
+        return response, self._probe_info(method, response.headers)
+    
+    def _probe_info(self, method: str, headers) -> Dict:
+        """Header-only probe için kullanılan yöntemi ve kazanılan byte'ı raporlar"""
+        content_length = headers.get('Content-Length', '')
+        return {
+            'mode': 'head',
+            'method': method,
+            'bytes_saved': int(content_length) if content_length.isdigit() else None
+        }
+    
+    async def check_headers_async(self, session, url: str, target_name: str) -> Dict:
+        """check_headers'ın aiohttp tabanlı asenkron karşılığı"""
+        timing = self._new_timing()
+        try:
+            logger.info(f"Checking headers for {target_name} at {url}")
+            
+            # HTTPS probe'u HTTP isteğiyle aynı anda başlat
+            https_probe = None
+            if url.startswith('http://'):
+                https_probe = self._start_https_probe_async(session, url)
+            
+            timeout = aiohttp.ClientTimeout(total=30)
+            cached, conditional = self._cached_entry(url)
+            if self.probe_mode == 'head':
+                method = 'HEAD'
+                response = await self._request_async(session, 'HEAD', url, timing,
+                                                     timeout=timeout, allow_redirects=True)
+                if response.status in HEAD_FALLBACK_STATUSES:
+                    response.close()
+                    method = 'GET (streamed)'
+                    response = await self._request_async(session, 'GET', url, timing,
+                                                         timeout=timeout, allow_redirects=True)
+                # Gövde okunmadan bağlantıyı bırak
+                response.close()
+                result = self._build_result(url, target_name, response.status, response.headers,
+                                            response.headers.getall('Set-Cookie', []))
+                result['probe'] = self._probe_info(method, response.headers)
+            else:
+                response = await self._request_async(session, 'GET', url, timing, timeout=timeout,
+                                                     allow_redirects=True, headers=conditional)
+                async with response:
+                    if response.status == 304 and cached is not None:
+                        result = self._not_modified_result(url, target_name, cached)
+                    else:
+                        result = self._build_result(url, target_name, response.status,
+                                                    response.headers,
+                                                    response.headers.getall('Set-Cookie', []))
+            self._add_tls_findings(result, response.tls_facts)
+            
+            # HTTPS yönlendirme kontrolü: redirect zinciri cevabı veriyorsa probe beklenmez
+            if https_probe is not None:
+                if response.url.scheme == 'https':
+                    resolved = asyncio.get_running_loop().create_future()
+                    resolved.set_result(NO_HTTPS_PROBE)
+                    key = self._https_probe_key(url.replace('http://', 'https://', 1))
+                    self._https_probe_cache[key] = resolved
+                else:
+                    self._add_https_probe_findings(
+                        result, await self._https_probe_result_async(https_probe))
+            
+            return self._finish_timing(result, timing)
+            
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Request failed for {target_name}: {str(e)}")
+            return self._finish_timing(self._connection_error_result(url, target_name, e), timing)
+        except Exception as e:
+            logger.error(f"Unexpected error for {target_name}: {str(e)}")
+            return self._finish_timing(self._error_result(url, target_name, 'Unexpected_Error', e,
+                                                          'Unexpected error occurred'), timing)
+    
+    async def _request_async(self, session, method: str, url: str, timing: Optional[Dict] = None,
+                             retry: bool = True, **kwargs):
+        """_request'in aiohttp karşılığı; beklemeler event loop'u bloklamaz"""
+        limiter = self.rate_limiter
+        timing = timing if timing is not None else {'wait': 0.0, 'attempts': 0}
+        phases = current_phases()
+        if phases is not None:
+            kwargs['trace_request_ctx'] = phases
+        attempt = 0
+        while True:
+            timing['wait'] += await limiter.wait_async(url)
+            timing['attempts'] += 1
+            try:
+                response = await session.request(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                timeout = isinstance(e, asyncio.TimeoutError)
+                if not retry or not limiter.should_retry(attempt, timeout=timeout):
+                    raise
+                delay = limiter.backoff(attempt)
+            else:
+                limiter.feedback(url, response.status)
+                if not retry or not limiter.should_retry(attempt, response.status):
+                    return response
+                delay = limiter.backoff(attempt, response.headers.get('Retry-After'))
+                response.release()
+            logger.warning(f"Retrying {method} {url} in {delay:.2f}s (attempt {attempt + 2})")
+            timing['wait'] += delay
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    def _start_https_probe_async(self, session, url: str) -> asyncio.Future:
+        """Asenkron HTTPS probe'u başlatır; aynı host:port için tek görev paylaşılır"""
+        https_url = url.replace('http://', 'https://', 1)
+        key = self._https_probe_key(https_url)
+        probe = self._https_probe_cache.get(key)
+        if probe is None:
+            probe = asyncio.ensure_future(self._probe_https_async(session, https_url))
+            self._https_probe_cache[key] = probe
+        return probe
+    
+    async def _https_probe_result_async(self, probe: asyncio.Future) -> Tuple[Optional[int], Dict]:
+        """_https_probe_result'ın asenkron karşılığı; bekleyen hedef iptali probe'a yayılmaz"""
+        if probe.cancelled():
+            return NO_HTTPS_PROBE
+        try:
+            return await asyncio.shield(probe)
+        except asyncio.CancelledError:
+            if not probe.cancelled():
+                raise
+            return NO_HTTPS_PROBE
+    
+    async def _probe_https_async(self, session, https_url: str) -> Tuple[Optional[int], Dict]:
+        """_probe_https'in asenkron karşılığı: (durum kodu, TLS bilgisi) veya (None, {})"""
+        # Probe görevi hedefin bağlamını kopyalar; süreleri hedefin aşamalarına yazılmasın
+        start_phases(None)
+        try:
+            https_response = await self._request_async(session, 'GET', https_url, retry=False,
+                                                       ssl=False,
+                                                       timeout=aiohttp.ClientTimeout(total=10))
+            https_response.close()
+            return https_response.status, https_response.tls_facts
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.debug(f"HTTPS probe failed for {https_url}: {str(e)}")
+            return NO_HTTPS_PROBE
+    
+    def _set_cookie_lines(self, response: requests.Response) -> Optional[List[str]]:
+        """Yanıttaki ham Set-Cookie satırlarını ikinci bir istek yapmadan döndürür
+
+        requests başlık sözlüğü birden fazla çerezi tek bir virgüllü dizgide
+        birleştirir; ham urllib3 başlıkları ise her satırı ayrı tutar.
+        """
+        raw_headers = getattr(getattr(response, 'raw', None), 'headers', None)
+        if raw_headers is not None and hasattr(raw_headers, 'getlist'):
+            return raw_headers.getlist('Set-Cookie')
+        return None
+    
+    def _build_result(self, url: str, target_name: str, status_code: int, headers,
+                      cookie_lines: Optional[List[str]] = None) -> Dict:
+        """Yanıt başlıklarından hedef sonucunu ve bulgularını oluşturur"""
+        headers = self._merge_headers(headers)
+        # Temel bilgileri topla
+        result = {
+            'url': url,
+            'target': target_name,
+            'timestamp': datetime.now().isoformat(),
+            'status_code': status_code,
+            'headers': dict(headers),
+            'findings': []
+        }
         
-        # X-Frame-Options kontrolü
-        x_frame_options = headers.get('X-Frame-Options', '')
-        csp_frame_ancestors = 'frame-ancestors' in headers.get('Content-Security-Policy', '')
+        # Güvenlik başlıklarını kontrol et; parmak izi değişmediyse önceki bulgular kullanılır
+        phases = current_phases()
+        started = time.perf_counter() if phases is not None else 0.0
+        findings = None
+        if self.scan_cache is not None:
+            fingerprint = self._fingerprint(headers)
+            etag = headers.get('ETag')
+            findings = self.scan_cache.reuse(url, fingerprint, etag)
+            result['cache'] = 'changed' if findings is None else 'unchanged'
+        if findings is None:
+            findings = self._analyze_headers(headers, status_code, cookie_lines)
+            if self.scan_cache is not None:
+                self.scan_cache.store(url, fingerprint, findings, status_code, headers, etag)
+        result['findings'] = findings
+        if phases is not None:
+            add_phase(phases, 'analysis', time.perf_counter() - started)
         
-        if not x_frame_options and not csp_frame_ancestors:
-            findings.append({
-                'name': 'X-Frame-Options',
-                'value': 'Missing',
+        # Çerezleri değerleri olmadan kompakt biçimde sakla
+        cookies = parse_cookies(cookie_lines, headers.get('Set-Cookie', ''))
+        if cookies:
+            result['cookies'] = [compact_cookie(cookie) for cookie in cookies]
+        return result
+    
+    def _merge_headers(self, headers) -> CaseInsensitiveDict:
+        """Tekrarlanan başlıkları requests gibi virgülle birleştirir
+
+        aiohttp'nin CIMultiDictProxy'si her değeri ayrı tutar; dict() ile
+        çevrilince yalnızca ilk değer kalır (ör. ikinci Set-Cookie kaybolur).
+        """
+        if hasattr(headers, 'getall'):
+            return CaseInsensitiveDict(
+                (name, ', '.join(headers.getall(name))) for name in headers.keys())
+        return headers
+    
+    def _fingerprint(self, headers) -> str:
+        """Kural motorunun baktığı başlıkların, kural kümesine bağlı parmak izi"""
+        return header_fingerprint(headers, self.rule_engine.watched_headers,
+                                  self.rule_engine.signature)
+    
+    def _cached_entry(self, url: str) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """URL'nin önbellek girdisini ve varsa If-None-Match istek başlığını döndürür"""
+        if self.scan_cache is None:
+            return None, None
+        cached = self.scan_cache.lookup(url)
+        if cached is None or not cached.get('etag'):
+            return cached, None
+        return cached, {'If-None-Match': cached['etag']}
+    
+    def _not_modified_result(self, url: str, target_name: str, cached: Dict) -> Dict:
+        """304 Not Modified yanıtı için sonucu önbellekteki başlık ve bulgulardan oluşturur"""
+        self.scan_cache.record('not_modified')
+        cached = copy.deepcopy(cached)
+        result = {
+            'url': url,
+            'target': target_name,
+            'timestamp': datetime.now().isoformat(),
+            'status_code': cached['status_code'],
+            'headers': cached['headers'],
+            'findings': cached['findings'],
+            'cache': 'not_modified'
+        }
+        cookies = parse_cookies(header_value=cached['headers'].get('Set-Cookie', ''))
+        if cookies:
+            result['cookies'] = [compact_cookie(cookie) for cookie in cookies]
+        return result
+    
+    def _error_result(self, url: str, target_name: str, name: str, error: Exception,
+                      remark: str) -> Dict:
+        """Bağlantı kurulamayan hedefler için hata sonucu oluşturur"""
+        return {
+            'url': url,
+            'target': target_name,
+            'timestamp': datetime.now().isoformat(),
+            'status_code': 0,
+            'headers': {},
+            'findings': [{
+                'name': name,
+                'value': str(error),
                 'status': 'fail',
-                'severity': 'Medium',
-                'remark': 'X-Frame-Options or CSP frame-ancestors directive is missing'
-            })
-        else:
-            findings.append({
-                'name': 'X-Frame-Options',
-                'value': x_frame_options or 'CSP frame-ancestors',
-                'status': 'pass',
-                'severity': 'Low',
-                'remark': 'Clickjacking protection is configured'
-            })
-        
-        # Set-Cookie kontrolü
-        set_cookie = headers.get('Set-Cookie', '')
-        if set_cookie:
-            if 'HttpOnly' not in set_cookie:
-                findings.append({
-                    'name': 'Cookie_HttpOnly',
-                    'value': 'Missing',
-                    'status': 'fail',
-                    'severity': 'High',
-                    'remark': 'Cookie is missing HttpOnly flag'
-                })
-            
-            if 'Secure' not in set_cookie:
-                findings.append({
-                    'name': 'Cookie_Secure',
-                    'value': 'Missing',
-                    'status': 'fail',
-                    'severity': 'High',
-                    'remark': 'Cookie is missing Secure flag'
-                })
+                'severity': 'High',
+                'remark': remark
+            }]
+        }
+    
+    def _connection_failure(self, error: Exception) -> Tuple[str, str]:
+        """Bağlantı hatasının bulgu adı ve açıklaması; TLS sürümü reddi TLS bulgusudur"""
+        if tls_version_refused(error):
+            return 'TLS_Protocol', 'Server only offers TLS versions older than 1.2'
+        return 'Connection_Error', 'Unable to connect to target'
+    
+    def _connection_error_result(self, url: str, target_name: str, error: Exception) -> Dict:
+        name, remark = self._connection_failure(error)
+        return self._error_result(url, target_name, name, error, remark)
+    
+    def _https_redirect_finding(self) -> Dict:
+        """HTTP'den HTTPS'e yönlendirme eksikliği bulgusu"""
+        return {
+            'name': 'HTTPS_Redirect',
+            'value': 'HTTP to HTTPS redirect missing',
+            'status': 'fail',
+            'severity': 'High',
+            'remark': 'HTTPS is available but HTTP does not redirect'
+        }
+    
+    def _add_tls_findings(self, result: Dict, facts: Dict) -> None:
+        """TLS bilgisini ve bulgularını sonuca ekler (önbellekteki bulgu listesi değiştirilmez)"""
+        if not facts:
+            return
+        result['tls'] = dict(facts)
+        result['findings'] = result['findings'] + self._tls_findings(facts)
+    
+    def _tls_findings(self, facts: Dict) -> List[Dict]:
+        """Yanıtı taşıyan TLS bağlantısının protokol, şifre takımı ve sertifika bulguları"""
+        # Bağlantılar en az TLS 1.2 ister; daha eskisi _connection_error_result'ta raporlanır
+        findings = [{
+            'name': 'TLS_Protocol',
+            'value': facts.get('protocol') or 'unknown',
+            'status': 'pass',
+            'severity': 'Low',
+            'remark': 'TLS 1.2 or newer negotiated'
+        }]
         
-        # Server header kontrolü
-        server = headers.get('Server', '')
-        if server and any(char.isdigit() for char in server):
-            findings.append({
-                'name': 'Server_Info_Leak',
-                'value': server,
-                'status': 'warn',
-                'severity': 'Low',
-                'remark': 'Server header contains version information'
-            })
+        cipher = facts.get('cipher') or 'unknown'
+        bits = facts.get('bits') or 0
+        weak = bits < MIN_CIPHER_BITS or any(marker in cipher for marker in WEAK_CIPHER_MARKERS)
+        findings.append({
+            'name': 'TLS_Cipher',
+            'value': f'{cipher} ({bits} bits)',
+            'status': 'fail' if weak else 'pass',
+            'severity': 'High' if weak else 'Low',
+            'remark': 'Weak cipher suite negotiated' if weak else 'Strong cipher suite negotiated'
+        })
         
-        # Referrer-Policy kontrolü
-        referrer_policy = headers.get('Referrer-Policy', '')
-        if not referrer_policy:
+        if facts.get('cert_expires'):
+            expires = datetime.fromisoformat(facts['cert_expires'])
+            days = (expires - datetime.now(expires.tzinfo)).days
+            if days < 0:
+                status, severity, remark = 'fail', 'High', f'Certificate expired {-days} days ago'
+            elif days < CERT_EXPIRY_WARNING_DAYS:
+                status, severity, remark = 'warn', 'Medium', f'Certificate expires in {days} days'
+            else:
+                status, severity, remark = 'pass', 'Low', f'Certificate valid for {days} more days'
             findings.append({
-                'name': 'Referrer-Policy',
-                'value': 'Missing',
-                'status': 'warn',
-                'severity': 'Low',
-                'remark': 'Referrer-Policy header is missing'
+                'name': 'TLS_Certificate_Expiry',
+                'value': facts['cert_expires'],
+                'status': status,
+                'severity': severity,
+                'remark': remark
             })
-        
         return findings
     
-    def _extract_max_age(self, hsts_header: str) -> int:
-        """HSTS header'ından max-age değerini çıkarır"""
-        try:
-            for part in hsts_header.split(';'):
-                if 'max-age' in part:
-                    return int(part.split('=')[1].strip())
-        except:
-            pass
-        return 0
-    
-    def run_checks(self, targets: List[str], output_dir: str = 'data/raw_reports') -> None:
-        """Belirtilen hedefler için güvenlik kontrollerini çalıştırır"""
+    def _analyze_headers(self, headers: Dict[str, str], status_code: int,
+                         cookie_lines: Optional[List[str]] = None) -> List[Dict]:
+        """HTTP başlıklarını derlenmiş kural kümesiyle analiz eder ve bulguları döndürür"""
+        return self.rule_engine.evaluate(headers, cookie_lines)
+    
+    def run_checks(self, targets: List[str], output_dir: str = 'data/raw_reports',
+                   concurrency: int = 1, backend: str = 'thread',
+                   crawl_options: Optional[Dict] = None, output_format: str = 'json',
+                   compress: bool = False, parquet: bool = False,
+                   trend_db: Optional[str] = None, changed_only: bool = False,
+                   inventory: Optional[Iterable[Tuple[str, str]]] = None,
+                   metrics_file: Optional[str] = None,
+                   metrics_format: str = 'prometheus',
+                   processed_dir: str = 'data/processed') -> List[Dict]:
+        """Belirtilen hedefler için güvenlik kontrollerini çalıştırır
+
+        concurrency > 1 olduğunda hedefler sınırlı bir thread havuzunda paralel
+        taranır. backend='async' seçildiğinde aynı iş aiohttp ile tek bir event
+        loop üzerinde yapılır. Hedef başına JSON/CSV dosyaları her hedef bittiği
+        anda yazılır; birleşik sonuç listesi ise her zaman hedef sırasını korur.
+        crawl_options verildiğinde her hedef SiteCrawler ile çok yollu taranır.
+        
+        output_format='jsonl' seçildiğinde hedef başına dosyalar yerine tüm
+        sonuçlar output_dir altındaki tek bir append-only JSONL loguna (compress
+        ile gzip) eklenir. parquet=True bulguları ayrıca Parquet'e aktarır.
+        trend_db verilirse sonuçlar ayrıca SQLite trend deposuna yazılır.
+        changed_only=True ve tarama önbelleği etkinken parmak izi değişmeyen
+        hedefler hedef başına dosyalara, birleşik all_headers dosyasına ve diğer
+        yazıcılara yazılmaz (dönen listede 'cache' alanıyla yer alır).
+        inventory verilirse targets yerine bu (ad, url) akışı taranır; akış
+        tüketildikçe işlere dönüştürülür, önceden listeye çevrilmez.
+        instrument açıkken aşama süreleri çalıştırma boyunca toplanır, loglanır ve
+        metrics_file verilmişse Prometheus/OpenMetrics metin dosyasına yazılır.
+        CSV özetleri ve Parquet dosyası processed_dir altına yazılır.
+        """
         # Output dizinini oluştur
         os.makedirs(output_dir, exist_ok=True)
-        os.makedirs('data/processed', exist_ok=True)
+        os.makedirs(processed_dir, exist_ok=True)
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        all_results = []
         
-        # Hedefleri belirle
+        # Hedefleri belirle: envanter verilmişse tembel olarak akıtılır
+        jobs = inventory if inventory is not None else self._named_jobs(targets)
+        
+        results = {}
+        metrics = RunMetrics() if self.instrument else None
+        started = time.perf_counter()
+        self.rate_limiter.reset_stats()
+        self.connection_cache.reset_stats()
+        self.reset_probe_cache()
+        if self.scan_cache is not None:
+            self.scan_cache.reset_stats()
+        
+        scan = self.check_headers
+        if crawl_options is not None:
+            if backend == 'async':
+                raise ValueError("Crawl mode is only available with the thread backend")
+            scan = SiteCrawler(self, **crawl_options).crawl
+        
+        # Sonuç yazıcıları: her hedef tamamlandığında akış halinde beslenir
+        writers = []
+        if output_format == 'jsonl':
+            log_file = result_log_path(output_dir, compress)
+            writers.append(ResultLogWriter(log_file))
+            logger.info(f"Appending results to {log_file}")
+        if parquet:
+            writers.append(ParquetExporter(f"{processed_dir}/headers_{timestamp}.parquet"))
+        if trend_db:
+            writers.append(TrendStore(trend_db))
+        
+        def unchanged(result: Dict) -> bool:
+            return changed_only and result.get('cache') in ('unchanged', 'not_modified')
+        
+        def save(result: Dict) -> None:
+            if unchanged(result):
+                return
+            if output_format == 'json':
+                self._save_target_result(result, output_dir, timestamp, processed_dir)
+            record = dict(result, run_id=timestamp)
+            for writer in writers:
+                writer.write(record)
+        
+        def collect(index: int, result: Dict) -> None:
+            results[index] = result
+            if metrics is None:
+                save(result)
+                return
+            # Yazma süresi kayda girmez (kayıt o sırada yazılıyor); çalıştırma metriklerine eklenir
+            write_started = time.perf_counter()
+            save(result)
+            metrics.observe_phase('write', time.perf_counter() - write_started)
+            metrics.observe(result)
+        
+        try:
+            if backend == 'async':
+                _load_aiohttp()
+                asyncio.run(self._run_jobs_async(jobs, collect, max(concurrency, 1)))
+            elif concurrency <= 1:
+                for index, (target, url) in enumerate(jobs):
+                    collect(index, scan(url, target))
+            else:
+                logger.info(f"Scanning targets with {concurrency} workers")
+                self._run_jobs_threaded(jobs, scan, collect, concurrency)
+        finally:
+            for writer in writers:
+                writer.close()
+            elapsed = time.perf_counter() - started
+            limits = self.rate_limiter.summary()
+            logger.info(f"Scanned {len(results)} targets in {elapsed:.2f}s "
+                        f"({len(results) / elapsed if elapsed else 0:.1f} targets/s); "
+                        f"{limits['requests']} requests, {limits['retries']} retries, "
+                        f"{limits['throttled']} throttled, {limits['wait']}s waited")
+            if backend == 'thread':
+                # aiohttp connector'ın DNS önbelleği sayaç tutmaz
+                connections = self.connection_cache.summary()
+                logger.info(f"Connection cache: {connections['dns_hits']} DNS hits, "
+                            f"{connections['dns_misses']} misses; {connections['resumed']} of "
+                            f"{connections['handshakes']} TLS handshakes resumed")
+            if metrics is not None:
+                for line in metrics.summary():
+                    logger.info(line)
+                if metrics_file:
+                    metrics.write(metrics_file, metrics_format == 'openmetrics')
+                    logger.info(f"Scan metrics written: {metrics_file}")
+            if self.scan_cache is not None:
+                self.scan_cache.save()
+                logger.info(f"Scan cache: {self.scan_cache.stats['changed']} analyzed, "
+                            f"{self.scan_cache.stats['unchanged']} unchanged, "
+                            f"{self.scan_cache.stats['not_modified']} not modified")
+        
+        # Tüm sonuçları hedef sırasıyla birleştir
+        all_results = [results[index] for index in range(len(results))]
+        combined = [result for result in all_results if not unchanged(result)]
+        if output_format == 'json' and combined:
+            combined_file = f"{output_dir}/all_headers_{timestamp}.json"
+            with open(combined_file, 'w', encoding='utf-8') as f:
+                json.dump(combined, f, indent=2, ensure_ascii=False)
+            
+            logger.info(f"Combined results saved: {combined_file}")
+        elif output_format == 'json':
+            logger.info("No changed targets; combined results file not written")
+        return all_results
+    
+    def _named_jobs(self, targets: List[str]) -> List[Tuple[str, str]]:
+        """--targets adlarını bilinen hedeflerin (ad, url) listesine çevirir"""
         if 'all' in targets:
             target_list = list(self.targets.keys())
         else:
             target_list = [t.strip() for t in targets]
         
+        jobs = []
         for target in target_list:
             if target not in self.targets:
                 logger.warning(f"Unknown target: {target}")
                 continue
-                
-            url = self.targets[target]
-            result = self.check_headers(url, target)
-            all_results.append(result)
-            
-            # JSON raporu kaydet
-            json_file = f"{output_dir}/{target}_headers_{timestamp}.json"
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
+            jobs.append((target, self.targets[target]))
+        return jobs
+    
+    def _run_jobs_threaded(self, jobs: Iterable[Tuple[str, str]], scan: Callable[[str, str], Dict],
+                           collect: Callable[[int, Dict], None], concurrency: int) -> None:
+        """Hedefleri thread havuzunda tarar; havuza en fazla concurrency * 2 iş verilir
+        
+        İşler akıştan tamamlandıkça çekilir; böylece çok büyük envanterler de
+        önceden future listesine çevrilmeden sabit bellekle taranır.
+        """
+        job_iter = enumerate(jobs)
+        pending = {}
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            def submit_next() -> None:
+                for index, (target, url) in job_iter:
+                    pending[executor.submit(scan, url, target)] = index
+                    return
             
-            # CSV özeti oluştur
-            csv_file = f"data/processed/{target}_headers_summary_{timestamp}.csv"
-            self._create_csv_summary(result, csv_file)
+            for _ in range(concurrency * 2):
+                submit_next()
+            # Dosyaları tamamlanma sırasına göre yaz, sonuçları hedef sırasında tut
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(pending.pop(future), future.result())
+                    submit_next()
+    
+    async def _run_jobs_async(self, jobs: Iterable[Tuple[str, str]],
+                              collect: Callable[[int, Dict], None], concurrency: int) -> None:
+        """Hedefleri paylaşımlı bir aiohttp bağlantı havuzu ile asenkron tarar
+        
+        concurrency adet worker aynı iş akışından sırayla hedef çeker; envanter
+        önceden görev listesine çevrilmez.
+        """
+        dns_ttl = self.connection_cache.dns_ttl
+        connector = aiohttp.TCPConnector(limit=max(concurrency, self.pool_size),
+                                         limit_per_host=self.pool_size,
+                                         keepalive_timeout=30,
+                                         use_dns_cache=dns_ttl > 0,
+                                         ttl_dns_cache=dns_ttl if dns_ttl > 0 else None)
+        job_iter = enumerate(jobs)
+        
+        trace_configs = [aiohttp_trace_config()] if self.instrument else None
+        async with aiohttp.ClientSession(connector=connector,
+                                         response_class=aiohttp_tls_response_class(),
+                                         trace_configs=trace_configs) as session:
+            async def worker() -> None:
+                for index, (target, url) in job_iter:
+                    collect(index, await self.check_headers_async(session, url, target))
             
-            logger.info(f"Results saved for {target}: {json_file}")
+            try:
+                await asyncio.gather(*(worker() for _ in range(concurrency)))
+            finally:
+                # Artık beklenmeyen HTTPS probe görevlerini kapat; önbellek loop'a bağlıdır
+                for probe in self._https_probe_cache.values():
+                    probe.cancel()
+                self.reset_probe_cache()
+    
+    def _save_target_result(self, result: Dict, output_dir: str, timestamp: str,
+                            processed_dir: str = 'data/processed') -> None:
+        """Tek bir hedefin JSON raporunu ve CSV özetini kaydeder"""
+        target = result['target']
+        
+        # JSON raporu kaydet
+        json_file = f"{output_dir}/{target}_headers_{timestamp}.json"
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
         
-        # Tüm sonuçları birleştir
-        combined_file = f"{output_dir}/all_headers_{timestamp}.json"
-        with open(combined_file, 'w', encoding='utf-8') as f:
-            json.dump(all_results, f, indent=2, ensure_ascii=False)
+        # CSV özeti oluştur
+        csv_file = f"{processed_dir}/{target}_headers_summary_{timestamp}.csv"
+        self._create_csv_summary(result, csv_file)
         
-        logger.info(f"Combined results saved: {combined_file}")
+        logger.info(f"Results saved for {target}: {json_file}")
     
     def _create_csv_summary(self, result: Dict, csv_file: str) -> None:
         """JSON sonucundan CSV özeti oluşturur"""
@@ -340,23 +897,129 @@ class SecurityHeaderChecker:
 def main():
     """Ana fonksiyon"""
     parser = argparse.ArgumentParser(description='HTTP Security Headers Test Tool')
-    parser.add_argument('--targets', required=True, 
+    parser.add_argument('--targets',
                        help='Comma-separated list of targets (all, dvwa, bwapp, xvwa, juice-shop, opencart)')
+    parser.add_argument('--inventory', action='append', metavar='FILE',
+                       help='Inventory file (txt/csv/json/jsonl, "-" for stdin) with URLs, '
+                            'host:port, port ranges or CIDR blocks; may be repeated')
+    parser.add_argument('--ports', default=','.join(str(port) for port in DEFAULT_PORTS),
+                       help='Ports for inventory entries without a port (e.g. 80,443,8000-8010)')
     parser.add_argument('--outdir', default='data/raw_reports',
                        help='Output directory for reports')
     parser.add_argument('--strict', action='store_true',
                        help='Enable strict mode for more rigorous checks')
+    parser.add_argument('--concurrency', type=int, default=1,
+                       help='Number of targets to scan in parallel (default: 1, sequential)')
+    parser.add_argument('--backend', choices=['thread', 'async'], default='thread',
+                       help='Scan backend: thread pool with requests or asyncio with aiohttp')
+    parser.add_argument('--probe', choices=['get', 'head'], default='get',
+                       help='Probe mode: full GET or header-only (HEAD, streamed GET fallback)')
+    parser.add_argument('--crawl', action='store_true',
+                       help='Scan several paths per target and group endpoints by header fingerprint')
+    parser.add_argument('--paths', default='/',
+                       help='Comma-separated seed paths for crawl mode (e.g. /,/login,/api/)')
+    parser.add_argument('--max-depth', type=int, default=1,
+                       help='Link depth to follow in crawl mode (0 = seed paths only)')
+    parser.add_argument('--max-pages', type=int, default=20,
+                       help='Maximum endpoints scanned per target in crawl mode')
+    parser.add_argument('--no-links', action='store_true',
+                       help='Do not extract same-origin links in crawl mode')
+    parser.add_argument('--format', choices=['json', 'jsonl'], default='json',
+                       help='Output format: per-target JSON/CSV files or one append-only JSONL log')
+    parser.add_argument('--compress', action='store_true',
+                       help='Gzip the JSONL result log (headers_results.jsonl.gz)')
+    parser.add_argument('--parquet', action='store_true',
+                       help='Also export findings to data/processed/headers_<timestamp>.parquet (needs pyarrow)')
+    parser.add_argument('--trend-db', metavar='PATH',
+                       help='Also record results in a SQLite trend store (see trend_store.py)')
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_SCAN_CACHE, metavar='PATH',
+                       help='Reuse findings for responses whose security headers did not change '
+                            f'and send If-None-Match (default path: {DEFAULT_SCAN_CACHE})')
+    parser.add_argument('--cache-ttl', type=int, default=DEFAULT_CACHE_TTL,
+                       help='Re-analyze cached responses older than this many seconds')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_ENTRIES,
+                       help='Maximum URLs kept in the scan cache (least recently used are evicted)')
+    parser.add_argument('--changed-only', action='store_true',
+                       help='With --cache, only write reports (per-target and combined) for '
+                            'targets whose headers changed')
+    parser.add_argument('--rules', default=DEFAULT_RULES_FILE,
+                       help='Rule file (JSON/JSON5) with the header checks to apply')
+    parser.add_argument('--pool-size', type=int, default=10,
+                       help='Keep-alive connections kept per host (default: 10)')
+    parser.add_argument('--dns-ttl', type=float, default=DEFAULT_DNS_TTL,
+                       help=f'Seconds resolved addresses are reused across requests '
+                            f'(default: {DEFAULT_DNS_TTL}; 0 disables the DNS cache)')
+    
+    parser.add_argument('--rate-per-host', type=float, metavar='RPS',
+                       help='Maximum requests per second to a single host (default: unlimited)')
+    parser.add_argument('--rate-global', type=float, metavar='RPS',
+                       help='Maximum requests per second across all hosts (default: unlimited)')
+    parser.add_argument('--burst', type=float, default=1,
+                       help='Token bucket burst size for the rate limits (default: 1)')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                       help=f'Retries for connection errors and 429/503 responses '
+                            f'(default: {DEFAULT_RETRIES})')
+    parser.add_argument('--retry-timeouts', action='store_true',
+                       help='Also retry connect/read timeouts (each attempt waits the full timeout)')
+    parser.add_argument('--backoff', type=float, default=DEFAULT_BACKOFF,
+                       help=f'Base delay in seconds for jittered exponential backoff '
+                            f'(default: {DEFAULT_BACKOFF})')
+    
+    parser.add_argument('--instrument', action='store_true',
+                       help='Record per-phase timings (dns, connect, tls, ttfb, body, analysis, '
+                            'write) in each result and log a per-run breakdown')
+    parser.add_argument('--metrics-file', default=None,
+                       help='Write per-run phase metrics to this Prometheus text file '
+                            '(implies --instrument)')
+    parser.add_argument('--metrics-format', choices=METRICS_FORMATS, default='prometheus',
+                       help='Metrics file format (default: prometheus)')
     
     args = parser.parse_args()
+    if not args.targets and not args.inventory:
+        parser.error('one of --targets or --inventory is required')
+    if args.crawl and args.backend == 'async':
+        parser.error('--crawl is only available with --backend thread')
+    setup_logging(os.path.join(args.outdir, 'errors.log'))
     
     # Targets'ı parse et
-    targets = [t.strip() for t in args.targets.split(',')]
+    targets = [t.strip() for t in args.targets.split(',')] if args.targets else []
+    inventory = None
+    if args.inventory:
+        inventory = iter_inventory(args.inventory, parse_ports(args.ports))
     
     # Checker'ı başlat
-    checker = SecurityHeaderChecker(strict_mode=args.strict)
+    scan_cache = None
+    if args.cache:
+        scan_cache = ScanCache(args.cache, ttl=args.cache_ttl, max_entries=args.cache_size)
+    rate_limiter = RateLimiter(host_rate=args.rate_per_host, global_rate=args.rate_global,
+                               burst=args.burst, retries=args.retries, backoff=args.backoff,
+                               retry_timeouts=args.retry_timeouts)
+    checker = SecurityHeaderChecker(strict_mode=args.strict, pool_size=args.pool_size,
+                                     probe_mode=args.probe, rules_file=args.rules,
+                                     scan_cache=scan_cache, rate_limiter=rate_limiter,
+                                     instrument=args.instrument or bool(args.metrics_file),
+                                     dns_ttl=args.dns_ttl)
+    
+    crawl_options = None
+    if args.crawl:
+        crawl_options = {
+            'seed_paths': [p.strip() for p in args.paths.split(',') if p.strip()],
+            'max_depth': args.max_depth,
+            'max_pages': args.max_pages,
+            'follow_links': not args.no_links,
+            'concurrency': max(args.concurrency, 4)
+        }
     
     # Kontrolleri çalıştır
-    checker.run_checks(targets, args.outdir)
+    try:
+        checker.run_checks(targets, args.outdir, concurrency=args.concurrency,
+                           backend=args.backend, crawl_options=crawl_options,
+                           output_format=args.format, compress=args.compress,
+                           parquet=args.parquet, trend_db=args.trend_db,
+                           changed_only=args.changed_only, inventory=inventory,
+                           metrics_file=args.metrics_file, metrics_format=args.metrics_format)
+    finally:
+        checker.close()
 
 if __name__ == '__main__':
     main()
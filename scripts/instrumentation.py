@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Tarama Aşaması Ölçümleri (Instrumentation)
+Yazılım Kalite ve Güvence - Konfigürasyon/Güvenlik Başlıkları Testi
+
+Her hedef için taramanın aşama sürelerini (DNS, bağlantı, TLS, ilk byte,
+gövde, analiz, yazma) ölçer, çalıştırma başına histogramlarda toplar ve
+Prometheus metin biçiminde veya OpenMetrics olarak dışa aktarır.
+
+Ölçüm kapalıyken hiçbir şey kurulmaz: zamanlayan urllib3 bağlantı sınıfları
+(connection_cache.CachingHTTPAdapter tarafından) ve aiohttp trace config
+yalnızca --instrument ile devreye girer. Aşama
+süreleri hedefin sonuç kaydında timing.phases altında saklanır. Etkin hedefin
+aşama sözlüğü bir ContextVar'da tutulur; böylece aynı mekanizma thread
+havuzunda ve asyncio worker'larında çalışır.
+"""
+
+import bisect
+import heapq
+import itertools
+import os
+import socket
+import threading
+import time
+from contextvars import ContextVar, Token
+from typing import Dict, List, Optional
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+PHASES = ('dns', 'connect', 'tls', 'ttfb', 'body', 'analysis', 'write')
+NETWORK_PHASES = ('dns', 'connect', 'tls', 'ttfb')
+
+# Histogram kova sınırları (saniye)
+PHASE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS_FORMATS = ('prometheus', 'openmetrics')
+
+_current_phases: ContextVar[Optional[Dict[str, float]]] = ContextVar('scan_phases', default=None)
+
+
+def start_phases(phases: Optional[Dict[str, float]]) -> Token:
+    """Bu thread/görev için aşama sürelerinin yazılacağı sözlüğü etkinleştirir (None: kapatır)"""
+    return _current_phases.set(phases)
+
+
+def stop_phases(token: Token) -> None:
+    _current_phases.reset(token)
+
+
+def current_phases() -> Optional[Dict[str, float]]:
+    return _current_phases.get()
+
+
+def add_phase(phases: Dict[str, float], name: str, seconds: float) -> None:
+    phases[name] = phases.get(name, 0.0) + seconds
+
+
+def network_time(phases: Dict[str, float]) -> float:
+    return sum(phases.get(name, 0.0) for name in NETWORK_PHASES)
+
+
+class _TimedConnectionMixin:
+    """urllib3 bağlantısının DNS, TCP bağlantısı, TLS ve ilk byte sürelerini ölçer
+
+    DNS çözümlemesi bir kez (zamanlanarak) yapılır, ardından çözülen adresler
+    sırayla urllib3'ün kendi _new_conn'una verilir; hata eşlemesi ve adresler
+    arası geri düşme korunur. TLS için sunucu adı (SNI) değişmez.
+    """
+
+    def _new_conn(self):
+        phases = current_phases()
+        if phases is None:
+            return super()._new_conn()
+        started = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(self._dns_host, self.port, 0, socket.SOCK_STREAM)
+        except socket.gaierror:
+            # urllib3'ün NameResolutionError'ını üretmesi için olağan yola bırak
+            return super()._new_conn()
+        resolved = time.perf_counter()
+        add_phase(phases, 'dns', resolved - started)
+
+        dns_host = self._dns_host
+        error = None
+        try:
+            for address in dict.fromkeys(info[4][0] for info in addresses):
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    break
+                except (NewConnectionError, ConnectTimeoutError) as e:
+                    error = e
+            else:
+                raise error
+        finally:
+            self._dns_host = dns_host
+        add_phase(phases, 'connect', time.perf_counter() - resolved)
+        return sock
+
+    def connect(self):
+        phases = current_phases()
+        if phases is None:
+            return super().connect()
+        before = phases.get('dns', 0.0) + phases.get('connect', 0.0)
+        started = time.perf_counter()
+        super().connect()
+        if isinstance(self, HTTPSConnection):
+            handshake = time.perf_counter() - started
+            handshake -= phases.get('dns', 0.0) + phases.get('connect', 0.0) - before
+            add_phase(phases, 'tls', max(handshake, 0.0))
+
+    def getresponse(self, *args, **kwargs):
+        phases = current_phases()
+        if phases is None:
+            return super().getresponse(*args, **kwargs)
+        started = time.perf_counter()
+        response = super().getresponse(*args, **kwargs)
+        add_phase(phases, 'ttfb', time.perf_counter() - started)
+        return response
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+def aiohttp_trace_config():
+    """aiohttp istekleri için DNS, bağlantı ve ilk byte sürelerini ölçen TraceConfig
+
+    Aşama sözlüğü isteğe trace_request_ctx olarak verilir. aiohttp TLS el
+    sıkışmasını ayrı bildirmediği için TLS süresi 'connect' içinde kalır.
+    """
+    import aiohttp
+
+    async def on_request_start(session, context, params):
+        context.started = context.connected = time.perf_counter()
+        context.dns = 0.0
+
+    async def on_dns_start(session, context, params):
+        context.dns_started = time.perf_counter()
+
+    async def on_dns_end(session, context, params):
+        if context.trace_request_ctx is not None:
+            elapsed = time.perf_counter() - context.dns_started
+            context.dns += elapsed
+            add_phase(context.trace_request_ctx, 'dns', elapsed)
+
+    async def on_connection_start(session, context, params):
+        context.connection_started = time.perf_counter()
+        context.dns = 0.0
+
+    async def on_connection_end(session, context, params):
+        context.connected = time.perf_counter()
+        if context.trace_request_ctx is not None:
+            add_phase(context.trace_request_ctx, 'connect',
+                      context.connected - context.connection_started - context.dns)
+
+    async def on_request_end(session, context, params):
+        if context.trace_request_ctx is not None:
+            add_phase(context.trace_request_ctx, 'ttfb', time.perf_counter() - context.connected)
+
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(on_request_start)
+    config.on_dns_resolvehost_start.append(on_dns_start)
+    config.on_dns_resolvehost_end.append(on_dns_end)
+    config.on_connection_create_start.append(on_connection_start)
+    config.on_connection_create_end.append(on_connection_end)
+    config.on_request_end.append(on_request_end)
+    return config
+
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RunMetrics:
+    """Bir çalıştırmanın aşama ve hedef sürelerini histogramlarda toplayan thread-safe sayaç"""
+
+    def __init__(self, buckets=PHASE_BUCKETS, slowest: int = 10):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.phases = {}
+        self.targets = _Histogram(buckets)
+        self.errors = 0
+        self.slowest_size = slowest
+        self.slowest = []
+        # Süre ve hedef eşitse heapq aşama sözlüklerini karşılaştırmasın diye sıra numarası
+        self.sequence = itertools.count()
+
+    def observe_phase(self, name: str, seconds: float) -> None:
+        with self.lock:
+            histogram = self.phases.get(name)
+            if histogram is None:
+                histogram = self.phases[name] = _Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def observe(self, result: Dict) -> None:
+        """Hedef sonucunun timing alanını histogramlara ekler"""
+        timing = result.get('timing', {})
+        for name, seconds in timing.get('phases', {}).items():
+            self.observe_phase(name, seconds)
+        elapsed = timing.get('elapsed', 0.0)
+        with self.lock:
+            self.targets.observe(elapsed)
+            if not result.get('status_code'):
+                self.errors += 1
+            entry = (elapsed, result.get('target', ''), next(self.sequence),
+                     timing.get('phases', {}))
+            if len(self.slowest) < self.slowest_size:
+                heapq.heappush(self.slowest, entry)
+            elif elapsed > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    def summary(self, top: int = 5) -> List[str]:
+        """Aşama başına toplam süre/pay ve en yavaş hedefler (log satırları)"""
+        with self.lock:
+            total = sum(histogram.sum for histogram in self.phases.values()) or 1.0
+            lines = [f"Phase {name}: {self.phases[name].sum:.3f}s total, "
+                     f"{self.phases[name].sum / total:.0%} of measured time, "
+                     f"{self.phases[name].count} samples"
+                     for name in PHASES if name in self.phases]
+            for elapsed, target, _, phases in sorted(self.slowest, reverse=True)[:top]:
+                dominant = max(phases, key=phases.get) if phases else '-'
+                lines.append(f"Slow target {target}: {elapsed:.3f}s (mostly {dominant})")
+        return lines
+
+    def _histogram_lines(self, name: str, histogram: _Histogram, labels: str = '') -> List[str]:
+        lines = []
+        cumulative = 0
+        separator = ',' if labels else ''
+        for bound, count in zip(self.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}{separator}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}{separator}le="+Inf"}} {histogram.count}')
+        suffix = f"{{{labels}}}" if labels else ''
+        lines.append(f"{name}_sum{suffix} {histogram.sum:.6f}")
+        lines.append(f"{name}_count{suffix} {histogram.count}")
+        return lines
+
+    def render(self, openmetrics: bool = False) -> str:
+        """Metrikleri Prometheus metin biçiminde (veya OpenMetrics) döndürür"""
+        # OpenMetrics'te sayaç ailesinin adı _total soneki olmadan bildirilir
+        counter = 'header_scan_errors' if openmetrics else 'header_scan_errors_total'
+        with self.lock:
+            lines = ['# HELP header_scan_phase_seconds Time spent per scan phase per target',
+                     '# TYPE header_scan_phase_seconds histogram']
+            for name in PHASES:
+                if name in self.phases:
+                    lines.extend(self._histogram_lines('header_scan_phase_seconds',
+                                                       self.phases[name], f'phase="{name}"'))
+            lines.extend(['# HELP header_scan_target_seconds Total scan time per target',
+                          '# TYPE header_scan_target_seconds histogram'])
+            lines.extend(self._histogram_lines('header_scan_target_seconds', self.targets))
+            lines.extend([f'# HELP {counter} Targets that could not be scanned',
+                          f'# TYPE {counter} counter',
+                          f'header_scan_errors_total {self.errors}'])
+        if openmetrics:
+            lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str, openmetrics: bool = False) -> None:
+        """Metrikleri atomik olarak yazar (node_exporter textfile collector ile uyumlu)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render(openmetrics))
+        os.replace(temp_path, path)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Hedef Envanteri Yükleyici
+Yazılım Kalite ve Güvence - Konfigürasyon/Güvenlik Başlıkları Testi
+
+Taranacak hedefleri CSV/JSON/JSONL/düz metin dosyalarından veya stdin'den
+okur. Her girdi bir URL, host, host:port, port aralığı (host:8000-8010,
+host:80,443) veya CIDR bloğu (10.0.0.0/24:80,443) olabilir. Girdiler tembel
+(lazy) olarak genişletilir, normalize edilir ve tekrarlar atılarak
+(ad, url) çiftleri halinde tarama motoruna akıtılır; envanter hiçbir zaman
+belleğe topluca yüklenmez.
+
+Desteklenen biçimler:
+    hosts.txt   - satır başına bir girdi; '#' ile başlayan satırlar yorumdur,
+                  "ad=girdi" biçimi hedefe ad verir
+    hosts.csv   - başlık satırlı; url veya host sütunu, opsiyonel name/port/scheme
+    hosts.json  - girdi listesi, {ad: girdi} sözlüğü veya nesne listesi
+    hosts.jsonl - satır başına bir JSON nesnesi veya dizgi
+    -           - stdin (düz metin)
+"""
+
+import csv
+import ipaddress
+import json
+import re
+import sys
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_PORTS = (80,)
+DEFAULT_PORT_FOR_SCHEME = {'http': 80, 'https': 443}
+
+# Tek bir porttan veya port aralığından oluşan port listesi: 80,443,8000-8010
+_PORT_SPEC = re.compile(r'^\d+(-\d+)?(,\d+(-\d+)?)*$')
+
+
+def parse_ports(spec: str) -> List[int]:
+    """'80,443,8000-8010' biçimindeki port listesini açar"""
+    ports = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = (int(value) for value in part.split('-', 1))
+            if start > end:
+                start, end = end, start
+            ports.extend(range(start, end + 1))
+        else:
+            ports.append(int(part))
+    for port in ports:
+        if not 0 < port < 65536:
+            raise ValueError(f"Invalid port: {port}")
+    return ports
+
+
+def _split_host_ports(entry: str) -> Tuple[str, Optional[str]]:
+    """'host:ports', '[v6]:ports' veya 'cidr:ports' girdisini (host, port listesi) olarak ayırır"""
+    if entry.startswith('['):
+        host, _, rest = entry[1:].partition(']')
+        return host, rest[1:] if rest.startswith(':') else None
+    host, separator, ports = entry.rpartition(':')
+    # Çıplak bir IPv6 adresi de ':' içerir; yalnızca geçerli port listesi ayrılır
+    if separator and _PORT_SPEC.match(ports) and ':' not in host:
+        return host, ports
+    return entry, None
+
+
+def _url_host(host: str) -> str:
+    return f"[{host}]" if ':' in host else host
+
+
+def _target_name(host: str, port: int, scheme: str) -> str:
+    """Dosya adlarında da kullanılabilecek hedef adı (host veya host_port)"""
+    name = host.replace(':', '_')
+    if port != DEFAULT_PORT_FOR_SCHEME.get(scheme):
+        name = f"{name}_{port}"
+    return name
+
+
+def normalize_url(url: str) -> str:
+    """URL'yi karşılaştırılabilir biçime getirir
+
+    Şema ve host küçük harfe çevrilir, şemanın varsayılan portu ve tek başına
+    '/' yolu atılır; sorgu ve fragment korunmaz.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if not scheme or not host:
+        raise ValueError(f"Invalid URL: {url}")
+    port = parts.port
+    netloc = _url_host(host)
+    if port is not None and port != DEFAULT_PORT_FOR_SCHEME.get(scheme):
+        netloc = f"{netloc}:{port}"
+    path = parts.path if parts.path not in ('', '/') else ''
+    return f"{scheme}://{netloc}{path}"
+
+
+def expand_entry(entry: str, ports: Sequence[int] = DEFAULT_PORTS, scheme: str = 'http',
+                 name: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+    """Tek bir envanter girdisini (ad, url) çiftlerine tembel olarak genişletir
+
+    Şemalı girdiler (http://..., https://...) olduğu gibi tek bir URL'dir.
+    Diğerlerinde host, host:port listesi ve CIDR bloğu desteklenir; port
+    verilmemişse ports kullanılır; 'http' şemasında 443 portu https olarak
+    taranır. Bir girdi birden çok URL'ye açılıyorsa verilen ad önek olarak
+    kullanılır.
+    """
+    entry = entry.strip()
+    if not entry:
+        return
+    if '://' in entry:
+        url = normalize_url(entry)
+        parts = urlsplit(url)
+        port = parts.port or DEFAULT_PORT_FOR_SCHEME.get(parts.scheme, 0)
+        yield name or _target_name(parts.hostname, port, parts.scheme), url
+        return
+
+    host, port_spec = _split_host_ports(entry)
+    entry_ports = parse_ports(port_spec) if port_spec else list(ports)
+    if '/' in host:
+        hosts = (str(address) for address in _network_hosts(host))
+    else:
+        hosts = iter([host.lower()])
+
+    single = '/' not in host and len(entry_ports) == 1
+    for address in hosts:
+        for port in entry_ports:
+            port_scheme = 'https' if port == 443 and scheme == 'http' else scheme
+            netloc = _url_host(address)
+            if port != DEFAULT_PORT_FOR_SCHEME.get(port_scheme):
+                netloc = f"{netloc}:{port}"
+            target = _target_name(address, port, port_scheme)
+            if name:
+                target = name if single else f"{name}_{target}"
+            yield target, f"{port_scheme}://{netloc}"
+
+
+def _network_hosts(cidr: str):
+    network = ipaddress.ip_network(cidr, strict=False)
+    # /32 ve /128 bloklarında hosts() boş döner; adresin kendisi kullanılır
+    if network.num_addresses == 1:
+        return iter([network.network_address])
+    return network.hosts()
+
+
+def _iter_text(lines: Iterable[str]) -> Iterator[Tuple[Optional[str], str, Optional[str]]]:
+    for line in lines:
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        name = None
+        if '=' in line and '://' not in line.split('=', 1)[0]:
+            name, line = (part.strip() for part in line.split('=', 1))
+        yield name, line, None
+
+
+def _iter_records(records: Iterable) -> Iterator[Tuple[Optional[str], str, Optional[str]]]:
+    for record in records:
+        if isinstance(record, str):
+            yield None, record, None
+        elif isinstance(record, dict):
+            entry = record.get('url') or record.get('host')
+            if not entry:
+                continue
+            port = record.get('port') or record.get('ports')
+            if port and 'url' not in record:
+                entry = f"{_url_host(entry) if '/' not in entry else entry}:{port}"
+            yield record.get('name') or record.get('target'), str(entry), record.get('scheme')
+
+
+def _iter_source(source: str) -> Iterator[Tuple[Optional[str], str, Optional[str]]]:
+    """Bir envanter kaynağının (ad, girdi, şema) üçlülerini sırayla döndürür"""
+    if source == '-':
+        yield from _iter_text(sys.stdin)
+        return
+    with open(source, 'r', encoding='utf-8', newline='') as f:
+        if source.endswith('.csv'):
+            yield from _iter_records(csv.DictReader(f))
+        elif source.endswith('.jsonl'):
+            yield from _iter_records(json.loads(line) for line in f if line.strip())
+        elif source.endswith('.json'):
+            data = json.load(f)
+            if isinstance(data, dict):
+                data = [{'name': name, 'url': url} for name, url in data.items()]
+            yield from _iter_records(data)
+        else:
+            yield from _iter_text(f)
+
+
+def iter_inventory(sources: Iterable[str], ports: Sequence[int] = DEFAULT_PORTS,
+                   scheme: str = 'http') -> Iterator[Tuple[str, str]]:
+    """Kaynaklardaki hedefleri genişletip normalize ederek tekrarsız (ad, url) çiftleri döndürür
+
+    Geçersiz girdiler uyarıyla atlanır. Tekrar kontrolü normalize edilmiş URL
+    üzerinden yapılır; yalnızca görülen URL'lerin kümesi bellekte tutulur.
+    """
+    seen = set()
+    for source in sources:
+        for name, entry, entry_scheme in _iter_source(source):
+            try:
+                for target, url in expand_entry(entry, ports, entry_scheme or scheme, name):
+                    url = normalize_url(url)
+                    if url in seen:
+                        continue
+                    seen.add(url)
+                    yield target, url
+            except ValueError as e:
+                print(f"Skipping invalid inventory entry {entry!r} in {source}: {str(e)}",
+                      file=sys.stderr)
+
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Artımlı Analiz Manifesti
+Yazılım Kalite ve Güvence - Konfigürasyon/Güvenlik Başlıkları Testi
+
+parse_reports.py'nin artımlı modu için daha önce işlenmiş rapor dosyalarını
+(yol, boyut, mtime, içerik hash'i, okunan byte ofseti) ve biriken analiz
+durumunu tek bir JSON checkpoint dosyasında saklar. Bir sonraki çalıştırmada
+yalnızca yeni dosyalar ve append-only JSONL loglarına eklenen satırlar
+işlenir; hiçbir şey değişmediyse yalnızca os.stat çağrıları yapılır.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from result_store import json_loads, report_files
+
+MANIFEST_VERSION = 1
+HASH_CHUNK = 1024 * 1024
+
+
+def _file_stat(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _hash_prefix(path: str, length: int) -> 'hashlib._Hash':
+    """Dosyanın ilk length byte'ının SHA-1 nesnesini döndürür (devam ettirilebilir)"""
+    digest = hashlib.sha1()
+    remaining = length
+    with open(path, 'rb') as f:
+        while remaining > 0:
+            chunk = f.read(min(HASH_CHUNK, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest
+
+
+def _iter_lines_from(path: str, offset: int, digest) -> Iterator[Tuple[Dict, int]]:
+    """Düz JSONL dosyasını offset'ten itibaren okur; (kayıt, yeni ofset) döndürür
+
+    Yalnızca satır sonu ile biten tam satırlar işlenir; yazılmakta olan son
+    yarım satır bir sonraki çalıştırmaya bırakılır.
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            digest.update(line)
+            offset += len(line)
+            stripped = line.strip()
+            if not stripped:
+                continue
+            try:
+                yield json_loads(stripped), offset
+            except ValueError as e:
+                print(f"Skipping malformed line in {path}: {str(e)}")
+
+
+class ReportManifest:
+    """İşlenmiş rapor dosyalarının ve biriken analizin checkpoint'i"""
+
+    def __init__(self, path: str, input_path: str):
+        self.path = path
+        self.input_path = os.path.abspath(input_path)
+        self.files = {}
+        self.analysis = None
+
+    @classmethod
+    def load(cls, path: str, input_path: str) -> 'ReportManifest':
+        """Checkpoint'i okur; yoksa, bozuksa veya başka bir girdiye aitse boş döner"""
+        manifest = cls(path, input_path)
+        if not os.path.exists(path):
+            return manifest
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable manifest {path}: {str(e)}")
+            return manifest
+        if state.get('version') == MANIFEST_VERSION and state.get('input') == manifest.input_path:
+            manifest.files = state.get('files', {})
+            manifest.analysis = state.get('analysis')
+        return manifest
+
+    def save(self) -> None:
+        """Checkpoint'i atomik olarak (geçici dosya + rename) yazar"""
+        state = {
+            'version': MANIFEST_VERSION,
+            'input': self.input_path,
+            'files': self.files,
+            'analysis': self.analysis
+        }
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, self.path)
+
+    def update(self, aggregator_factory: Callable[[Optional[Dict]], object]) -> Tuple[Dict, bool]:
+        """Yeni/değişen dosyaları işleyip (analiz, değişti_mi) döndürür
+
+        aggregator_factory önceki analiz sözlüğüyle (veya None ile) çağrılır ve
+        add()/result() metotları olan bir toplayıcı döndürmelidir. Silinen veya
+        yerinde değiştirilen bir dosya önceki katkısı geri alınamayacağı için
+        baştan yeniden analize yol açar.
+        """
+        current = {}
+        for path in report_files(self.input_path):
+            current[os.path.abspath(path)] = _file_stat(path)
+
+        # Hızlı yol: hiçbir dosya eklenmemiş, silinmemiş veya değişmemiş
+        if self.analysis is not None and current.keys() == self.files.keys() and all(
+                (entry['size'], entry['mtime_ns']) == current[path]
+                for path, entry in self.files.items()):
+            return self.analysis, False
+
+        rebuild = self.analysis is None or any(path not in current for path in self.files)
+        plan = []
+        if not rebuild:
+            for path, stat in current.items():
+                entry = self.files.get(path)
+                if entry is None:
+                    plan.append((path, 0, hashlib.sha1()))
+                elif (entry['size'], entry['mtime_ns']) != stat:
+                    resume = self._resume_point(path, entry, stat)
+                    if resume is None:
+                        rebuild = True
+                        break
+                    plan.append((path,) + resume)
+
+        if rebuild:
+            self.files = {}
+            aggregator = aggregator_factory(None)
+            plan = [(path, 0, hashlib.sha1()) for path in current]
+        else:
+            aggregator = aggregator_factory(self.analysis)
+
+        for path, offset, digest in plan:
+            self.files[path] = self._ingest(path, offset, digest, aggregator)
+
+        self.analysis = aggregator.result()
+        return self.analysis, True
+
+    def _resume_point(self, path: str, entry: Dict, stat: Tuple[int, int]):
+        """Değişen dosya için (ofset, hash) döndürür; yeniden analiz gerekiyorsa None
+
+        Düz JSONL loglarında daha önce okunan bölümün hash'i değişmemişse okuma
+        kaldığı ofsetten devam eder. İçeriği aynı kalıp yalnızca mtime'ı değişen
+        dosyalar da olduğu yerden (yeni satır yoksa hiç okunmadan) devam eder.
+        """
+        offset = entry.get('offset', entry['size'])
+        if stat[0] < offset:
+            return None
+        if not path.endswith('.jsonl') and stat[0] != entry['size']:
+            return None
+        digest = _hash_prefix(path, offset)
+        if digest.hexdigest() != entry['sha1']:
+            return None
+        return offset, digest
+
+    def _ingest(self, path: str, offset: int, digest, aggregator) -> Dict:
+        """Dosyanın offset sonrasını toplayıcıya ekler ve manifest girdisini döndürür"""
+        size, mtime_ns = _file_stat(path)
+
+        if path.endswith('.jsonl'):
+            for record, offset in _iter_lines_from(path, offset, digest):
+                aggregator.add(record)
+        elif offset < size:
+            with open(path, 'rb') as f:
+                raw = f.read()
+            digest.update(raw)
+            offset = len(raw)
+            try:
+                if path.endswith('.gz'):
+                    for line in gzip.decompress(raw).splitlines():
+                        if line.strip():
+                            aggregator.add(json_loads(line))
+                else:
+                    data = json_loads(raw)
+                    for record in (data if isinstance(data, list) else [data] if data else []):
+                        aggregator.add(record)
+            except (OSError, ValueError) as e:
+                print(f"Error parsing {path}: {str(e)}")
+
+        return {'size': size, 'mtime_ns': mtime_ns, 'sha1': digest.hexdigest(), 'offset': offset}
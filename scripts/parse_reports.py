@@ -8,15 +8,31 @@ Bu script, ham JSON raporlarını parse eder ve analiz eder.
 Kullanım:
     python scripts/parse_reports.py --input data/raw_reports/
     python scripts/parse_reports.py --input data/raw_reports/all_headers_20231201_120000.json
+    python scripts/parse_reports.py --input data/raw_reports/headers_results.jsonl.gz
 """
 
 import json
 import argparse
+import functools
 import os
 import sys
 from datetime import datetime
-from typing import Dict, List, Any
-import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from aggregation import AGGREGATION_ENGINES, FindingsAggregator, make_aggregator
+from manifest import ReportManifest
+from result_store import iter_file_records, iter_report_records, map_file_shards, report_files
+
+def _analyze_shard(files: List[str], engine: str = 'auto') -> Dict[str, Any]:
+    """Process havuzunda çalışan map adımı: bir dosya parçasının kısmi analizi"""
+    aggregator = make_aggregator(engine)
+    for file_path in files:
+        try:
+            for record in iter_file_records(file_path):
+                aggregator.add(record)
+        except (OSError, ValueError) as e:
+            print(f"Error parsing {file_path}: {str(e)}")
+    return aggregator.result()
 
 class ReportParser:
     """Rapor parsing ve analiz sınıfı"""
@@ -35,81 +51,40 @@ class ReportParser:
             return None
     
     def parse_directory(self, directory: str) -> List[Dict]:
-        """Dizin içindeki tüm JSON dosyalarını parse eder"""
-        results = []
-        
+        """Dizin içindeki tüm JSON ve JSONL rapor dosyalarını parse eder"""
         if not os.path.exists(directory):
             print(f"Directory not found: {directory}")
-            return results
-        
-        for filename in os.listdir(directory):
-            if filename.endswith('.json') and not filename.startswith('all_'):
-                file_path = os.path.join(directory, filename)
-                data = self.parse_json_file(file_path)
-                if data:
-                    results.append(data)
+            return []
         
-        return results
+        return list(iter_report_records(directory))
     
-    def analyze_findings(self, data: List[Dict]) -> Dict[str, Any]:
-        """Bulguları analiz eder ve istatistikler üretir"""
-        analysis = {
-            'total_targets': len(data),
-            'total_findings': 0,
-            'severity_counts': {'High': 0, 'Medium': 0, 'Low': 0},
-            'status_counts': {'pass': 0, 'warn': 0, 'fail': 0},
-            'header_stats': {},
-            'target_summary': {}
-        }
-        
+    def analyze_findings(self, data: Iterable[Dict], progress_interval: int = 0,
+                         engine: str = 'auto') -> Dict[str, Any]:
+        """Bulguları analiz eder ve istatistikler üretir
+
+        data herhangi bir iterable (ör. iter_report_records üreteci) olabilir;
+        kayıtlar parçalar halinde işlenir, tamamı bellekte tutulmaz. engine
+        'auto'/'numpy' ise vektörel yol, 'python' ise sözlük tabanlı yol
+        kullanılır; numpy kurulu değilse 'auto' sözlük yoluna düşer.
+        """
+        aggregator = make_aggregator(engine, progress_interval)
         for target_data in data:
-            target_name = target_data.get('target', 'unknown')
-            findings = target_data.get('findings', [])
-            
-            target_summary = {
-                'total_findings': len(findings),
-                'high_severity': 0,
-                'medium_severity': 0,
-                'low_severity': 0,
-                'failed_checks': 0,
-                'passed_checks': 0,
-                'warnings': 0
-            }
-            
-            for finding in findings:
-                analysis['total_findings'] += 1
-                target_summary['total_findings'] += 1
-                
-                # Severity sayımı
-                severity = finding.get('severity', 'Low')
-                analysis['severity_counts'][severity] += 1
-                target_summary[f'{severity.lower()}_severity'] += 1
-                
-                # Status sayımı
-                status = finding.get('status', 'fail')
-                analysis['status_counts'][status] += 1
-                if status == 'warn':
-                    target_summary['warnings'] += 1
-                elif status == 'pass':
-                    target_summary['passed_checks'] += 1
-                else:  # fail
-                    target_summary['failed_checks'] += 1
-                
-                # Header istatistikleri
-                header_name = finding.get('name', 'Unknown')
-                if header_name not in analysis['header_stats']:
-                    analysis['header_stats'][header_name] = {
-                        'total': 0,
-                        'pass': 0,
-                        'warn': 0,
-                        'fail': 0
-                    }
-                analysis['header_stats'][header_name]['total'] += 1
-                analysis['header_stats'][header_name][status] += 1
-            
-            analysis['target_summary'][target_name] = target_summary
-        
-        return analysis
+            aggregator.add(target_data)
+        return aggregator.result()
+    
+    def analyze_parallel(self, input_path: str, workers: int,
+                         engine: str = 'auto') -> Dict[str, Any]:
+        """Rapor dosyalarını process'lere dağıtıp kısmi analizleri birleştirir
+        
+        JSON çözme CPU'ya bağlı olduğu için büyük dizinlerde dosyalar ardışık
+        parçalara bölünür (map), her parça ayrı bir process'te analiz edilir ve
+        sonuçlar dosya sırasıyla birleştirilir (reduce). Çıktı seri yolla aynıdır.
+        """
+        aggregator = FindingsAggregator()
+        shard_analyzer = functools.partial(_analyze_shard, engine=engine)
+        for partial in map_file_shards(shard_analyzer, report_files(input_path), workers):
+            aggregator.merge(partial)
+        return aggregator.result()
     
     def generate_summary_report(self, analysis: Dict[str, Any]) -> str:
         """Özet rapor oluşturur"""
@@ -173,26 +148,58 @@ class ReportParser:
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(analysis, f, indent=2, ensure_ascii=False)
     
-    def run_analysis(self, input_path: str, output_dir: str = 'data/processed') -> None:
-        """Analizi çalıştırır"""
+    def run_incremental(self, input_path: str, state_file: str, progress_interval: int = 10000,
+                        engine: str = 'auto') -> Tuple[Dict[str, Any], bool]:
+        """Manifest checkpoint'ini kullanarak yalnızca yeni raporları analize ekler
+        
+        (analiz, değişti_mi) döndürür. Hiçbir rapor değişmediyse dosyalar
+        okunmaz; checkpoint'teki analiz olduğu gibi döner.
+        """
+        manifest = ReportManifest.load(state_file, input_path)
+        analysis, changed = manifest.update(
+            lambda previous: make_aggregator(engine, progress_interval, previous))
+        if changed:
+            manifest.save()
+        return analysis, changed
+    
+    def run_analysis(self, input_path: str, output_dir: str = 'data/processed',
+                     progress_interval: int = 10000, incremental: bool = False,
+                     state_file: Optional[str] = None, workers: int = 1,
+                     engine: str = 'auto') -> None:
+        """Analizi çalıştırır
+        
+        incremental=True iken output_dir/analysis_state.json (veya state_file)
+        checkpoint'i kullanılır; değişiklik yoksa yeni çıktı dosyası yazılmaz.
+        workers > 1 iken dosyalar process havuzunda paralel işlenir.
+        """
         # Output dizinini oluştur
         os.makedirs(output_dir, exist_ok=True)
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
-        # Veriyi yükle
-        if os.path.isfile(input_path):
-            data = [self.parse_json_file(input_path)]
+        if not os.path.exists(input_path):
+            print(f"Directory not found: {input_path}")
+            return
+        
+        if incremental:
+            state_file = state_file or os.path.join(output_dir, 'analysis_state.json')
+            analysis, changed = self.run_incremental(input_path, state_file, progress_interval,
+                                                     engine)
+            if not changed:
+                print(f"No new reports since last run; analysis unchanged ({state_file})")
+                return
+        elif workers > 1:
+            analysis = self.analyze_parallel(input_path, workers, engine)
         else:
-            data = self.parse_directory(input_path)
+            # Kayıtları akış halinde oku ve analiz et. Girdi tek hedef JSON'u,
+            # birleşik all_headers listesi, JSONL log veya bir dizin olabilir.
+            analysis = self.analyze_findings(iter_report_records(input_path), progress_interval,
+                                             engine)
         
-        if not data:
+        if not analysis['total_targets']:
             print("No data to analyze")
             return
         
-        # Analizi çalıştır
-        analysis = self.analyze_findings(data)
-        
         # Sonuçları kaydet
         analysis_file = f"{output_dir}/analysis_{timestamp}.json"
         self.save_analysis(analysis, analysis_file)
@@ -212,9 +219,19 @@ def main():
     """Ana fonksiyon"""
     parser = argparse.ArgumentParser(description='Parse and analyze security header reports')
     parser.add_argument('--input', required=True,
-                       help='Input JSON file or directory containing JSON files')
+                       help='Input JSON/JSONL file or directory containing report files')
     parser.add_argument('--output', default='data/processed',
                        help='Output directory for analysis results')
+    parser.add_argument('--progress', type=int, default=10000,
+                       help='Print progress every N reports (0 disables)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Only ingest reports that are new since the last run (uses a manifest checkpoint)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Parse report files in N processes (ignored with --incremental)')
+    parser.add_argument('--engine', choices=AGGREGATION_ENGINES, default='auto',
+                       help='Aggregation engine: vectorized numpy (default) or plain Python dicts')
+    parser.add_argument('--state-file', default=None,
+                       help='Manifest/checkpoint file for incremental mode (default: <output>/analysis_state.json)')
     
     args = parser.parse_args()
     
@@ -222,7 +239,9 @@ def main():
     parser_obj = ReportParser()
     
     # Analizi çalıştır
-    parser_obj.run_analysis(args.input, args.output)
+    parser_obj.run_analysis(args.input, args.output, args.progress,
+                            incremental=args.incremental, state_file=args.state_file,
+                            workers=args.workers, engine=args.engine)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Host Bazlı Hız Sınırlama ve Uyarlanabilir Geri Çekilme
+Yazılım Kalite ve Güvence - Konfigürasyon/Güvenlik Başlıkları Testi
+
+İstekleri host başına ve global token bucket'larla sınırlar, geçici hataları
+(bağlantı hatası, 429/503) jitter'lı üstel geri çekilme ile yeniden dener.
+Zaman aşımları varsayılan olarak yeniden denenmez: yanıt vermeyen bir host
+her denemede tam zaman aşımı kadar bekletir. 429/503 yanıtı veren host'un hızı yarıya düşürülür
+(sınırsız host'lar ADAPTIVE_START_RATE ile sınırlanmaya başlar) ve başarılı
+yanıtlarla kademeli olarak geri yükseltilir (AIMD). Aynı sınırlayıcı thread
+ve asyncio backend'lerinde ortak kullanılır.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5
+MAX_BACKOFF = 30.0
+
+# Yeniden denenecek ve hızı düşürecek durum kodları
+RETRY_STATUSES = {429, 503}
+THROTTLE_STATUSES = {429, 503}
+
+# Uyarlanabilir hız ayarları (istek/saniye)
+ADAPTIVE_START_RATE = 5.0
+ADAPTIVE_RELEASE_RATE = 4 * ADAPTIVE_START_RATE
+MIN_HOST_RATE = 0.2
+SLOWDOWN_FACTOR = 0.5
+RECOVERY_FACTOR = 1.05
+
+# Host kovası sayısı bu eşiği aşınca boşta (varsayılan hızda, jetonu dolu) kovalar
+# atılır; büyük CIDR envanterlerinde her host için kova birikmez
+IDLE_SWEEP_BUCKETS = 1024
+
+
+class TokenBucket:
+    """Saniyede rate jeton üreten, en fazla burst jeton biriktiren thread-safe kova
+
+    rate None ise kova sınırsızdır. reserve() jetonu hemen ayırır ve jetonun
+    kullanılabilir olacağı ana kadar beklenecek süreyi döndürür; böylece aynı
+    kova hem thread'lerde (time.sleep) hem asyncio'da (asyncio.sleep) kullanılır.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: float = 1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if self.rate is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        with self.lock:
+            if self.rate is None:
+                return 0.0
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def idle(self, rate: Optional[float]) -> bool:
+        """Kova yeniden oluşturulmuşuyla aynı durumda mı (hızı rate, jetonları dolu)"""
+        with self.lock:
+            self._refill(time.monotonic())
+            return self.rate == rate and self.tokens >= self.burst
+
+    def set_rate(self, rate: Optional[float]) -> None:
+        with self.lock:
+            self._refill(time.monotonic())
+            if rate is None:
+                self.tokens = self.burst
+            self.rate = rate
+
+
+class RateLimiter:
+    """Host başına ve global hız sınırı, yeniden deneme ve uyarlanabilir yavaşlama politikası"""
+
+    def __init__(self, host_rate: Optional[float] = None, global_rate: Optional[float] = None,
+                 burst: float = 1, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF, max_backoff: float = MAX_BACKOFF,
+                 retry_timeouts: bool = False):
+        self.host_rate = host_rate
+        self.burst = burst
+        self.retries = retries
+        self.retry_timeouts = retry_timeouts
+        self.backoff_base = backoff
+        self.max_backoff = max_backoff
+        self.global_bucket = TokenBucket(global_rate, burst)
+        self.host_buckets = {}
+        self.sweep_at = IDLE_SWEEP_BUCKETS
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'retries': 0, 'throttled': 0, 'wait': 0.0}
+
+    def _host_bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).hostname or ''
+        with self.lock:
+            bucket = self.host_buckets.get(host)
+            if bucket is None:
+                if len(self.host_buckets) >= self.sweep_at:
+                    self._sweep_idle_buckets()
+                bucket = self.host_buckets[host] = TokenBucket(self.host_rate, self.burst)
+            return bucket
+
+    def _sweep_idle_buckets(self) -> None:
+        """Boştaki host kovalarını atar (self.lock tutulurken çağrılır)
+
+        Atılan kova ilk istekte aynı durumda yeniden oluşturulur; yavaşlatılmış
+        veya jetonu tükenmiş kovalar korunur. Eşik kalan kova sayısıyla büyür,
+        böylece tarama maliyeti istek başına sabit kalır.
+        """
+        for host in [host for host, bucket in self.host_buckets.items()
+                     if bucket.idle(self.host_rate)]:
+            del self.host_buckets[host]
+        self.sweep_at = max(IDLE_SWEEP_BUCKETS, 2 * len(self.host_buckets))
+
+    def reserve(self, url: str) -> float:
+        """Global ve host kovasından birer jeton ayırır, beklenecek süreyi döndürür"""
+        delay = max(self.global_bucket.reserve(), self._host_bucket(url).reserve())
+        self._record(requests=1, wait=delay)
+        return delay
+
+    def wait(self, url: str) -> float:
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def wait_async(self, url: str) -> float:
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def should_retry(self, attempt: int, status: Optional[int] = None,
+                     timeout: bool = False) -> bool:
+        """attempt (0'dan başlar) sonrası yeniden denenmeli mi; status None ise bağlantı hatası
+
+        timeout=True bağlantı/okuma zaman aşımıdır; yalnızca retry_timeouts açıksa denenir.
+        """
+        if timeout and not self.retry_timeouts:
+            return False
+        return attempt < self.retries and (status is None or status in RETRY_STATUSES)
+
+    def backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter üstel geri çekilme süresi; sayısal Retry-After varsa ona uyulur"""
+        delay = random.uniform(0, min(self.max_backoff, self.backoff_base * 2 ** attempt))
+        if retry_after and retry_after.strip().isdigit():
+            delay = max(delay, min(float(retry_after), self.max_backoff))
+        self._record(retries=1, wait=delay)
+        return delay
+
+    def feedback(self, url: str, status: int) -> None:
+        """Yanıt durumuna göre host hızını düşürür (429/503) veya kademeli yükseltir"""
+        bucket = self._host_bucket(url)
+        if status in THROTTLE_STATUSES:
+            self._record(throttled=1)
+            if bucket.rate is None:
+                bucket.set_rate(ADAPTIVE_START_RATE)
+            else:
+                bucket.set_rate(max(MIN_HOST_RATE, bucket.rate * SLOWDOWN_FACTOR))
+        elif bucket.rate is not None and bucket.rate != self.host_rate:
+            rate = bucket.rate * RECOVERY_FACTOR
+            ceiling = self.host_rate if self.host_rate is not None else ADAPTIVE_RELEASE_RATE
+            bucket.set_rate(rate if rate < ceiling else self.host_rate)
+
+    def _record(self, **counts) -> None:
+        with self.lock:
+            for key, value in counts.items():
+                self.stats[key] += value
+
+    def reset_stats(self) -> None:
+        with self.lock:
+            self.stats = dict.fromkeys(self.stats, 0)
+            self.stats['wait'] = 0.0
+
+    def summary(self) -> Dict:
+        with self.lock:
+            return dict(self.stats, wait=round(self.stats['wait'], 3))
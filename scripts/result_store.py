@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Sonuç Deposu (JSONL / Parquet)
+Yazılım Kalite ve Güvence - Konfigürasyon/Güvenlik Başlıkları Testi
+
+Hedef başına ayrı JSON dosyaları yerine tüm tarama sonuçlarını tek bir
+append-only, satır bazlı (JSON Lines) log dosyasına yazar. Log isteğe bağlı
+olarak gzip ile sıkıştırılabilir ve bulgular satır başına bir bulgu olacak
+şekilde Parquet'e aktarılabilir. Okuma tarafı dosyaları kayıt kayıt akıtır;
+hiçbir dosya belleğe topluca yüklenmez.
+"""
+
+import gzip
+import json
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional
+
+try:
+    import orjson
+except ImportError:  # daha hızlı JSON çözücü opsiyoneldir
+    orjson = None
+
+
+def json_loads(data):
+    """orjson kuruluysa onunla, değilse standart json ile çözer"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+RESULT_LOG_NAME = 'headers_results.jsonl'
+
+# Parquet'e yazılan bulgu satırının sütunları
+FINDING_COLUMNS = ['run_id', 'target', 'url', 'timestamp', 'status_code',
+                   'name', 'value', 'status', 'severity', 'remark']
+
+
+def result_log_path(output_dir: str, compress: bool = False) -> str:
+    """Çıktı dizinindeki sonuç log dosyasının yolunu döndürür"""
+    path = os.path.join(output_dir, RESULT_LOG_NAME)
+    return f"{path}.gz" if compress else path
+
+
+def _open_text(path: str, mode: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+class ResultLogWriter:
+    """Sonuçları tamamlandıkça log dosyasının sonuna ekleyen thread-safe yazıcı
+
+    gzip modunda her çalıştırma dosyaya yeni bir gzip üyesi ekler; art arda
+    eklenmiş üyeler standart araçlarla tek dosya olarak okunabilir.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.handle = _open_text(path, 'a')
+
+    def write(self, result: Dict) -> None:
+        line = json.dumps(result, ensure_ascii=False, separators=(',', ':'))
+        with self.lock:
+            self.handle.write(line + '\n')
+            self.handle.flush()
+
+    def close(self) -> None:
+        with self.lock:
+            self.handle.close()
+
+    def __enter__(self) -> 'ResultLogWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def finding_rows(result: Dict, run_id: str = '') -> Iterator[Dict]:
+    """Bir hedef sonucunu bulgu başına düz satırlara açar"""
+    for finding in result.get('findings', []):
+        yield {
+            'run_id': result.get('run_id', run_id),
+            'target': result.get('target', 'unknown'),
+            'url': result.get('url', ''),
+            'timestamp': result.get('timestamp', ''),
+            'status_code': result.get('status_code', 0),
+            'name': finding.get('name', ''),
+            'value': str(finding.get('value', '')),
+            'status': finding.get('status', ''),
+            'severity': finding.get('severity', ''),
+            'remark': finding.get('remark', '')
+        }
+
+
+class ParquetExporter:
+    """Bulguları hedef tamamlandıkça Parquet dosyasına satır grupları halinde yazar"""
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+        self.pa = pa
+        self.schema = pa.schema([
+            (column, pa.int32() if column == 'status_code' else pa.string())
+            for column in FINDING_COLUMNS
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema, compression='zstd')
+        self.lock = threading.Lock()
+        self.path = path
+
+    def write(self, result: Dict) -> None:
+        rows = list(finding_rows(result))
+        if not rows:
+            return
+        table = self.pa.Table.from_pylist(rows, schema=self.schema)
+        with self.lock:
+            self.writer.write_table(table)
+
+    def close(self) -> None:
+        with self.lock:
+            self.writer.close()
+
+
+def iter_result_log(path: str) -> Iterator[Dict]:
+    """JSONL (veya .jsonl.gz) log dosyasındaki kayıtları tek tek döndürür"""
+    with _open_text(path, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json_loads(line)
+            except ValueError as e:
+                # Yarım kalmış son satır (ör. kesilen bir çalıştırma) tüm logu bozmamalı
+                print(f"Skipping malformed line {line_number} in {path}: {str(e)}")
+
+
+def is_result_log(filename: str) -> bool:
+    """Dosya adının bir JSONL sonuç logu olup olmadığını döndürür"""
+    return filename.endswith('.jsonl') or filename.endswith('.jsonl.gz')
+
+
+def report_files(input_path: str) -> List[str]:
+    """Okunacak rapor dosyalarını (tek dosya veya dizin) sıralı döndürür
+
+    Dizin modunda 'all_' ile başlayan birleşik dosyalar atlanır; bunlar hedef
+    başına dosyaların tekrarıdır.
+    """
+    if os.path.isfile(input_path):
+        return [input_path]
+    if not os.path.isdir(input_path):
+        return []
+    files = []
+    for filename in sorted(os.listdir(input_path)):
+        if filename.startswith('all_'):
+            continue
+        if filename.endswith('.json') or is_result_log(filename):
+            files.append(os.path.join(input_path, filename))
+    return files
+
+
+def iter_file_records(file_path: str) -> Iterator[Dict]:
+    """Tek bir rapor dosyasındaki hedef sonuçlarını döndürür (JSON veya JSONL)"""
+    if is_result_log(file_path):
+        yield from iter_result_log(file_path)
+        return
+    with open(file_path, 'rb') as f:
+        data = json_loads(f.read())
+    if isinstance(data, list):
+        yield from data
+    elif data:
+        yield data
+
+
+def iter_report_records(input_path: str, errors: Optional[List[str]] = None) -> Iterator[Dict]:
+    """Dosya veya dizindeki tüm hedef sonuçlarını akış halinde döndürür
+
+    Okunamayan dosyalar atlanır; errors listesi verilirse hata mesajları
+    oraya eklenir.
+    """
+    for file_path in report_files(input_path):
+        try:
+            yield from iter_file_records(file_path)
+        except (OSError, ValueError) as e:
+            message = f"Error parsing {file_path}: {str(e)}"
+            print(message)
+            if errors is not None:
+                errors.append(message)
+
+
+def shard_files(files: List[str], shards: int) -> List[List[str]]:
+    """Dosya listesini sırayı koruyan ardışık parçalara böler"""
+    shards = max(1, min(shards, len(files)))
+    size, extra = divmod(len(files), shards)
+    result = []
+    start = 0
+    for index in range(shards):
+        end = start + size + (1 if index < extra else 0)
+        result.append(files[start:end])
+        start = end
+    return result
+
+
+def map_file_shards(func: Callable[[List[str]], object], files: List[str],
+                    workers: int) -> List[object]:
+    """func'ı dosya parçalarına bir process havuzunda uygular, sonuçları sırayla döndürür
+
+    Parçalar ardışık olduğu için sonuçları sırayla birleştirmek seri okumayla
+    aynı sonucu verir. func modül seviyesinde (pickle edilebilir) olmalıdır.
+    """
+    return list(iter_file_shards(func, files, workers))
+
+
+def iter_file_shards(func: Callable[[List[str]], object], files: List[str], workers: int,
+                     shard_size: Optional[int] = None) -> Iterator[object]:
+    """map_file_shards'ın tembel karşılığı: parça sonuçlarını sırayla, tüketildikçe döndürür
+
+    Aynı anda en fazla workers * 2 parça işlenir veya tüketilmeyi bekler;
+    tüketici yavaş olsa da (ör. akışlı Excel yazımı) bellekte sınırlı sayıda
+    parça sonucu tutulur. shard_size verilirse parçalar en fazla bu kadar
+    dosya içerir (varsayılan: workers * 4 parça).
+    """
+    if shard_size:
+        shards = [files[start:start + shard_size] for start in range(0, len(files), shard_size)]
+    else:
+        shards = shard_files(files, workers * 4)
+    if workers <= 1 or len(shards) <= 1:
+        for shard in shards:
+            yield func(shard)
+        return
+    shard_iter = iter(shards)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque(executor.submit(func, shard) for shard in islice(shard_iter, workers * 2))
+        while pending:
+            result = pending.popleft().result()
+            for shard in islice(shard_iter, 1):
+                pending.append(executor.submit(func, shard))
+            yield result
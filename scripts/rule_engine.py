@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Deklaratif Kural Motoru
+Yazılım Kalite ve Güvence - Konfigürasyon/Güvenlik Başlıkları Testi
+
+Güvenlik başlığı kontrolleri rules/security_headers.json5 dosyasında veri
+olarak tanımlanır. Kurallar başlangıçta bir kez derlenir: koşullar hazır
+predicate fonksiyonlarına, bulgular önceden oluşturulmuş şablonlara çevrilir.
+Yanıt başına analiz, normalize edilmiş başlık haritası üzerinde tek geçişte
+yapılır.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from typing import Callable, Dict, List, Optional
+
+from cookie_parser import CookieInfo, parse_cookies, prefix_violation
+from csp_parser import analyze_csp
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  'rules', 'security_headers.json5')
+if not os.path.exists(DEFAULT_RULES_FILE):
+    # pip ile kurulduğunda (pyproject.toml) kurallar data-files olarak share/ altına kopyalanır
+    DEFAULT_RULES_FILE = os.path.join(sys.prefix, 'share', 'yk-headers', 'rules',
+                                      'security_headers.json5')
+
+_DIGIT = re.compile(r'\d')
+
+
+def extract_max_age(hsts_header: str) -> int:
+    """HSTS header'ından max-age değerini çıkarır"""
+    try:
+        for part in hsts_header.split(';'):
+            if 'max-age' in part:
+                return int(part.split('=')[1].strip())
+    except (IndexError, ValueError):
+        pass
+    return 0
+
+
+def load_rules_file(path: str) -> Dict:
+    """Kural dosyasını okur; json5 kuruluysa yorum içeren dosyaları da destekler"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    try:
+        import json5
+    except ImportError:
+        json5 = None
+    if json5 is not None:
+        return json5.loads(text)
+    return json.loads(text)
+
+
+def _compile_condition(name: str, argument) -> Callable[[str, Dict, Dict], bool]:
+    """Tek bir koşulu (değer, başlık haritası, bağlam) -> bool predicate'ine derler"""
+    if name == 'missing':
+        return lambda value, headers, ctx: (not value) == bool(argument)
+    if name == 'present':
+        return lambda value, headers, ctx: bool(value) == bool(argument)
+    if name == 'contains_any':
+        needles = tuple(argument)
+        return lambda value, headers, ctx: any(needle in value for needle in needles)
+    if name == 'not_contains':
+        return lambda value, headers, ctx: argument not in value
+    if name == 'equals_ci':
+        expected = argument.lower()
+        return lambda value, headers, ctx: value.lower() == expected
+    if name == 'not_equals_ci':
+        expected = argument.lower()
+        return lambda value, headers, ctx: value.lower() != expected
+    if name == 'has_digit':
+        return lambda value, headers, ctx: bool(_DIGIT.search(value)) == bool(argument)
+    if name == 'max_age_below':
+        limit = int(argument)
+
+        def max_age_below(value, headers, ctx):
+            ctx['max_age'] = extract_max_age(value)
+            return ctx['max_age'] < limit
+        return max_age_below
+    if name == 'header_not_contains':
+        pairs = tuple((header.lower(), needle) for header, needle in argument.items())
+        return lambda value, headers, ctx: all(
+            needle not in headers.get(header, '') for header, needle in pairs)
+    if name == 'csp_unsafe':
+        def csp_unsafe(value, headers, ctx):
+            analysis = analyze_csp(value)
+            ctx['csp_summary'] = analysis['summary']
+            return bool(analysis['issues']) == bool(argument)
+        return csp_unsafe
+    if name == 'csp_lacks_directive':
+        directive = argument.lower()
+        return lambda value, headers, ctx: all(directive not in policy for policy in analyze_csp(
+            headers.get('content-security-policy', ''))['policies'])
+    raise ValueError(f"Unknown rule condition: {name}")
+
+
+def _compile_cookie_condition(name: str, argument) -> Callable[[CookieInfo, Dict], bool]:
+    """Çerez kuralları için (çerez, bağlam) -> bool predicate'i derler"""
+    if name == 'flag_missing':
+        flag = argument.lower()
+        return lambda cookie, ctx: not getattr(cookie, flag)
+    if name == 'samesite_missing':
+        return lambda cookie, ctx: (cookie.samesite is None) == bool(argument)
+    if name == 'samesite_none_insecure':
+        return lambda cookie, ctx: (cookie.samesite == 'None' and not cookie.secure) == bool(argument)
+    if name == 'prefix_violation':
+        def check_prefix(cookie, ctx):
+            ctx['prefix_issue'] = prefix_violation(cookie)
+            return (ctx['prefix_issue'] is not None) == bool(argument)
+        return check_prefix
+    raise ValueError(f"Unknown cookie rule condition: {name}")
+
+
+def _compile_directive_condition(name: str, argument) -> Callable[[Dict, Dict], bool]:
+    """CSP direktif kuralları için (güvensiz kaynak, bağlam) -> bool predicate'i derler"""
+    if name == 'directive_in':
+        directives = frozenset(directive.lower() for directive in argument)
+        return lambda item, ctx: item['directive'] in directives
+    if name == 'issue_in':
+        issues = frozenset(argument)
+        return lambda item, ctx: item['issue'] in issues
+    raise ValueError(f"Unknown directive rule condition: {name}")
+
+
+class FindingTemplate:
+    """Önceden oluşturulmuş bulgu şablonu; yalnızca yer tutuculu alanlar doldurulur"""
+
+    __slots__ = ('base', 'templated', 'fallback')
+
+    def __init__(self, spec: Dict):
+        spec = dict(spec)
+        self.fallback = spec.pop('value_fallback', None)
+        self.templated = tuple(key for key, text in spec.items()
+                               if isinstance(text, str) and '{' in text)
+        self.base = spec
+
+    def render(self, value: str, ctx: Dict) -> Dict:
+        finding = dict(self.base)
+        if self.templated:
+            fields = dict(ctx, value=value)
+            for key in self.templated:
+                if key == 'value' and not value and self.fallback is not None:
+                    finding[key] = self.fallback
+                else:
+                    finding[key] = self.base[key].format_map(fields)
+        return finding
+
+
+class CompiledRule:
+    """Tek başlığa bağlı, sıralı durum listesinden oluşan derlenmiş kural"""
+
+    __slots__ = ('rule_id', 'header', 'cases')
+
+    def __init__(self, spec: Dict):
+        self.rule_id = spec.get('id', spec['header'])
+        self.header = spec['header'].lower()
+        self.cases = []
+        for case in spec.get('cases', []):
+            predicates = [_compile_condition(name, argument)
+                          for name, argument in case.get('when', {}).items()]
+            finding = case.get('finding')
+            template = FindingTemplate(finding) if finding is not None else None
+            self.cases.append((tuple(predicates), template))
+
+    def evaluate(self, headers: Dict[str, str]) -> Optional[Dict]:
+        value = headers.get(self.header, '')
+        ctx = {}
+        for predicates, template in self.cases:
+            if all(predicate(value, headers, ctx) for predicate in predicates):
+                return template.render(value, ctx) if template is not None else None
+        return None
+
+
+class CompiledCookieRule:
+    """Set-Cookie satırlarının her biri için ayrı değerlendirilen derlenmiş kural"""
+
+    __slots__ = ('rule_id', 'header', 'cases')
+
+    def __init__(self, spec: Dict):
+        self.rule_id = spec.get('id', 'Set-Cookie')
+        self.header = 'set-cookie'
+        self.cases = []
+        for case in spec.get('cases', []):
+            predicates = [_compile_cookie_condition(name, argument)
+                          for name, argument in case.get('when', {}).items()]
+            finding = case.get('finding')
+            template = FindingTemplate(finding) if finding is not None else None
+            self.cases.append((tuple(predicates), template))
+
+    def evaluate(self, cookies: List[CookieInfo]) -> List[Dict]:
+        findings = []
+        for cookie in cookies:
+            ctx = {'cookie_name': cookie.name}
+            for predicates, template in self.cases:
+                if all(predicate(cookie, ctx) for predicate in predicates):
+                    if template is not None:
+                        findings.append(template.render(cookie.name, ctx))
+                    break
+        return findings
+
+
+class CompiledDirectiveRule:
+    """CSP'de açık kalan her güvensiz direktif kaynağı için ayrı bulgu üreten derlenmiş kural"""
+
+    __slots__ = ('rule_id', 'header', 'cases')
+
+    def __init__(self, spec: Dict):
+        self.rule_id = spec.get('id', 'CSP_Directive')
+        self.header = spec.get('header', 'Content-Security-Policy').lower()
+        self.cases = []
+        for case in spec.get('cases', []):
+            predicates = [_compile_directive_condition(name, argument)
+                          for name, argument in case.get('when', {}).items()]
+            finding = case.get('finding')
+            template = FindingTemplate(finding) if finding is not None else None
+            self.cases.append((tuple(predicates), template))
+
+    def evaluate(self, headers: Dict[str, str]) -> List[Dict]:
+        value = headers.get(self.header, '')
+        if not value:
+            return []
+        findings = []
+        for item in analyze_csp(value)['risky']:
+            ctx = dict(item)
+            for predicates, template in self.cases:
+                if all(predicate(item, ctx) for predicate in predicates):
+                    if template is not None:
+                        findings.append(template.render(value, ctx))
+                    break
+        return findings
+
+
+def _compile_rule(spec: Dict):
+    if spec.get('per_cookie'):
+        return CompiledCookieRule(spec)
+    if spec.get('per_directive'):
+        return CompiledDirectiveRule(spec)
+    return CompiledRule(spec)
+
+
+class RuleEngine:
+    """Derlenmiş kural kümesini yanıt başlıklarına uygulayan motor"""
+
+    def __init__(self, rules: List[Dict]):
+        # Kural kümesinin imzası: önbelleğe alınmış bulguların geçerliliği için
+        self.signature = hashlib.sha1(
+            json.dumps(rules, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        self.rules = [_compile_rule(spec) for spec in rules]
+        self.watched_headers = set()
+        for rule, spec in zip(self.rules, rules):
+            self.watched_headers.add(rule.header)
+            for case in spec.get('cases', []):
+                when = case.get('when', {})
+                for header in when.get('header_not_contains', {}):
+                    self.watched_headers.add(header.lower())
+                if 'csp_lacks_directive' in when:
+                    self.watched_headers.add('content-security-policy')
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_RULES_FILE) -> 'RuleEngine':
+        """Kural dosyasını yükleyip derler"""
+        return cls(load_rules_file(path).get('rules', []))
+
+    def normalize(self, headers) -> Dict[str, str]:
+        """Kuralların baktığı başlıkları küçük harfli tek bir haritaya indirger
+
+        Aynı başlık birden çok kez geldiyse (ör. aiohttp'de Set-Cookie) değerler
+        requests'in yaptığı gibi ', ' ile birleştirilir.
+        """
+        normalized = {}
+        for name, value in headers.items():
+            key = name.lower()
+            if key in self.watched_headers:
+                if key in normalized:
+                    normalized[key] = f"{normalized[key]}, {value}"
+                else:
+                    normalized[key] = value
+        return normalized
+
+    def evaluate(self, headers, cookie_lines: Optional[List[str]] = None) -> List[Dict]:
+        """Tüm kuralları tek geçişte uygular ve bulguları döndürür
+
+        cookie_lines yanıttaki ham Set-Cookie satırlarıdır; verilmezse
+        birleştirilmiş Set-Cookie başlığı çerezlere bölünür.
+        """
+        normalized = self.normalize(headers)
+        cookies = None
+        findings = []
+        for rule in self.rules:
+            if isinstance(rule, CompiledCookieRule):
+                if cookies is None:
+                    cookies = parse_cookies(cookie_lines, normalized.get('set-cookie', ''))
+                findings.extend(rule.evaluate(cookies))
+                continue
+            if isinstance(rule, CompiledDirectiveRule):
+                findings.extend(rule.evaluate(normalized))
+                continue
+            finding = rule.evaluate(normalized)
+            if finding is not None:
+                findings.append(finding)
+        return findings
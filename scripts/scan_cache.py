@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Parmak İzi Tabanlı Tarama Önbelleği
+Yazılım Kalite ve Güvence - Konfigürasyon/Güvenlik Başlıkları Testi
+
+Her URL için son yanıtın güvenlikle ilgili başlıklarının parmak izini, ETag
+değerini ve üretilen bulguları yerel bir JSON dosyasında saklar. Bir sonraki
+taramada parmak izi değişmemişse bulgular yeniden analiz edilmeden kullanılır;
+sunucu ETag destekliyorsa If-None-Match ile gövde aktarımı tamamen atlanır.
+Girdiler TTL süresi dolunca ve en az kullanılanlardan başlayarak (LRU) atılır.
+"""
+
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+DEFAULT_SCAN_CACHE = 'data/processed/scan_cache.json'
+DEFAULT_CACHE_TTL = 24 * 3600
+DEFAULT_CACHE_ENTRIES = 10000
+
+SCAN_CACHE_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+
+class ScanCache:
+    """URL başına parmak izi, ETag ve bulguları tutan TTL'li LRU önbellek"""
+
+    def __init__(self, path: str = DEFAULT_SCAN_CACHE, ttl: int = DEFAULT_CACHE_TTL,
+                 max_entries: int = DEFAULT_CACHE_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.stats = {'changed': 0, 'unchanged': 0, 'not_modified': 0}
+        self.load()
+
+    def load(self) -> None:
+        """Önbellek dosyasını okur; yoksa veya bozuksa boş başlar"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable scan cache {self.path}: {str(e)}")
+            return
+        if state.get('version') == SCAN_CACHE_VERSION:
+            # Dosyada en az kullanılandan en çok kullanılana doğru saklanır
+            self.entries = OrderedDict(state.get('entries', []))
+
+    def save(self) -> None:
+        """Süresi dolmuş girdileri atıp önbelleği atomik olarak yazar"""
+        with self.lock:
+            now = time.time()
+            for url in [url for url, entry in self.entries.items() if self._expired(entry, now)]:
+                del self.entries[url]
+            # Girdiler kilit dışında yazılırken reuse() ETag'i güncelleyebilir; kopyası yazılır
+            state = {'version': SCAN_CACHE_VERSION,
+                     'entries': [(url, dict(entry)) for url, entry in self.entries.items()]}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, self.path)
+
+    def _expired(self, entry: Dict, now: float) -> bool:
+        return now - entry['stored_at'] > self.ttl
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """URL'nin geçerli önbellek girdisini döndürür (süresi dolmuşsa siler)"""
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is None:
+                return None
+            if self._expired(entry, time.time()):
+                del self.entries[url]
+                return None
+            self.entries.move_to_end(url)
+            return entry
+
+    def reuse(self, url: str, fingerprint: str, etag: Optional[str] = None) -> Optional[List[Dict]]:
+        """Parmak izi aynıysa önceki bulguların bir kopyasını döndürür
+
+        Girdinin yaşı (TTL) analiz zamanından sayılır; yeniden kullanım süreyi
+        uzatmaz, böylece her URL en geç TTL sonunda yeniden analiz edilir.
+        """
+        entry = self.lookup(url)
+        if entry is None:
+            return None
+        with self.lock:
+            if entry['fingerprint'] != fingerprint:
+                return None
+            if etag:
+                entry['etag'] = etag
+            findings = copy.deepcopy(entry['findings'])
+        self.record('unchanged')
+        return findings
+
+    def store(self, url: str, fingerprint: str, findings: List[Dict], status_code: int,
+              headers: Dict, etag: Optional[str] = None) -> None:
+        """Yeni analiz edilen yanıtı kaydeder; kapasite aşılırsa en eski girdiyi atar"""
+        entry = {
+            'fingerprint': fingerprint,
+            'etag': etag,
+            'status_code': status_code,
+            'headers': dict(headers),
+            'findings': copy.deepcopy(findings),
+            'stored_at': time.time()
+        }
+        with self.lock:
+            self.entries[url] = entry
+            self.entries.move_to_end(url)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        self.record('changed')
+
+    def record(self, state: str) -> None:
+        with self.lock:
+            self.stats[state] += 1
+
+    def reset_stats(self) -> None:
+        with self.lock:
+            self.stats = dict.fromkeys(self.stats, 0)
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Zaman Serisi Trend Deposu ve Çalıştırmalar Arası Fark Motoru
+Yazılım Kalite ve Güvence - Konfigürasyon/Güvenlik Başlıkları Testi
+
+run_checks çıktısını yerel bir SQLite veritabanına (target, header, timestamp)
+indeksli olarak yazar. Her çalıştırma için hedef bazlı pass/warn/fail
+sayaçları ayrı bir tabloda tutulur; böylece iki çalıştırma arasındaki
+gerilemeler/düzelmeler ve hedef bazlı geçme oranı trendleri, JSON dosyaları
+yeniden taranmadan indeks üzerinden sorgulanır.
+
+Kullanım:
+    python scripts/trend_store.py ingest --input data/raw_reports/
+    python scripts/trend_store.py runs
+    python scripts/trend_store.py diff
+    python scripts/trend_store.py diff --base 20231201_120000 --head 20231202_120000
+    python scripts/trend_store.py trend --target dvwa --since 2023-12-01
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from result_store import iter_file_records, report_files
+
+DEFAULT_TREND_DB = 'data/processed/trends.sqlite'
+
+# pass_rate_trend'in hedef başına döndürdüğü en yeni kayıt sayısı
+DEFAULT_TREND_LIMIT = 100
+
+# Bu kadar hedef sonucu birikince veritabanına commit edilir
+COMMIT_EVERY = 100
+
+# Durumların kötüleşme sırası; bilinmeyen durumlar fail sayılır
+STATUS_RANK = {'pass': 0, 'warn': 1, 'fail': 2}
+RANK_STATUS = ['pass', 'warn', 'fail']
+
+_RUN_ID_IN_NAME = re.compile(r'(\d{8}_\d{6})')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs (started_at);
+
+CREATE TABLE IF NOT EXISTS target_runs (
+    run_id TEXT NOT NULL,
+    target TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    url TEXT,
+    status_code INTEGER,
+    total INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    warned INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    PRIMARY KEY (run_id, target)
+);
+CREATE INDEX IF NOT EXISTS idx_target_runs_target ON target_runs (target, timestamp);
+
+CREATE TABLE IF NOT EXISTS findings (
+    run_id TEXT NOT NULL,
+    target TEXT NOT NULL,
+    header TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    status TEXT NOT NULL,
+    severity TEXT,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_findings_target_header ON findings (target, header, timestamp);
+CREATE INDEX IF NOT EXISTS idx_findings_run ON findings (run_id, target, header);
+"""
+
+
+def _status_rank(status: str) -> int:
+    return STATUS_RANK.get(status, 2)
+
+
+def worst_statuses(findings: Iterable[Dict]) -> Dict[str, int]:
+    """Bulgulardaki her başlık için en kötü durum sırasını döndürür"""
+    statuses = {}
+    for finding in findings:
+        header = finding.get('name', 'Unknown')
+        rank = _status_rank(finding.get('status', 'fail'))
+        if rank > statuses.get(header, -1):
+            statuses[header] = rank
+    return statuses
+
+
+def header_changes(target: str, before: Dict[str, int],
+                   after: Dict[str, int]) -> Tuple[List[Dict], List[Dict]]:
+    """Bir hedefin iki taramasındaki başlık durumlarını karşılaştırır (gerilemeler, düzelmeler)
+
+    before/after başlık -> en kötü durum sırası eşlemeleridir; yalnızca bir
+    taramada görülen bulgu 'pass' kabul edilir.
+    """
+    regressions, fixes = [], []
+    for header in sorted(set(before) | set(after)):
+        before_rank = before.get(header)
+        after_rank = after.get(header)
+        change = {
+            'target': target,
+            'header': header,
+            'before': RANK_STATUS[before_rank] if before_rank is not None else None,
+            'after': RANK_STATUS[after_rank] if after_rank is not None else None
+        }
+        if (after_rank or 0) > (before_rank or 0):
+            regressions.append(change)
+        elif (after_rank or 0) < (before_rank or 0):
+            fixes.append(change)
+    return regressions, fixes
+
+
+class TrendStore:
+    """Tarama sonuçlarının SQLite zaman serisi deposu
+
+    run_checks içinde diğer sonuç yazıcılarıyla aynı write()/close()
+    arayüzüyle kullanılır; aynı nesne diff/trend sorguları için de kullanılabilir.
+    """
+
+    def __init__(self, path: str = DEFAULT_TREND_DB):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+        self.pending = 0
+
+    def write(self, result: Dict, run_id: Optional[str] = None) -> bool:
+        """Tek bir hedef sonucunu kaydeder; (run_id, target) zaten varsa atlar
+
+        run_id verilmezse sonucun 'run_id' alanı kullanılır. Aynı raporun iki
+        kez içe aktarılması kayıtları çoğaltmaz.
+        """
+        run_id = run_id or result.get('run_id')
+        if not run_id:
+            raise ValueError("Result has no run_id")
+        target = result.get('target', 'unknown')
+        timestamp = result.get('timestamp', '')
+        findings = result.get('findings', [])
+
+        counts = [0, 0, 0]
+        for finding in findings:
+            counts[_status_rank(finding.get('status', 'fail'))] += 1
+
+        with self.lock:
+            cursor = self.connection.cursor()
+            cursor.execute('INSERT OR IGNORE INTO runs (run_id, started_at) VALUES (?, ?)',
+                           (run_id, timestamp))
+            cursor.execute(
+                'INSERT OR IGNORE INTO target_runs (run_id, target, timestamp, url, status_code, '
+                'total, passed, warned, failed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (run_id, target, timestamp, result.get('url', ''), result.get('status_code', 0),
+                 len(findings), counts[0], counts[1], counts[2]))
+            if cursor.rowcount == 0:
+                return False
+            cursor.executemany(
+                'INSERT INTO findings (run_id, target, header, timestamp, status, severity, value) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(run_id, target, finding.get('name', 'Unknown'), timestamp,
+                  finding.get('status', 'fail'), finding.get('severity', ''),
+                  str(finding.get('value', ''))) for finding in findings])
+            self.pending += 1
+            if self.pending >= COMMIT_EVERY:
+                self.connection.commit()
+                self.pending = 0
+        return True
+
+    def ingest(self, input_path: str) -> int:
+        """Var olan JSON/JSONL raporlarını içe aktarır; eklenen hedef sonucu sayısını döndürür
+
+        Kayıtta run_id yoksa dosya adındaki YYYYMMDD_HHMMSS zaman damgası
+        çalıştırma kimliği olarak kullanılır.
+        """
+        added = 0
+        for file_path in report_files(input_path):
+            match = _RUN_ID_IN_NAME.search(os.path.basename(file_path))
+            fallback_run_id = match.group(1) if match else None
+            try:
+                for record in iter_file_records(file_path):
+                    run_id = record.get('run_id') or fallback_run_id
+                    if run_id is None:
+                        print(f"Skipping record without run_id in {file_path}")
+                        continue
+                    if self.write(record, run_id):
+                        added += 1
+            except (OSError, ValueError) as e:
+                print(f"Error parsing {file_path}: {str(e)}")
+        self.commit()
+        return added
+
+    def commit(self) -> None:
+        with self.lock:
+            self.connection.commit()
+            self.pending = 0
+
+    def close(self) -> None:
+        self.commit()
+        with self.lock:
+            self.connection.close()
+
+    def __enter__(self) -> 'TrendStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Son çalıştırmaları (en yenisi önce) hedef sayısıyla döndürür"""
+        rows = self.connection.execute(
+            'SELECT r.run_id, r.started_at, COUNT(t.target) FROM runs r '
+            'LEFT JOIN target_runs t ON t.run_id = r.run_id '
+            'GROUP BY r.run_id ORDER BY r.run_id DESC LIMIT ?', (limit,)).fetchall()
+        return [{'run_id': run_id, 'started_at': started_at, 'targets': targets}
+                for run_id, started_at, targets in rows]
+
+    def _run_statuses(self, run_id: str) -> Dict[str, Dict[str, int]]:
+        """Çalıştırmadaki her (hedef, başlık) için en kötü durum sırasını döndürür"""
+        statuses = {}
+        for target in self._run_targets(run_id):
+            statuses[target] = {}
+        rows = self.connection.execute(
+            "SELECT target, header, MAX(CASE status WHEN 'pass' THEN 0 WHEN 'warn' THEN 1 "
+            "ELSE 2 END) FROM findings WHERE run_id = ? GROUP BY target, header", (run_id,))
+        for target, header, rank in rows:
+            statuses.setdefault(target, {})[header] = rank
+        return statuses
+
+    def _target_statuses(self, run_id: str, target: str) -> Dict[str, int]:
+        """Hedefin bir çalıştırmadaki her başlığı için en kötü durum sırasını döndürür"""
+        rows = self.connection.execute(
+            "SELECT header, MAX(CASE status WHEN 'pass' THEN 0 WHEN 'warn' THEN 1 "
+            "ELSE 2 END) FROM findings WHERE run_id = ? AND target = ? GROUP BY header",
+            (run_id, target))
+        return dict(rows)
+
+    def _latest_target_runs(self) -> Dict[str, List[str]]:
+        """Her hedefin en yeni iki çalıştırmasını (yeniden eskiye) döndürür"""
+        latest = {}
+        rows = self.connection.execute(
+            'SELECT target, run_id FROM (SELECT target, run_id, ROW_NUMBER() OVER '
+            '(PARTITION BY target ORDER BY timestamp DESC, run_id DESC) AS recency '
+            'FROM target_runs) WHERE recency <= 2 ORDER BY target, recency')
+        for target, run_id in rows:
+            latest.setdefault(target, []).append(run_id)
+        return latest
+
+    def _run_targets(self, run_id: str) -> List[str]:
+        return [row[0] for row in self.connection.execute(
+            'SELECT target FROM target_runs WHERE run_id = ?', (run_id,))]
+
+    def diff(self, base_run: Optional[str] = None, head_run: Optional[str] = None,
+             per_target: bool = False) -> Dict[str, Any]:
+        """İki çalıştırma arasındaki gerilemeleri ve düzelmeleri döndürür
+
+        Varsayılan olarak son iki çalıştırma karşılaştırılır. Karşılaştırma her
+        iki çalıştırmada da taranmış hedeflerin (hedef, başlık) çiftlerindeki en
+        kötü durum üzerinden yapılır; yalnızca bir çalıştırmada görülen bulgu
+        'pass' kabul edilir (ör. yeni çıkan bir çerez bulgusu gerilemedir).
+
+        per_target=True ise her hedefin kendi son iki taraması karşılaştırılır.
+        Hedeflerin farklı zamanlarda tarandığı daemon depolarında çalıştırmalar
+        hedef kümesini kapsamadığı için bu mod kullanılmalıdır.
+        """
+        if per_target:
+            return self._diff_per_target()
+        if base_run is None or head_run is None:
+            recent = [run['run_id'] for run in self.runs(limit=2)]
+            if len(recent) < 2:
+                raise ValueError("At least two runs are needed for a diff")
+            head_run = head_run or recent[0]
+            base_run = base_run or recent[1]
+
+        base = self._run_statuses(base_run)
+        head = self._run_statuses(head_run)
+        report = {
+            'base': base_run,
+            'head': head_run,
+            'regressions': [],
+            'fixes': [],
+            'new_targets': sorted(set(head) - set(base)),
+            'missing_targets': sorted(set(base) - set(head))
+        }
+        for target in sorted(set(base) & set(head)):
+            regressions, fixes = header_changes(target, base[target], head[target])
+            report['regressions'].extend(regressions)
+            report['fixes'].extend(fixes)
+        return report
+
+    def _diff_per_target(self) -> Dict[str, Any]:
+        report = {
+            'base': 'previous scan',
+            'head': 'latest scan',
+            'regressions': [],
+            'fixes': [],
+            'new_targets': [],
+            'missing_targets': []
+        }
+        for target, (head_run, *base_runs) in sorted(self._latest_target_runs().items()):
+            if not base_runs:
+                report['new_targets'].append(target)
+                continue
+            regressions, fixes = header_changes(target,
+                                                self._target_statuses(base_runs[0], target),
+                                                self._target_statuses(head_run, target))
+            report['regressions'].extend(regressions)
+            report['fixes'].extend(fixes)
+        return report
+
+    def pass_rate_trend(self, target: Optional[str] = None, since: Optional[str] = None,
+                        limit: int = DEFAULT_TREND_LIMIT) -> List[Dict[str, Any]]:
+        """Hedef bazlı geçme oranlarını zaman sırasıyla döndürür
+
+        since, zaman damgasıyla karşılaştırılan ISO tarih önekidir (ör. '2023-12-01').
+        limit hedef başınadır: her hedefin en yeni limit kaydı döner, böylece
+        uzun süre çalışan daemon'larda trend eski kayıtlarda takılı kalmaz.
+        """
+        query = ('SELECT target, run_id, timestamp, total, passed, warned, failed, '
+                 'ROW_NUMBER() OVER (PARTITION BY target ORDER BY timestamp DESC) AS recency '
+                 'FROM target_runs')
+        conditions = []
+        params = []
+        if target is not None:
+            conditions.append('target = ?')
+            params.append(target)
+        if since is not None:
+            conditions.append('timestamp >= ?')
+            params.append(since)
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query = ('SELECT target, run_id, timestamp, total, passed, warned, failed '
+                 f'FROM ({query}) WHERE recency <= ? ORDER BY target, timestamp')
+        params.append(limit)
+
+        trend = []
+        for target_name, run_id, timestamp, total, passed, warned, failed in \
+                self.connection.execute(query, params):
+            trend.append({
+                'target': target_name,
+                'run_id': run_id,
+                'timestamp': timestamp,
+                'total': total,
+                'passed': passed,
+                'warnings': warned,
+                'failed': failed,
+                'pass_rate': round(passed / total * 100, 1) if total else 0.0
+            })
+        return trend
+
+
+def format_diff(report: Dict[str, Any]) -> str:
+    """Fark raporunu okunabilir metne çevirir"""
+    lines = [f"Diff {report['base']} -> {report['head']}",
+             f"  Regressions: {len(report['regressions'])}",
+             f"  Fixes: {len(report['fixes'])}"]
+    for title, key in (('REGRESSIONS', 'regressions'), ('FIXES', 'fixes')):
+        if report[key]:
+            lines.append('')
+            lines.append(title)
+            for change in report[key]:
+                lines.append(f"  {change['target']:<20} {change['header']:<30} "
+                             f"{change['before'] or '-'} -> {change['after'] or '-'}")
+    for title, key in (('NEW TARGETS', 'new_targets'), ('MISSING TARGETS', 'missing_targets')):
+        if report[key]:
+            lines.append('')
+            lines.append(f"{title}: {', '.join(report[key])}")
+    return '\n'.join(lines)
+
+
+def format_trend(trend: Iterable[Dict[str, Any]]) -> str:
+    """Geçme oranı trendini okunabilir metne çevirir"""
+    lines = [f"{'Target':<20} {'Run':<16} {'Pass%':>6} {'Pass':>5} {'Warn':>5} {'Fail':>5}"]
+    for row in trend:
+        lines.append(f"{row['target']:<20} {row['run_id']:<16} {row['pass_rate']:>6.1f} "
+                     f"{row['passed']:>5} {row['warnings']:>5} {row['failed']:>5}")
+    return '\n'.join(lines)
+
+
+def main():
+    """Ana fonksiyon"""
+    parser = argparse.ArgumentParser(description='Security header trend store and run diff')
+    parser.add_argument('--db', default=DEFAULT_TREND_DB,
+                       help='SQLite trend database')
+    parser.add_argument('--json', action='store_true',
+                       help='Print machine-readable JSON instead of text')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', help='Import existing JSON/JSONL reports')
+    ingest.add_argument('--input', default='data/raw_reports',
+                       help='Input directory or JSON/JSONL file')
+
+    runs = commands.add_parser('runs', help='List recorded runs')
+    runs.add_argument('--limit', type=int, default=20)
+
+    diff = commands.add_parser('diff', help='Regressions and fixes between two runs')
+    diff.add_argument('--base', help='Base run id (default: second most recent run)')
+    diff.add_argument('--head', help='Head run id (default: most recent run)')
+    diff.add_argument('--per-target', action='store_true',
+                     help="Compare each target's two most recent scans (for daemon databases)")
+
+    trend = commands.add_parser('trend', help='Per-target pass-rate trend')
+    trend.add_argument('--target', help='Only this target')
+    trend.add_argument('--since', help='Only runs at or after this ISO date')
+    trend.add_argument('--limit', type=int, default=DEFAULT_TREND_LIMIT,
+                       help=f'Most recent runs shown per target (default: {DEFAULT_TREND_LIMIT})')
+
+    args = parser.parse_args()
+
+    with TrendStore(args.db) as store:
+        if args.command == 'ingest':
+            added = store.ingest(args.input)
+            output = {'added': added}
+            text = f"Imported {added} target results into {args.db}"
+        elif args.command == 'runs':
+            output = store.runs(args.limit)
+            text = '\n'.join(f"{run['run_id']}  {run['started_at']}  {run['targets']} targets"
+                             for run in output)
+        elif args.command == 'diff':
+            try:
+                output = store.diff(args.base, args.head, args.per_target)
+            except ValueError as e:
+                print(str(e))
+                sys.exit(1)
+            text = format_diff(output)
+        else:
+            output = store.pass_rate_trend(args.target, args.since, args.limit)
+            text = format_trend(output)
+
+    print(json.dumps(output, indent=2, ensure_ascii=False) if args.json else text)
+
+if __name__ == '__main__':
+    main()
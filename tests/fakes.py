@@ -0,0 +1,48 @@
+"""Testlerde ağ yerine kullanılan sahte yanıt nesneleri"""
+
+from requests.structures import CaseInsensitiveDict
+
+
+class FakeRaw:
+    """urllib3 yanıtının gövde okuma arayüzü"""
+
+    def __init__(self, body, headers=None):
+        self.body = body
+        self.headers = headers
+
+    def read(self, amount=None, decode_content=False):
+        return self.body[:amount]
+
+
+class FakeResponse:
+    """checker._request'in döndürdüğü requests.Response'un testlerde kullanılan kısmı"""
+
+    def __init__(self, url, status_code=200, headers=None, body=b'', encoding=None,
+                 raw_headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {'Content-Type': 'text/html'})
+        self.encoding = encoding
+        self.raw = FakeRaw(body, raw_headers)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def patch_requests(monkeypatch, checker, respond):
+    """checker._request'i ağa çıkmadan respond(method, url, **kwargs) ile yanıtlar
+
+    Sahte istek de gerçek _request gibi deneme sayısını timing sözlüğüne işler.
+    """
+    def request(method, url, timing=None, retry=True, **kwargs):
+        if timing is not None:
+            timing['attempts'] += 1
+        return respond(method, url, **kwargs)
+
+    monkeypatch.setattr(checker, '_request', request)
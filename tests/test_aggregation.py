@@ -0,0 +1,78 @@
+"""Tek geçişli bulgu toplayıcısı: akış halinde sayım ve parça birleştirme"""
+
+from aggregation import FindingsAggregator
+from generate_comparison_xlsx import ComparisonGenerator
+from parse_reports import ReportParser
+
+RECORDS = [
+    {'target': 'dvwa', 'findings': [
+        {'name': 'HSTS', 'status': 'fail', 'severity': 'High'},
+        {'name': 'CSP', 'status': 'pass', 'severity': 'Low'}]},
+    {'target': 'bwapp', 'findings': [
+        {'name': 'HSTS', 'status': 'warn', 'severity': 'Medium'}]},
+    {'target': 'dvwa', 'findings': [
+        {'name': 'HSTS', 'status': 'pass', 'severity': 'Low'}]},
+    {'target': 'down', 'findings': []},
+]
+
+
+def aggregate(records):
+    aggregator = FindingsAggregator()
+    for record in records:
+        aggregator.add(record)
+    return aggregator.result()
+
+
+def test_counts_are_accumulated_per_target_and_header():
+    analysis = aggregate(RECORDS)
+    assert analysis['total_targets'] == 4
+    assert analysis['total_findings'] == 4
+    assert analysis['severity_counts'] == {'High': 1, 'Medium': 1, 'Low': 2}
+    assert analysis['status_counts'] == {'pass': 2, 'warn': 1, 'fail': 1}
+    assert analysis['header_stats']['HSTS'] == {'total': 3, 'pass': 1, 'warn': 1, 'fail': 1}
+    assert analysis['target_summary']['dvwa'] == {
+        'total_findings': 3, 'high_severity': 1, 'medium_severity': 0, 'low_severity': 2,
+        'failed_checks': 1, 'passed_checks': 2, 'warnings': 0}
+    assert analysis['target_summary']['down']['total_findings'] == 0
+
+
+def test_merging_partial_results_matches_a_single_pass():
+    aggregator = FindingsAggregator()
+    aggregator.merge(aggregate(RECORDS[:2]))
+    aggregator.merge(aggregate(RECORDS[2:]))
+    merged = aggregator.result()
+    assert merged == aggregate(RECORDS)
+    assert list(merged['target_summary']) == ['dvwa', 'bwapp', 'down']
+
+
+def test_analysis_consumes_a_generator_once():
+    consumed = []
+
+    def records():
+        for record in RECORDS:
+            consumed.append(record['target'])
+            yield record
+
+    analysis = ReportParser().analyze_findings(records(), engine='python')
+    assert consumed == ['dvwa', 'bwapp', 'dvwa', 'down']
+    assert analysis == aggregate(RECORDS)
+
+
+def test_excel_summary_and_analysis_share_one_pass():
+    consumed = []
+
+    def records():
+        for record in RECORDS:
+            consumed.append(record['target'])
+            yield record
+
+    generator = ComparisonGenerator()
+    aggregator = FindingsAggregator()
+    rows = list(generator.iter_comparison_rows(records(), aggregator))
+
+    assert len(consumed) == len(RECORDS)
+    assert len(rows) == 4
+    assert aggregator.result() == ReportParser().analyze_findings(RECORDS, engine='python')
+    summary, _ = generator._summary_data(aggregator.result())
+    assert ['Total Findings', 4] in summary
+    assert ['HSTS', 3, 1, 1, 1] in summary
@@ -0,0 +1,32 @@
+"""Thread ve async backend'leri aynı yanıttan aynı başlıkları ve bulguları üretmeli"""
+
+import pytest
+
+from benchmark import FakeTargetFarm
+from header_check import SecurityHeaderChecker
+from rate_limit import RateLimiter
+
+
+def scan(backend, jobs, workdir):
+    checker = SecurityHeaderChecker(rate_limiter=RateLimiter(retries=0))
+    try:
+        return checker.run_checks([], str(workdir / backend), backend=backend, inventory=jobs)
+    finally:
+        checker.close()
+
+
+def test_repeated_headers_survive_both_backends(monkeypatch, tmp_path):
+    pytest.importorskip('aiohttp')
+    monkeypatch.chdir(tmp_path)
+    # 'mixed' profili iki Set-Cookie ve BaseHTTP'ninkiyle birlikte iki Server başlığı gönderir
+    with FakeTargetFarm(servers=1, profile='mixed') as farm:
+        jobs = farm.jobs(1)
+        threaded, = scan('thread', jobs, tmp_path)
+        asynchronous, = scan('async', jobs, tmp_path)
+
+    for result in (threaded, asynchronous):
+        assert result['headers']['Set-Cookie'] == 'session=abc; HttpOnly, tracking=1; Path=/'
+        assert result['headers']['Server'].endswith(', nginx')
+        assert [name for name, flags in result['cookies']] == ['session', 'tracking']
+    assert asynchronous['headers'] == threaded['headers']
+    assert asynchronous['findings'] == threaded['findings']
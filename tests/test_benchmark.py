@@ -0,0 +1,34 @@
+"""Benchmark sahte hedef çiftliği"""
+
+import requests
+
+from benchmark import FakeTargetFarm
+
+
+def test_farm_server_ignores_client_disconnects(capsys):
+    farm = FakeTargetFarm(servers=1)
+    server = farm.servers[0]
+    for error in (ConnectionResetError(), BrokenPipeError()):
+        try:
+            raise error
+        except OSError:
+            server.handle_error(None, ('127.0.0.1', 0))
+    assert capsys.readouterr().err == ''
+
+    try:
+        raise ValueError('handler bug')
+    except ValueError:
+        server.handle_error(None, ('127.0.0.1', 0))
+    assert 'ValueError: handler bug' in capsys.readouterr().err
+    server.server_close()
+
+
+def test_farm_serves_profile_headers():
+    farm = FakeTargetFarm(servers=2, profile='insecure').start()
+    try:
+        name, url = farm.jobs(1)[0]
+        response = requests.get(url, timeout=5)
+    finally:
+        farm.stop()
+    assert response.status_code == 200
+    assert response.headers['X-Powered-By'] == 'PHP/7.0.33'
@@ -0,0 +1,32 @@
+"""yk-headers CLI: alt komut devri ve yalnızca seçilen komutun modülünün import edilmesi"""
+
+import types
+
+import pytest
+
+import cli
+from benchmark import _startup_case
+
+
+def test_command_is_delegated_with_its_own_argv(monkeypatch):
+    calls = []
+    module = types.SimpleNamespace(main=lambda: calls.append(list(cli.sys.argv)))
+    monkeypatch.setitem(cli.sys.modules, 'fake_command', module)
+    monkeypatch.setitem(cli.COMMANDS, 'fake', ('fake_command', 'Fake command'))
+    monkeypatch.setattr(cli.sys, 'argv', ['yk-headers'])
+
+    cli.main(['fake', '--targets', 'all'])
+    assert calls == [['yk-headers fake', '--targets', 'all']]
+
+
+def test_unknown_command_prints_usage_and_fails(capsys):
+    with pytest.raises(SystemExit, match="unknown command 'nope'"):
+        cli.main(['nope'])
+    assert 'usage: yk-headers <command>' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('command', sorted(cli.STARTUP_BUDGETS))
+def test_cold_start_does_not_import_heavy_modules(command):
+    # Süre makineye bağlıdır; burada yalnızca ağır modüllerin yüklenmediği doğrulanır
+    result = _startup_case(command, ['--help'])
+    assert result['heavy_modules'] == []
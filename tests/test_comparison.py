@@ -0,0 +1,74 @@
+"""Karşılaştırma raporu: paralel ve akışlı yazım seri yazımla aynı çalışma kitabını üretir"""
+
+import json
+
+import pytest
+from openpyxl import load_workbook
+
+from aggregation import FindingsAggregator
+from generate_comparison_xlsx import ComparisonGenerator
+
+
+def write_reports(directory, count):
+    directory.mkdir()
+    for index in range(count):
+        record = {'target': f't{index}', 'findings': [
+            {'name': 'HSTS', 'value': 'Missing', 'status': 'fail', 'severity': 'High',
+             'remark': 'missing'},
+            {'name': 'CSP', 'value': "default-src 'self'", 'status': 'pass', 'severity': 'Low',
+             'remark': 'ok'}]}
+        (directory / f't{index:02d}_headers.json').write_text(json.dumps(record))
+
+
+def generate(reports, output, **options):
+    ComparisonGenerator().run_generation(str(reports), str(output), **options)
+    workbook, = output.glob('comparison_table_*.xlsx')
+    book = load_workbook(workbook, read_only=True)
+    sheets = {name: [row for row in book[name].iter_rows(values_only=True)]
+              for name in book.sheetnames}
+    book.close()
+    # Özet sayfasındaki oluşturulma zamanı çalıştırmaya göre değişir
+    sheets['Summary'] = [row for row in sheets['Summary'] if row[0] != 'Generated']
+    return sheets
+
+
+@pytest.mark.parametrize('stream_threshold', [0, 1000])
+def test_parallel_generation_matches_serial(tmp_path, stream_threshold):
+    reports = tmp_path / 'reports'
+    write_reports(reports, 40)
+    serial = generate(reports, tmp_path / 'serial', engine='python',
+                      stream_threshold=stream_threshold)
+    parallel = generate(reports, tmp_path / 'parallel', workers=2, engine='python',
+                        stream_threshold=stream_threshold)
+
+    assert parallel == serial
+    assert len(serial['Security Headers Comparison']) == 81
+    assert ('Total Findings', 80) in [row[:2] for row in serial['Summary']]
+
+
+def test_streaming_report_consumes_rows_lazily(tmp_path):
+    generator = ComparisonGenerator()
+    aggregator = FindingsAggregator()
+    produced = []
+
+    def records():
+        for index in range(500):
+            produced.append(index)
+            yield {'target': f't{index}', 'findings': [
+                {'name': 'HSTS', 'value': 'Missing', 'status': 'fail', 'severity': 'High',
+                 'remark': 'missing'}]}
+
+    rows = generator.iter_comparison_rows(records(), aggregator)
+    assert produced == []
+    output = str(tmp_path / 'stream.xlsx')
+    assert generator.create_streaming_report(rows, output, aggregator) == 500
+
+    book = load_workbook(output)
+    sheet = book['Security Headers Comparison']
+    assert sheet.max_row == 501
+    assert sheet.auto_filter.ref == 'A1:F501'
+    # Renkler hücre başına dolgu yerine koşullu biçimlendirmeyle verilir
+    ranges = {str(rule.sqref) for rule in sheet.conditional_formatting}
+    assert ranges == {'D2:D501', 'E2:E501'}
+    assert sheet['A2'].style == 'comparison_cell'
+    assert ('Total Findings', 500) in [row[:2] for row in book['Summary'].iter_rows(values_only=True)]
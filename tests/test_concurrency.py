@@ -0,0 +1,79 @@
+"""Sınırlı eşzamanlı tarama: aynı anda en fazla concurrency hedef, sınırlı iş kuyruğu"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from fakes import FakeResponse, patch_requests
+from header_check import SecurityHeaderChecker
+
+
+class Gauge:
+    """Aynı anda çalışan istek sayısının en yüksek değerini tutar"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def __exit__(self, *exc):
+        with self.lock:
+            self.active -= 1
+
+
+@pytest.fixture
+def checker(monkeypatch, tmp_path):
+    # run_checks CSV özetlerini çalışma dizinine göre data/processed altına yazar
+    monkeypatch.chdir(tmp_path)
+    checker = SecurityHeaderChecker()
+    yield checker
+    checker.close()
+
+
+def test_scans_run_in_parallel_up_to_concurrency(monkeypatch, tmp_path, checker):
+    gauge = Gauge()
+
+    def respond(method, url, **kwargs):
+        with gauge:
+            time.sleep(0.05)
+        return FakeResponse(url)
+
+    patch_requests(monkeypatch, checker, respond)
+    jobs = [(f't{index}', f'https://t{index}.test/') for index in range(12)]
+    results = checker.run_checks([], 'reports', concurrency=3, inventory=jobs)
+
+    assert gauge.peak == 3
+    assert [result['target'] for result in results] == [target for target, _ in jobs]
+    combined, = (tmp_path / 'reports').glob('all_headers_*.json')
+    assert len(json.loads(combined.read_text())) == 12
+
+
+def test_inventory_is_pulled_with_bounded_in_flight_jobs(monkeypatch, checker):
+    pulled = []
+    finished = []
+
+    def respond(method, url, **kwargs):
+        time.sleep(0.01)
+        finished.append(url)
+        return FakeResponse(url)
+
+    def inventory():
+        for index in range(20):
+            # Akıştan yeni iş çekilirken havuzda en fazla concurrency * 2 iş bekler
+            assert len(pulled) - len(finished) <= 4
+            url = f'https://t{index}.test/'
+            pulled.append(url)
+            yield f't{index}', url
+
+    patch_requests(monkeypatch, checker, respond)
+    results = checker.run_checks([], 'reports', concurrency=2, inventory=inventory())
+
+    assert len(results) == 20
+    assert sorted(finished) == sorted(pulled)
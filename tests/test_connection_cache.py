@@ -0,0 +1,121 @@
+"""Paylaşımlı DNS/TLS oturum önbelleği ve aynı bağlantıdan okunan TLS bulguları"""
+
+import os
+import socket
+import ssl
+import threading
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import urllib3
+
+from header_check import SecurityHeaderChecker
+from rate_limit import RateLimiter
+
+DATA = os.path.join(os.path.dirname(__file__), 'data')
+
+
+def server_context(maximum_version=None) -> ssl.SSLContext:
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(os.path.join(DATA, 'localhost.crt'), os.path.join(DATA, 'localhost.key'))
+    if maximum_version is not None:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', DeprecationWarning)
+            context.minimum_version = ssl.TLSVersion.TLSv1
+            context.maximum_version = maximum_version
+        # Eski sunucular gibi TLS 1.0/1.1 şifre takımlarını da sun
+        context.set_ciphers('ALL:@SECLEVEL=0')
+    return context
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.0: her yanıttan sonra bağlantı kapanır (Connection: close)
+    protocol_version = 'HTTP/1.0'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = b'ok'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _DualServer(ThreadingHTTPServer):
+    """Aynı portta TLS el sıkışmasıyla başlayan bağlantıları TLS'e, diğerlerini düz HTTP'ye alır"""
+
+    daemon_threads = True
+
+    def get_request(self):
+        sock, address = self.socket.accept()
+        if sock.recv(1, socket.MSG_PEEK) == b'\x16':
+            sock = self.tls.wrap_socket(sock, server_side=True)
+        return sock, address
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+@pytest.fixture
+def serve():
+    # Probe ve oturum testleri doğrulamasız bağlanır; urllib3 uyarısı beklenen davranıştır
+    warnings.simplefilter('ignore', urllib3.exceptions.InsecureRequestWarning)
+    servers = []
+
+    def start(context):
+        server = _DualServer(('127.0.0.1', 0), _Handler)
+        server.tls = context
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server.server_address[1]
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_sessions_resume_when_server_closes_every_connection(serve):
+    port = serve(server_context())
+    checker = SecurityHeaderChecker(rate_limiter=RateLimiter(retries=0))
+    for _ in range(3):
+        response = checker.session.get(f'https://localhost:{port}/', verify=False, timeout=5)
+        assert response.status_code == 200
+    checker.close()
+
+    stats = checker.connection_cache.summary()
+    assert stats['handshakes'] == 3
+    assert stats['resumed'] == 2
+    assert stats['dns_misses'] == 1 and stats['dns_hits'] == 2
+
+
+def test_old_tls_only_server_is_reported_as_tls_finding(serve):
+    try:
+        port = serve(server_context(maximum_version=ssl.TLSVersion.TLSv1_1))
+    except (ValueError, ssl.SSLError):
+        pytest.skip('OpenSSL build cannot serve TLS 1.1')
+    checker = SecurityHeaderChecker(rate_limiter=RateLimiter(retries=0))
+    result = checker.check_headers(f'https://localhost:{port}/', 'legacy')
+    checker.close()
+
+    finding = result['findings'][0]
+    assert result['status_code'] == 0
+    assert (finding['name'], finding['status'], finding['severity']) == ('TLS_Protocol', 'fail', 'High')
+
+
+def test_http_target_gets_tls_facts_from_https_probe(serve):
+    port = serve(server_context())
+    checker = SecurityHeaderChecker(rate_limiter=RateLimiter(retries=0))
+    result = checker.check_headers(f'http://localhost:{port}/', 'dual')
+    checker.close()
+
+    names = [finding['name'] for finding in result['findings']]
+    assert 'HTTPS_Redirect' in names
+    assert 'TLS_Protocol' in names and 'TLS_Cipher' in names
+    # Probe sertifikayı doğrulamaz; bitiş tarihi yalnızca doğrulanmış bağlantıdan okunur
+    assert 'TLS_Certificate_Expiry' not in names
+    assert result['tls']['protocol'] in ('TLSv1.2', 'TLSv1.3')
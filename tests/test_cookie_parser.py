@@ -0,0 +1,55 @@
+"""Set-Cookie: her çerez satırı ayrı ayrıştırılır ve ayrı bulgu üretir"""
+
+from urllib3 import HTTPHeaderDict
+
+from cookie_parser import parse_cookies, prefix_violation, split_set_cookie
+from fakes import FakeResponse, patch_requests
+from header_check import SecurityHeaderChecker
+from rule_engine import RuleEngine
+
+LINES = ['session=abc; Secure; HttpOnly; SameSite=Strict; Expires=Wed, 21 Oct 2026 07:28:00 GMT',
+         'tracking=1; Path=/',
+         '__Host-id=x; Secure; Path=/app']
+
+
+def cookie_findings(findings):
+    return sorted((f['name'], f['value']) for f in findings if f['name'].startswith('Cookie_'))
+
+
+def test_joined_header_is_split_without_breaking_expires():
+    assert split_set_cookie(', '.join(LINES)) == LINES
+    names = [cookie.name for cookie in parse_cookies(header_value=', '.join(LINES))]
+    assert names == ['session', 'tracking', '__Host-id']
+
+
+def test_prefix_rules():
+    secure, plain, host = parse_cookies(LINES)
+    assert prefix_violation(secure) is None
+    assert prefix_violation(host) == '__Host- prefix requires Secure, Path=/ and no Domain'
+
+
+def test_each_cookie_line_gets_its_own_findings():
+    findings = RuleEngine.from_file().evaluate({}, LINES)
+    assert cookie_findings(findings) == [
+        ('Cookie_HttpOnly', '__Host-id'), ('Cookie_HttpOnly', 'tracking'),
+        ('Cookie_Prefix', '__Host-id'),
+        ('Cookie_SameSite', '__Host-id'), ('Cookie_SameSite', 'tracking'),
+        ('Cookie_Secure', 'tracking')]
+
+
+def test_checker_reads_raw_set_cookie_lines_from_the_response(monkeypatch):
+    checker = SecurityHeaderChecker()
+    raw = HTTPHeaderDict()
+    for line in LINES:
+        raw.add('Set-Cookie', line)
+
+    def respond(method, url, **kwargs):
+        return FakeResponse(url, headers={'Set-Cookie': ', '.join(LINES)}, raw_headers=raw)
+
+    patch_requests(monkeypatch, checker, respond)
+    result = checker.check_headers('https://site.test/', 'site')
+    checker.close()
+
+    assert cookie_findings(result['findings']) == cookie_findings(
+        RuleEngine.from_file().evaluate({}, LINES))
+    assert result['cookies'][0] == ['session', 'Secure; HttpOnly; SameSite=Strict']
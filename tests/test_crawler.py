@@ -0,0 +1,51 @@
+"""Crawl modu: tek uç noktanın hatası hedef sonucunu ve çalıştırmayı bozmamalı"""
+
+import pytest
+
+import header_check
+from crawler import SiteCrawler
+from fakes import FakeResponse, patch_requests
+from header_check import SecurityHeaderChecker
+
+
+def test_endpoint_with_unknown_charset_becomes_endpoint_error(monkeypatch):
+    checker = SecurityHeaderChecker()
+
+    def respond(method, url, **kwargs):
+        if url == 'https://site.test/broken':
+            return FakeResponse(url, body=b'<a href="/x">x</a>', encoding='x-no-such-charset')
+        return FakeResponse(url, body=b'<p>ok</p>', encoding='utf-8')
+
+    patch_requests(monkeypatch, checker, respond)
+    crawler = SiteCrawler(checker, seed_paths=['/broken', '/'], max_depth=1)
+    result = crawler.crawl('https://site.test', 'site')
+    checker.close()
+
+    broken, ok = result['endpoints']
+    assert broken['error_type'] == 'Unexpected_Error'
+    assert ok['status_code'] == 200
+    assert result['status_code'] == 200
+    assert result['findings']
+
+
+def test_all_endpoints_failing_reports_first_error_type(monkeypatch):
+    checker = SecurityHeaderChecker()
+
+    def respond(method, url, **kwargs):
+        return FakeResponse(url, body=b'<p></p>', encoding='x-no-such-charset')
+
+    patch_requests(monkeypatch, checker, respond)
+    result = SiteCrawler(checker, seed_paths=['/']).crawl('https://site.test', 'site')
+    checker.close()
+
+    assert result['status_code'] == 0
+    assert result['findings'][0]['name'] == 'Unexpected_Error'
+
+
+def test_crawl_with_async_backend_is_rejected_by_the_cli(monkeypatch, capsys):
+    monkeypatch.setattr('sys.argv', ['header_check.py', '--targets', 'dvwa', '--crawl',
+                                     '--backend', 'async'])
+    with pytest.raises(SystemExit) as exit_info:
+        header_check.main()
+    assert exit_info.value.code == 2
+    assert '--crawl is only available with --backend thread' in capsys.readouterr().err
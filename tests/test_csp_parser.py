@@ -0,0 +1,44 @@
+"""CSP ayrıştırma: direktif bazında bulgular ve birden çok politikanın kesişimi"""
+
+from csp_parser import analyze_csp, parse_csp
+from rule_engine import RuleEngine
+
+
+def risky(policy):
+    return [(item['directive'], item['source']) for item in analyze_csp(policy)['risky']]
+
+
+def test_policy_is_parsed_into_directives_first_definition_wins():
+    assert parse_csp("Script-Src 'self'; script-src *; img-src data: ;") == [
+        {'script-src': ["'self'"], 'img-src': ['data:']}]
+    assert parse_csp("default-src 'self', script-src 'none'") == [
+        {'default-src': ["'self'"]}, {'script-src': ["'none'"]}]
+
+
+def test_risky_sources_are_reported_per_directive():
+    assert risky("script-src 'self' 'unsafe-inline' 'unsafe-eval'; img-src *; "
+                 "object-src https:") == [
+        ('script-src', "'unsafe-inline'"), ('script-src', "'unsafe-eval'"),
+        ('img-src', '*'), ('object-src', 'https:')]
+    # nonce varken 'unsafe-inline' yok sayılır; host joker karakteri güvensiz sayılmaz
+    assert risky("script-src 'nonce-abc' 'unsafe-inline' https://*.example.com") == []
+
+
+def test_multiple_policies_are_intersected():
+    # İkinci politika inline betikleri yasaklar; yalnızca ikisinin de izin verdiği açık kalır
+    assert risky("script-src 'unsafe-inline' 'unsafe-eval', script-src 'self' 'unsafe-eval'") == [
+        ('script-src', "'unsafe-eval'")]
+    # Kısıtlamayan politika sonucu değiştirmez; default-src geri dönüşü de kısıtlar
+    assert risky("img-src *, script-src 'self'") == [('img-src', '*')]
+    assert risky("script-src 'unsafe-inline', default-src 'self'") == []
+
+
+def test_rule_engine_emits_one_finding_per_risky_directive():
+    findings = RuleEngine.from_file().evaluate(
+        {'Content-Security-Policy': "script-src 'unsafe-inline'; img-src *"})
+    directive_findings = [(f['value'], f['status'], f['severity'])
+                          for f in findings if f['name'] == 'CSP_Directive']
+    assert directive_findings == [("script-src 'unsafe-inline'", 'fail', 'High'),
+                                  ('img-src *', 'warn', 'Medium')]
+    csp, = [f for f in findings if f['name'] == 'CSP']
+    assert csp['status'] == 'fail' and 'directives' not in csp
@@ -0,0 +1,64 @@
+"""Daemon: zamanlanmış dağıtım turları ve sonuç kaydı"""
+
+import itertools
+import json
+
+import daemon as daemon_module
+from daemon import ScanDaemon
+from header_check import SecurityHeaderChecker
+
+
+def test_targets_dispatched_together_share_a_run_id(tmp_path, monkeypatch):
+    config = tmp_path / 'targets.json'
+    config.write_text(json.dumps({'interval': 60, 'targets': [
+        'http://a.test', 'http://b.test', 'http://c.test']}))
+    ticks = itertools.count(1)
+    monkeypatch.setattr(daemon_module, 'new_run_id', lambda: f'run-{next(ticks)}')
+    checker = SecurityHeaderChecker()
+    monkeypatch.setattr(checker, 'check_headers', lambda url, name: {
+        'url': url, 'target': name, 'timestamp': '2024-01-01T00:00:00', 'status_code': 200,
+        'headers': {}, 'findings': [{'name': 'HSTS', 'status': 'pass'}]})
+    daemon = ScanDaemon(checker, str(config), output_dir=str(tmp_path / 'out'),
+                        trend_db=str(tmp_path / 'trends.sqlite'))
+    for target in daemon.targets.values():
+        target.next_run = 0.0
+
+    daemon._dispatch_due(1.0)
+    daemon.executor.shutdown(wait=True)
+    run_ids = {entry['result']['run_id'] for entry in daemon.latest.values()}
+    runs = daemon.trend_store.runs()
+    daemon.close()
+
+    assert len(daemon.latest) == 3
+    assert run_ids == {'run-1'}
+    assert [run['targets'] for run in runs] == [3]
+
+
+class FrozenDatetime(daemon_module.datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2024, 1, 1, 12, 0, 0)
+
+
+def test_on_demand_scan_in_the_same_second_gets_its_own_run(tmp_path, monkeypatch):
+    config = tmp_path / 'targets.json'
+    config.write_text(json.dumps({'interval': 60, 'targets': ['http://a.test']}))
+    monkeypatch.setattr(daemon_module, 'datetime', FrozenDatetime)
+    checker = SecurityHeaderChecker()
+    monkeypatch.setattr(checker, 'check_headers', lambda url, name: {
+        'url': url, 'target': name, 'timestamp': '2024-01-01T00:00:00', 'status_code': 200,
+        'headers': {}, 'findings': [{'name': 'HSTS', 'status': 'pass'}]})
+    daemon = ScanDaemon(checker, str(config), output_dir=str(tmp_path / 'out'),
+                        trend_db=str(tmp_path / 'trends.sqlite'))
+    target, = daemon.targets.values()
+
+    # Zamanlanmış tur ve aynı saniyede gelen POST /scan
+    scheduled = daemon.scan(target, daemon_module.new_run_id())
+    on_demand = daemon.scan(target)
+    runs = daemon.trend_store.runs()
+    daemon.close()
+
+    assert scheduled['run_id'] == '20240101_120000'
+    assert on_demand['run_id'] == '20240101_120000_01'
+    assert sorted((run['run_id'], run['targets']) for run in runs) == [
+        ('20240101_120000', 1), ('20240101_120000_01', 1)]
@@ -0,0 +1,89 @@
+"""Dağıtık tarama: süresi dolan lease'ler geri alınır, koordinatör kaldığı yerden devam eder"""
+
+import json
+import os
+import threading
+
+import pytest
+
+import distributed
+from distributed import Coordinator, ShardQueue, run_worker
+from fakes import FakeResponse, patch_requests
+from header_check import SecurityHeaderChecker
+
+JOBS = [(f't{index}', f'https://t{index}.test/') for index in range(7)]
+
+
+@pytest.fixture
+def scanned(monkeypatch, tmp_path):
+    """Worker'ların oluşturduğu checker'ları sahte ağa bağlar; istenen URL'leri döndürür"""
+    monkeypatch.chdir(tmp_path)
+    urls = []
+
+    def respond(method, url, **kwargs):
+        urls.append(url)
+        return FakeResponse(url, headers={'X-Frame-Options': 'DENY'})
+
+    def checker(**kwargs):
+        instance = SecurityHeaderChecker(**kwargs)
+        patch_requests(monkeypatch, instance, respond)
+        return instance
+
+    monkeypatch.setattr(distributed, 'SecurityHeaderChecker', checker)
+    return urls
+
+
+def test_expired_lease_is_reclaimed_and_only_missing_urls_rescanned(tmp_path, scanned):
+    queue = ShardQueue(str(tmp_path / 'queue'))
+    queue.create({'run_id': 'run', 'lease': 5, 'shard_size': 3, 'checker': {}})
+    name = queue.add_shard(1, JOBS[:3])
+
+    # Çöken worker shard'ı sahiplenip ilk hedefi bitirmiş, sonra heartbeat'i durmuş
+    _, claimed = queue.claim('crashed')
+    crashed = distributed.SecurityHeaderChecker()
+    crashed.run_checks([], queue.results_dir(name, 'crashed'), output_format='jsonl',
+                       inventory=JOBS[:1], processed_dir=queue.processed)
+    crashed.close()
+    os.utime(claimed, (0, 0))
+
+    assert queue.requeue_expired(lease=5) == [os.path.basename(claimed)]
+    assert queue.counts() == {'pending': 1, 'running': 0, 'done': 0}
+
+    queue.mark_complete()
+    del scanned[:]
+    assert run_worker(queue.path, 'second', poll=0.01) == 2
+    assert scanned == [url for _, url in JOBS[1:3]]
+    assert queue.done_shards() == [name]
+    # Worker yan çıktılarını çalışma dizinine değil kuyruk dizinine yazar
+    assert not (tmp_path / 'data').exists()
+
+    results = {record['url'] for record in queue.shard_results(name)}
+    assert results == {url for _, url in JOBS[:3]}
+
+
+def test_coordinator_resumes_interrupted_enqueue(tmp_path, scanned):
+    queue_dir = str(tmp_path / 'queue')
+
+    def crashing_inventory():
+        for job in JOBS[:5]:
+            yield job
+        raise RuntimeError('coordinator crashed')
+
+    with pytest.raises(RuntimeError):
+        Coordinator(queue_dir, str(tmp_path / 'reports'), shard_size=2).run(crashing_inventory())
+    queue = ShardQueue(queue_dir)
+    assert queue.enqueue_progress() == {'shards': 2, 'jobs': 4, 'complete': False}
+
+    # Yeniden başlatılan koordinatör çalıştırmanın shard boyutunu kullanır
+    coordinator = Coordinator(queue_dir, str(tmp_path / 'reports'), shard_size=50, poll=0.01)
+    worker = threading.Thread(target=run_worker, args=(queue_dir, 'local'), kwargs={'poll': 0.01})
+    worker.start()
+    run_id = coordinator.run(iter(JOBS))
+    worker.join()
+
+    assert queue.enqueue_progress() == {'shards': 4, 'jobs': 7, 'complete': True}
+    assert queue.done_shards() == [f'shard_{index:06d}.json' for index in range(1, 5)]
+    assert sorted(scanned) == sorted(url for _, url in JOBS)
+
+    combined = json.loads(open(coordinator.merge(run_id), encoding='utf-8').read())
+    assert [result['target'] for result in combined] == [target for target, _ in JOBS]
@@ -0,0 +1,40 @@
+"""Header-only probe: HEAD desteklenmiyorsa gövdesi indirilmeyen streamed GET'e düşülür"""
+
+import pytest
+
+from fakes import FakeResponse, patch_requests
+from header_check import SecurityHeaderChecker
+
+HEADERS = {'Content-Type': 'text/html', 'Content-Length': '5120', 'X-Frame-Options': 'DENY'}
+
+
+def probe(monkeypatch, head_status):
+    checker = SecurityHeaderChecker(probe_mode='head')
+    calls = []
+
+    def respond(method, url, **kwargs):
+        calls.append((method, kwargs.get('stream', False)))
+        if method == 'HEAD':
+            return FakeResponse(url, head_status, HEADERS)
+        return FakeResponse(url, 200, HEADERS)
+
+    patch_requests(monkeypatch, checker, respond)
+    result = checker.check_headers('https://site.test/', 'site')
+    checker.close()
+    return result, calls
+
+
+def test_head_response_is_used_when_supported(monkeypatch):
+    result, calls = probe(monkeypatch, 200)
+    assert calls == [('HEAD', False)]
+    assert result['probe'] == {'mode': 'head', 'method': 'HEAD', 'bytes_saved': 5120}
+    assert result['headers']['X-Frame-Options'] == 'DENY'
+
+
+@pytest.mark.parametrize('status', [405, 501])
+def test_unsupported_head_falls_back_to_streamed_get(monkeypatch, status):
+    result, calls = probe(monkeypatch, status)
+    assert calls == [('HEAD', False), ('GET', True)]
+    assert result['probe']['method'] == 'GET (streamed)'
+    assert result['status_code'] == 200
+    assert 'X-Frame-Options' not in [f['name'] for f in result['findings'] if f['status'] == 'fail']
@@ -0,0 +1,47 @@
+"""HTTPS probe paylaşımı: aynı host:port'taki hedefler tek probe Future'ını bekler"""
+
+import threading
+
+from fakes import FakeResponse, patch_requests
+from header_check import SecurityHeaderChecker
+
+
+def test_redirecting_target_does_not_cancel_shared_probe(monkeypatch):
+    """Bir hedefin HTTPS'e yönlenmesi aynı host'un probe'unu bekleyen hedefi bozmamalı"""
+    checker = SecurityHeaderChecker(pool_size=1)
+    release_other_host = threading.Event()
+    waiting_target_requested = threading.Event()
+
+    def respond(method, url, **kwargs):
+        if url == 'https://other.test/':
+            # Tek probe worker'ını meşgul eder; a.test probe'u kuyrukta bekler
+            release_other_host.wait(5)
+            return FakeResponse(url, 404)
+        if url == 'https://a.test/waiting':
+            return FakeResponse(url, 200)
+        if url == 'http://a.test/redirecting':
+            return FakeResponse('https://a.test/redirecting')
+        if url == 'http://a.test/waiting':
+            waiting_target_requested.set()
+        return FakeResponse(url)
+
+    patch_requests(monkeypatch, checker, respond)
+
+    other = threading.Thread(target=checker.check_headers, args=('http://other.test/', 'other'))
+    other.start()
+    results = {}
+    waiting = threading.Thread(target=lambda: results.setdefault(
+        'waiting', checker.check_headers('http://a.test/waiting', 'waiting')))
+    waiting.start()
+    assert waiting_target_requested.wait(5)
+
+    redirecting = checker.check_headers('http://a.test/redirecting', 'redirecting')
+    release_other_host.set()
+    waiting.join(5)
+    other.join(5)
+    checker.close()
+
+    names = [finding['name'] for finding in results['waiting']['findings']]
+    assert 'Unexpected_Error' not in names
+    assert 'HTTPS_Redirect' in names
+    assert 'HTTPS_Redirect' not in [f['name'] for f in redirecting['findings']]
@@ -0,0 +1,31 @@
+"""Aşama süresi ölçümü: çalıştırma metrikleri ve crawl uç noktalarının aşamaları"""
+
+from crawler import SiteCrawler
+from fakes import FakeResponse, patch_requests
+from header_check import SecurityHeaderChecker
+from instrumentation import RunMetrics, add_phase, current_phases
+
+
+def test_slowest_targets_tolerate_equal_elapsed_and_target():
+    metrics = RunMetrics(slowest=2)
+    for index in range(5):
+        metrics.observe({'target': 'same', 'status_code': 200,
+                         'timing': {'elapsed': 0.5, 'phases': {'ttfb': 0.4, 'body': index / 100}}})
+    assert metrics.summary()[-1] == 'Slow target same: 0.500s (mostly ttfb)'
+
+
+def test_crawled_endpoint_phases_reach_target_timing(monkeypatch):
+    checker = SecurityHeaderChecker(instrument=True)
+
+    def respond(method, url, **kwargs):
+        phases = current_phases()
+        if phases is not None:
+            add_phase(phases, 'ttfb', 0.25)
+        return FakeResponse(url, body=b'<p></p>', encoding='utf-8')
+
+    patch_requests(monkeypatch, checker, respond)
+    crawler = SiteCrawler(checker, seed_paths=['/', '/a', '/b'], concurrency=3)
+    result = crawler.crawl('https://site.test', 'site')
+    checker.close()
+
+    assert result['timing']['phases']['ttfb'] == 0.75
@@ -0,0 +1,54 @@
+"""Envanter akışı: CIDR/port genişletme, dosya biçimleri, stdin ve tekrar atma"""
+
+import io
+import json
+
+import pytest
+
+from inventory import expand_entry, iter_inventory, normalize_url, parse_ports
+
+
+def test_ports_and_urls_are_normalized():
+    assert parse_ports('80, 443,8000-8002') == [80, 443, 8000, 8001, 8002]
+    with pytest.raises(ValueError):
+        parse_ports('0')
+    assert normalize_url('HTTPS://Example.COM:443/') == 'https://example.com'
+    assert normalize_url('http://[::1]:8080/app') == 'http://[::1]:8080/app'
+
+
+def test_cidr_block_expands_lazily_with_ports():
+    entries = expand_entry('10.0.0.0/30:80,443')
+    assert next(entries) == ('10.0.0.1', 'http://10.0.0.1')
+    # 443 portu https olarak taranır
+    assert [url for _, url in entries] == ['https://10.0.0.1', 'http://10.0.0.2',
+                                           'https://10.0.0.2']
+    # /16 bloğu listeye çevrilmeden ilk hedef hemen üretilir
+    assert next(expand_entry('172.16.0.0/16')) == ('172.16.0.1', 'http://172.16.0.1')
+    assert list(expand_entry('10.0.0.5/32', name='gw')) == [('gw_10.0.0.5', 'http://10.0.0.5')]
+
+
+def test_sources_are_merged_and_deduplicated(tmp_path, monkeypatch):
+    text = tmp_path / 'hosts.txt'
+    text.write_text('# yorum\nweb=example.com:8080\nhttp://EXAMPLE.com:8080/\n[::1]:81\n')
+    table = tmp_path / 'hosts.csv'
+    table.write_text('name,host,port\napi,api.test,443\n')
+    lines = tmp_path / 'hosts.jsonl'
+    lines.write_text(json.dumps({'url': 'https://api.test/'}) + '\n"db.test:5432"\n')
+    monkeypatch.setattr('sys.stdin', io.StringIO('198.51.100.0/31\nexample.com:8080\n'))
+
+    targets = list(iter_inventory([str(text), str(table), str(lines), '-'], ports=[80]))
+    assert targets == [
+        ('web', 'http://example.com:8080'),
+        ('__1_81', 'http://[::1]:81'),
+        ('api', 'https://api.test'),
+        ('db.test_5432', 'http://db.test:5432'),
+        ('198.51.100.0', 'http://198.51.100.0'),
+        ('198.51.100.1', 'http://198.51.100.1'),
+    ]
+
+
+def test_invalid_entries_are_skipped_with_a_warning(tmp_path, capsys):
+    source = tmp_path / 'hosts.txt'
+    source.write_text('bad:99999\nok.test\n')
+    assert list(iter_inventory([str(source)])) == [('ok.test', 'http://ok.test')]
+    assert "Skipping invalid inventory entry 'bad:99999'" in capsys.readouterr().err
@@ -0,0 +1,90 @@
+"""Artımlı analiz: manifest checkpoint'inden yalnızca yeni raporlar işlenir"""
+
+import json
+
+from aggregation import FindingsAggregator
+from manifest import ReportManifest
+from parse_reports import ReportParser
+
+
+def record(target, status='fail'):
+    return {'target': target,
+            'findings': [{'name': 'HSTS', 'status': status, 'severity': 'High'}]}
+
+
+def append(path, *records):
+    with open(path, 'a', encoding='utf-8') as f:
+        for item in records:
+            f.write(json.dumps(item) + '\n')
+
+
+class CountingAggregator(FindingsAggregator):
+    """Checkpoint'ten devam ederken kaç kaydın yeniden okunduğunu sayar"""
+
+    added = 0
+
+    def add(self, target_data):
+        CountingAggregator.added += 1
+        super().add(target_data)
+
+
+def run(reports, state):
+    CountingAggregator.added = 0
+    manifest = ReportManifest.load(str(state), str(reports))
+    analysis, changed = manifest.update(lambda previous: CountingAggregator(analysis=previous))
+    if changed:
+        manifest.save()
+    return analysis, changed, CountingAggregator.added
+
+
+def test_resume_reads_only_appended_lines(tmp_path):
+    reports = tmp_path / 'reports'
+    reports.mkdir()
+    state = tmp_path / 'state.json'
+    log = reports / 'headers_results.jsonl'
+    append(log, record('a'), record('b'))
+    (reports / 'c_headers.json').write_text(json.dumps(record('c', 'pass')))
+
+    analysis, changed, added = run(reports, state)
+    assert (changed, added, analysis['total_targets']) == (True, 3, 3)
+
+    # Değişiklik yok: dosyalar okunmaz, checkpoint'teki analiz döner
+    assert run(reports, state)[1:] == (False, 0)
+
+    # Loga eklenen satırlar ve yeni dosya kaldığı yerden işlenir; yarım satır beklenir
+    append(log, record('d'))
+    with open(log, 'a', encoding='utf-8') as f:
+        f.write('{"target": "half')
+    (reports / 'e_headers.json').write_text(json.dumps(record('e')))
+    analysis, changed, added = run(reports, state)
+    assert (changed, added) == (True, 2)
+    assert sorted(analysis['target_summary']) == ['a', 'b', 'c', 'd', 'e']
+    assert analysis == ReportParser().analyze_findings(
+        [record('a'), record('b'), record('c', 'pass'), record('d'), record('e')], engine='python')
+
+
+def test_rewritten_file_triggers_full_reanalysis(tmp_path):
+    reports = tmp_path / 'reports'
+    reports.mkdir()
+    state = tmp_path / 'state.json'
+    log = reports / 'headers_results.jsonl'
+    append(log, record('a'), record('b'))
+    run(reports, state)
+
+    log.write_text(json.dumps(record('x')) + '\n' + json.dumps(record('y')) + '\n'
+                   + json.dumps(record('z')) + '\n')
+    analysis, changed, added = run(reports, state)
+    assert (changed, added) == (True, 3)
+    assert list(analysis['target_summary']) == ['x', 'y', 'z']
+
+
+def test_manifest_for_another_input_is_ignored(tmp_path):
+    reports = tmp_path / 'reports'
+    reports.mkdir()
+    append(reports / 'headers_results.jsonl', record('a'))
+    state = tmp_path / 'state.json'
+    run(reports, state)
+
+    other = tmp_path / 'other'
+    other.mkdir()
+    assert ReportManifest.load(str(state), str(other)).analysis is None
@@ -0,0 +1,117 @@
+"""Hız sınırlayıcı: token bucket, host kovalarının sınırlı tutulması, yeniden deneme ve geri çekilme"""
+
+import pytest
+import requests
+
+import header_check
+import rate_limit
+from fakes import FakeResponse
+from header_check import SecurityHeaderChecker
+from rate_limit import RateLimiter, TokenBucket
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert 0.09 < bucket.reserve() <= 0.1
+    assert TokenBucket().reserve() == 0.0
+
+
+def test_idle_host_buckets_do_not_accumulate(monkeypatch):
+    monkeypatch.setattr(rate_limit, 'IDLE_SWEEP_BUCKETS', 100)
+    limiter = RateLimiter()
+    limiter.feedback('http://slow.test/', 429)
+    for index in range(5000):
+        limiter.reserve(f'http://10.0.{index >> 8}.{index & 255}/')
+
+    assert len(limiter.host_buckets) <= 100
+    # Yavaşlatılmış host'un kovası atılmaz
+    assert limiter.host_buckets['slow.test'].rate == rate_limit.ADAPTIVE_START_RATE
+
+
+def test_limited_host_keeps_its_reservation_across_sweeps(monkeypatch):
+    monkeypatch.setattr(rate_limit, 'IDLE_SWEEP_BUCKETS', 10)
+    limiter = RateLimiter(host_rate=0.5)
+    for index in range(50):
+        limiter.reserve(f'http://h{index}.test/')
+    # Jetonu harcanmış kovalar boşta sayılmaz; ikinci istek beklemek zorundadır
+    assert limiter.reserve('http://h0.test/') > 1.0
+
+
+class FlakySession:
+    """Sırayla verilen istisnaları fırlatan veya yanıtları döndüren sahte Session"""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def flaky_checker(monkeypatch, outcomes, **limits):
+    checker = SecurityHeaderChecker(rate_limiter=RateLimiter(backoff=0.01, **limits))
+    checker.session.close()
+    checker.session = FlakySession(outcomes)
+    sleeps = []
+    monkeypatch.setattr(header_check.time, 'sleep', sleeps.append)
+    return checker, sleeps
+
+
+def test_connection_errors_are_retried_with_backoff(monkeypatch):
+    error = requests.exceptions.ConnectionError('refused')
+    checker, sleeps = flaky_checker(monkeypatch, [error, error, FakeResponse('https://a.test/')])
+    timing = {'wait': 0.0, 'attempts': 0}
+    response = checker._request('GET', 'https://a.test/', timing)
+
+    assert response.status_code == 200
+    assert timing['attempts'] == 3
+    assert len(sleeps) == 2 and 0 <= sleeps[0] <= 0.01 and 0 <= sleeps[1] <= 0.02
+    assert checker.rate_limiter.summary()['retries'] == 2
+
+
+def test_retries_are_bounded_and_the_last_error_is_raised(monkeypatch):
+    error = requests.exceptions.ConnectionError('refused')
+    checker, sleeps = flaky_checker(monkeypatch, [error] * 3, retries=2)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        checker._request('GET', 'https://a.test/')
+    assert checker.session.calls == 3
+
+
+def test_timeouts_are_not_retried_unless_enabled(monkeypatch):
+    timeout = requests.exceptions.ReadTimeout('slow')
+    checker, sleeps = flaky_checker(monkeypatch, [timeout, FakeResponse('https://a.test/')])
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        checker._request('GET', 'https://a.test/')
+    assert (checker.session.calls, sleeps) == (1, [])
+
+    # ConnectTimeout de bir ConnectionError'dır; yine de zaman aşımı sayılır
+    connect_timeout = requests.exceptions.ConnectTimeout('slow')
+    checker, sleeps = flaky_checker(monkeypatch, [connect_timeout, FakeResponse('https://a.test/')])
+    with pytest.raises(requests.exceptions.ConnectTimeout):
+        checker._request('GET', 'https://a.test/')
+
+    checker, sleeps = flaky_checker(monkeypatch, [timeout, FakeResponse('https://a.test/')],
+                                    retry_timeouts=True)
+    assert checker._request('GET', 'https://a.test/').status_code == 200
+    assert checker.session.calls == 2
+
+
+def test_throttling_statuses_honor_retry_after(monkeypatch):
+    busy = FakeResponse('https://a.test/', 503, {'Retry-After': '2'})
+    checker, sleeps = flaky_checker(monkeypatch, [busy, FakeResponse('https://a.test/')])
+    assert checker._request('GET', 'https://a.test/').status_code == 200
+    assert sleeps == [2.0]
+    # 503 host'u yavaşlatır, ardından gelen başarılı yanıt hızı kademeli yükseltir
+    assert checker.rate_limiter.host_buckets['a.test'].rate == pytest.approx(
+        rate_limit.ADAPTIVE_START_RATE * rate_limit.RECOVERY_FACTOR)
+
+    gateway = FakeResponse('https://a.test/', 502)
+    checker, sleeps = flaky_checker(monkeypatch, [gateway, FakeResponse('https://a.test/')])
+    assert checker._request('GET', 'https://a.test/').status_code == 502
+    assert sleeps == []
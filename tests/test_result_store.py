@@ -0,0 +1,78 @@
+"""Append-only JSONL sonuç logu: düz ve gzip yazma/okuma"""
+
+import gzip
+import time
+
+import pytest
+
+from result_store import (ResultLogWriter, finding_rows, iter_file_shards, iter_report_records,
+                          iter_result_log, result_log_path)
+
+RESULTS = [
+    {'target': 'a', 'url': 'https://a.test/', 'status_code': 200,
+     'findings': [{'name': 'HSTS', 'value': 'Missing', 'status': 'fail', 'severity': 'High',
+                   'remark': 'HSTS header is missing'}]},
+    {'target': 'ş', 'url': 'https://b.test/', 'status_code': 0, 'findings': []},
+]
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_runs_append_to_one_log_and_read_back(tmp_path, compress):
+    path = result_log_path(str(tmp_path), compress)
+    # Her çalıştırma aynı loga ekler; gzip'te her çalıştırma yeni bir gzip üyesidir
+    for run_id in ('r1', 'r2'):
+        with ResultLogWriter(path) as writer:
+            for result in RESULTS:
+                writer.write(dict(result, run_id=run_id))
+
+    records = list(iter_result_log(path))
+    assert [(r['run_id'], r['target']) for r in records] == [
+        ('r1', 'a'), ('r1', 'ş'), ('r2', 'a'), ('r2', 'ş')]
+    assert records[0]['findings'] == RESULTS[0]['findings']
+    assert list(iter_report_records(str(tmp_path))) == records
+    if compress:
+        assert path.endswith('.jsonl.gz')
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            assert len(f.readlines()) == 4
+
+
+def test_truncated_last_line_is_skipped(tmp_path, capsys):
+    path = result_log_path(str(tmp_path))
+    with ResultLogWriter(path) as writer:
+        writer.write(RESULTS[0])
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"target": "cut')
+
+    assert [r['target'] for r in iter_result_log(path)] == ['a']
+    assert 'Skipping malformed line 2' in capsys.readouterr().out
+
+
+def test_finding_rows_flatten_results():
+    rows = list(finding_rows(RESULTS[0], run_id='r1'))
+    assert rows == [{'run_id': 'r1', 'target': 'a', 'url': 'https://a.test/', 'timestamp': '',
+                     'status_code': 200, 'name': 'HSTS', 'value': 'Missing', 'status': 'fail',
+                     'severity': 'High', 'remark': 'HSTS header is missing'}]
+
+
+def _mark_shard(files):
+    # Process havuzunda çalışır: işlenen her parça için bir işaret dosyası bırakır
+    for path in files:
+        with open(path + '.done', 'w'):
+            pass
+    return files
+
+
+def test_file_shards_are_submitted_as_results_are_consumed(tmp_path):
+    files = []
+    for index in range(20):
+        path = tmp_path / f'{index:02d}.json'
+        path.write_text('[]')
+        files.append(str(path))
+
+    shards = iter_file_shards(_mark_shard, files, workers=2, shard_size=1)
+    assert next(shards) == [files[0]]
+    time.sleep(0.5)
+    # İlk sonuç alındığında en fazla workers * 2 + 1 parça gönderilmiş olur
+    assert len(list(tmp_path.glob('*.done'))) <= 5
+    assert [shard for shard in shards] == [[path] for path in files[1:]]
+    assert len(list(tmp_path.glob('*.done'))) == 20
@@ -0,0 +1,97 @@
+"""Tarama önbelleği: parmak izi yeniden kullanımı ve ETag/304 yolu"""
+
+import json
+
+from fakes import FakeResponse, patch_requests
+from header_check import SecurityHeaderChecker
+from scan_cache import ScanCache
+
+HEADERS = {'Content-Type': 'text/html', 'ETag': '"v1"', 'X-Frame-Options': 'DENY',
+           'Strict-Transport-Security': 'max-age=31536000'}
+
+
+def make_checker(monkeypatch, tmp_path, responses, sent_headers):
+    checker = SecurityHeaderChecker(scan_cache=ScanCache(str(tmp_path / 'cache.json')))
+
+    def respond(method, url, **kwargs):
+        sent_headers.append(kwargs.get('headers'))
+        return responses.pop(0)
+
+    patch_requests(monkeypatch, checker, respond)
+    return checker
+
+
+def test_not_modified_response_reuses_cached_findings(monkeypatch, tmp_path):
+    url = 'https://site.test/'
+    sent_headers = []
+    checker = make_checker(monkeypatch, tmp_path, [FakeResponse(url, 200, HEADERS),
+                                      FakeResponse(url, 304, {'ETag': '"v1"'})], sent_headers)
+
+    first = checker.check_headers(url, 'site')
+    second = checker.check_headers(url, 'site')
+    checker.close()
+
+    assert sent_headers == [None, {'If-None-Match': '"v1"'}]
+    assert first['cache'] == 'changed'
+    assert second['cache'] == 'not_modified'
+    assert second['status_code'] == 200
+    assert second['headers'] == first['headers']
+    assert second['findings'] == first['findings']
+    assert checker.scan_cache.stats == {'changed': 1, 'unchanged': 0, 'not_modified': 1}
+
+
+def test_cached_findings_are_isolated_from_results(monkeypatch, tmp_path):
+    url = 'https://site.test/'
+    checker = make_checker(monkeypatch, tmp_path, [FakeResponse(url, 200, HEADERS),
+                                      FakeResponse(url, 304, {}),
+                                      FakeResponse(url, 304, {})], [])
+
+    checker.check_headers(url, 'site')
+    checker.check_headers(url, 'site')['findings'].append({'name': 'Injected'})
+    third = checker.check_headers(url, 'site')
+    checker.close()
+
+    assert 'Injected' not in [finding['name'] for finding in third['findings']]
+
+
+def test_cache_survives_save_and_reload(tmp_path):
+    path = str(tmp_path / 'cache.json')
+    cache = ScanCache(path)
+    cache.store('https://site.test/', 'abc', [{'name': 'HSTS'}], 200, {}, etag='"v1"')
+    cache.save()
+
+    reloaded = ScanCache(path)
+    assert reloaded.reuse('https://site.test/', 'abc', etag='"v2"') == [{'name': 'HSTS'}]
+    assert reloaded.lookup('https://site.test/')['etag'] == '"v2"'
+    assert reloaded.reuse('https://site.test/', 'other') is None
+
+
+def test_unreadable_cache_file_is_logged_and_ignored(tmp_path, caplog):
+    path = tmp_path / 'cache.json'
+    path.write_text('{not json')
+    cache = ScanCache(str(path))
+    assert not cache.entries
+    assert 'Ignoring unreadable scan cache' in caplog.text
+
+
+def test_changed_only_skips_unchanged_targets_in_every_report(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    changed = dict(HEADERS, ETag='"v2"', **{'X-Frame-Options': 'SAMEORIGIN'})
+    responses = {'https://same.test/': [FakeResponse('https://same.test/', 200, HEADERS),
+                                        FakeResponse('https://same.test/', 304, {})],
+                 'https://moved.test/': [FakeResponse('https://moved.test/', 200, HEADERS),
+                                         FakeResponse('https://moved.test/', 200, changed)]}
+    checker = SecurityHeaderChecker(scan_cache=ScanCache(str(tmp_path / 'cache.json')))
+    patch_requests(monkeypatch, checker, lambda method, url, **kwargs: responses[url].pop(0))
+    jobs = [('same', 'https://same.test/'), ('moved', 'https://moved.test/')]
+
+    checker.run_checks([], 'first', inventory=jobs, changed_only=True)
+    results = checker.run_checks([], 'second', inventory=jobs, changed_only=True)
+    checker.close()
+
+    assert [result['cache'] for result in results] == ['not_modified', 'changed']
+    reports = tmp_path / 'second'
+    combined, = reports.glob('all_headers_*.json')
+    assert [result['target'] for result in json.loads(combined.read_text())] == ['moved']
+    assert [path.name.split('_')[0] for path in reports.glob('*_headers_*.json')
+            if not path.name.startswith('all_')] == ['moved']
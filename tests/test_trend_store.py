@@ -0,0 +1,48 @@
+"""SQLite trend deposu: pass-rate trendi ve çalıştırma farkı"""
+
+from trend_store import TrendStore
+
+
+def result(target, run_id, day, statuses):
+    return {
+        'target': target,
+        'run_id': run_id,
+        'timestamp': f'2024-01-{day:02d}T00:00:00',
+        'url': f'http://{target}',
+        'status_code': 200,
+        'findings': [{'name': name, 'status': status} for name, status in statuses.items()]
+    }
+
+
+def test_pass_rate_trend_returns_most_recent_runs_per_target(tmp_path):
+    with TrendStore(str(tmp_path / 'trends.sqlite')) as store:
+        for day in range(1, 11):
+            for target in ('alpha', 'beta', 'gamma'):
+                store.write(result(target, f'202401{day:02d}_000000', day, {'HSTS': 'pass'}))
+        store.commit()
+
+        trend = store.pass_rate_trend(limit=3)
+
+    assert [(row['target'], row['timestamp'][:10]) for row in trend] == [
+        (target, f'2024-01-{day:02d}') for target in ('alpha', 'beta', 'gamma')
+        for day in (8, 9, 10)]
+
+
+def test_per_target_diff_compares_each_targets_own_scans(tmp_path):
+    with TrendStore(str(tmp_path / 'trends.sqlite')) as store:
+        # Daemon deposu: hedefler farklı zamanlarda, farklı run_id'lerle taranır
+        store.write(result('alpha', '20240101_000000', 1, {'HSTS': 'pass'}))
+        store.write(result('beta', '20240102_000000', 2, {'CSP': 'fail'}))
+        store.write(result('alpha', '20240103_000000', 3, {'HSTS': 'fail'}))
+        store.write(result('beta', '20240104_000000', 4, {'CSP': 'pass'}))
+        store.write(result('gamma', '20240105_000000', 5, {'CSP': 'pass'}))
+        store.commit()
+
+        run_diff = store.diff()
+        report = store.diff(per_target=True)
+
+    assert run_diff['new_targets'] == ['gamma'] and run_diff['missing_targets'] == ['beta']
+    assert [(c['target'], c['header']) for c in report['regressions']] == [('alpha', 'HSTS')]
+    assert [(c['target'], c['header']) for c in report['fixes']] == [('beta', 'CSP')]
+    assert report['new_targets'] == ['gamma']
+    assert report['missing_targets'] == []
@@ -0,0 +1,54 @@
+"""NumPy ve sözlük tabanlı toplayıcılar aynı analizi (anahtar sıraları dahil) üretmeli"""
+
+import json
+
+import pytest
+
+import aggregation
+from aggregation import FindingsAggregator, VectorAggregator, make_aggregator
+from benchmark import write_corpus
+from result_store import iter_result_log
+
+pytest.importorskip('numpy')
+
+UNUSUAL = [
+    {'target': 'odd', 'findings': [
+        {'name': 'Custom', 'status': 'error', 'severity': 'Critical'},
+        {'name': 'HSTS', 'status': 'pass', 'severity': 'Low'}]},
+    {'target': 'empty', 'findings': []},
+]
+
+
+def analyses(records, **options):
+    plain = FindingsAggregator()
+    vector = VectorAggregator(**options)
+    for record in records:
+        plain.add(record)
+        vector.add(record)
+    return plain.result(), vector.result()
+
+
+def test_vector_engine_matches_dict_engine(tmp_path):
+    corpus = str(tmp_path / 'corpus.jsonl')
+    write_corpus(corpus, 4000, seed=7)
+    records = list(iter_result_log(corpus)) + UNUSUAL
+    plain, vector = analyses(records)
+    assert vector == plain
+    assert json.dumps(vector) == json.dumps(plain)
+
+
+def test_chunked_and_warmed_up_counts_match(monkeypatch, tmp_path):
+    corpus = str(tmp_path / 'corpus.jsonl')
+    write_corpus(corpus, 2000, seed=3)
+    records = UNUSUAL + list(iter_result_log(corpus))
+    # Küçük tamponla sayım birden çok vektörel parçaya bölünür ve merge ile birleşir
+    monkeypatch.setattr(aggregation, 'FRAME_CHUNK_FINDINGS', 100)
+    plain, vector = analyses(records, warmup=50)
+    assert json.dumps(vector) == json.dumps(plain)
+
+
+def test_python_engine_never_imports_numpy(monkeypatch):
+    monkeypatch.setattr(aggregation, '_numpy_available', lambda: False)
+    assert isinstance(make_aggregator('auto'), FindingsAggregator)
+    with pytest.raises(RuntimeError):
+        make_aggregator('numpy')